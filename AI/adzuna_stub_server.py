@@ -0,0 +1,267 @@
+"""
+Local stand-in for the Adzuna job search API, for load and latency testing
+
+Serves GET /v1/api/jobs/<country>/search/<page> with the same response shape as
+Adzuna (``results``, ``count``, ``mean``), honouring ``what``, ``where`` and
+``results_per_page``. The corpus is generated from a seed, so runs are
+repeatable, and the server can inject latency, 429s and 5xx errors.
+
+Run it and point the scraper at it:
+
+    python adzuna_stub_server.py --port 8765 --corpus-size 50000 --latency-ms 120 --error-rate 0.02
+    ADZUNA_API_URL=http://127.0.0.1:8765/v1/api python main.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MAX_RESULTS_PER_PAGE = 50
+
+ROLES = [
+    # (title, category, base salary, keywords)
+    ('Software Engineer', 'IT Jobs', 115000, ['Python', 'Java', 'AWS', 'microservices', 'CI/CD']),
+    ('Frontend Developer', 'IT Jobs', 105000, ['React', 'TypeScript', 'JavaScript', 'CSS', 'accessibility']),
+    ('Data Scientist', 'IT Jobs', 125000, ['Python', 'machine learning', 'SQL', 'statistics', 'pandas']),
+    ('Data Analyst', 'IT Jobs', 95000, ['SQL', 'Power BI', 'Excel', 'reporting', 'Tableau']),
+    ('DevOps Engineer', 'IT Jobs', 130000, ['Kubernetes', 'Docker', 'Terraform', 'AWS', 'Linux']),
+    ('Registered Nurse', 'Healthcare & Nursing Jobs', 88000, ['patient care', 'medication', 'AHPRA', 'CPR', 'ward']),
+    ('Aged Care Worker', 'Healthcare & Nursing Jobs', 62000, ['personal care', 'first aid', 'manual handling', 'NDIS']),
+    ('Primary School Teacher', 'Teaching Jobs', 92000, ['curriculum', 'classroom management', 'WWCC', 'literacy']),
+    ('Early Childhood Educator', 'Teaching Jobs', 65000, ['childcare', 'EYLF', 'first aid', 'programming']),
+    ('Electrician', 'Trade & Construction Jobs', 98000, ['A-grade licence', 'commercial', 'fault finding', 'solar']),
+    ('Civil Engineer', 'Engineering Jobs', 120000, ['AutoCAD', 'project delivery', 'drainage', 'road design']),
+    ('Accountant', 'Accounting & Finance Jobs', 90000, ['Xero', 'tax', 'reconciliations', 'CPA', 'BAS']),
+    ('Project Manager', 'Consultancy Jobs', 135000, ['stakeholder management', 'Agile', 'budgets', 'PMP']),
+    ('Sales Representative', 'Sales Jobs', 75000, ['B2B', 'CRM', 'pipeline', 'negotiation']),
+]
+SENIORITY = [('', 1.0), ('Junior ', 0.75), ('Senior ', 1.3), ('Lead ', 1.45), ('Graduate ', 0.65)]
+COMPANIES = [
+    'Tech Corp', 'Innovation Labs', 'Digital Solutions', 'Future Systems', 'Smart Technologies',
+    'Westcoast Health', 'Sunrise Education', 'Southern Cross Engineering', 'Harbour Finance',
+    'Outback Mining Services', 'Coral Coast Consulting', 'Blue Gum Childcare', 'Swan River Logistics',
+    'Ironbark Construction', 'Kookaburra Software', 'Banksia Aged Care', 'Pilbara Resources',
+    'Indian Ocean Analytics', 'Fremantle Digital', 'Goldfields Power',
+]
+LOCATIONS = [
+    # (display name, area, latitude, longitude)
+    ('Perth CBD, Perth', ['Australia', 'WA', 'Perth', 'Perth CBD'], -31.9523, 115.8613),
+    ('Fremantle, Perth', ['Australia', 'WA', 'Perth', 'Fremantle'], -32.0569, 115.7439),
+    ('Joondalup, Perth', ['Australia', 'WA', 'Perth', 'Joondalup'], -31.7448, 115.7661),
+    ('Osborne Park, Perth', ['Australia', 'WA', 'Perth', 'Osborne Park'], -31.9010, 115.8107),
+    ('Sydney CBD, Sydney', ['Australia', 'NSW', 'Sydney', 'Sydney CBD'], -33.8688, 151.2093),
+    ('Parramatta, Sydney', ['Australia', 'NSW', 'Sydney', 'Parramatta'], -33.8150, 151.0011),
+    ('Melbourne CBD, Melbourne', ['Australia', 'VIC', 'Melbourne', 'Melbourne CBD'], -37.8136, 144.9631),
+    ('Brisbane CBD, Brisbane', ['Australia', 'QLD', 'Brisbane', 'Brisbane CBD'], -27.4698, 153.0251),
+    ('Adelaide CBD, Adelaide', ['Australia', 'SA', 'Adelaide', 'Adelaide CBD'], -34.9285, 138.6007),
+    ('Canberra, ACT', ['Australia', 'ACT', 'Canberra'], -35.2809, 149.1300),
+    ('Karratha, Pilbara', ['Australia', 'WA', 'Pilbara', 'Karratha'], -20.7364, 116.8463),
+    ('Hobart, Tasmania', ['Australia', 'TAS', 'Hobart'], -42.8821, 147.3272),
+]
+CONTRACT_TIMES = ['full_time', 'full_time', 'full_time', 'part_time']
+CONTRACT_TYPES = ['permanent', 'permanent', 'permanent', 'contract']
+
+
+def build_corpus(size, seed=42, now=None):
+    """Generate ``size`` realistic, repeatable Adzuna-shaped postings"""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc).replace(microsecond=0)
+    corpus = []
+    for i in range(size):
+        title, category, base_salary, keywords = rng.choice(ROLES)
+        prefix, multiplier = rng.choice(SENIORITY)
+        display_name, area, latitude, longitude = rng.choice(LOCATIONS)
+        company = rng.choice(COMPANIES)
+        skills = rng.sample(keywords, k=min(len(keywords), rng.randint(2, 4)))
+        salary_min = round(base_salary * multiplier * rng.uniform(0.85, 1.0), -2)
+        has_salary = rng.random() > 0.2
+        job_id = str(4000000000 + seed * 10000000 + i)
+        corpus.append({
+            '__CLASS__': 'Adzuna::API::Response::Job',
+            'id': job_id,
+            'adref': f'stub-{job_id}',
+            'title': f'{prefix}{title}',
+            'company': {'__CLASS__': 'Adzuna::API::Response::Company', 'display_name': company},
+            'location': {'__CLASS__': 'Adzuna::API::Response::Location',
+                         'display_name': display_name, 'area': area},
+            'latitude': round(latitude + rng.uniform(-0.05, 0.05), 5),
+            'longitude': round(longitude + rng.uniform(-0.05, 0.05), 5),
+            'description': (
+                f'{company} is hiring a {prefix.lower()}{title.lower()} in {area[-1]}. '
+                f'You will work with {", ".join(skills[:-1])} and {skills[-1]} '
+                f'as part of a collaborative team. '
+                f'{rng.choice(["Hybrid working available.", "Immediate start.", "Great team culture.", "Salary packaging available."])}'
+            ),
+            'category': {'__CLASS__': 'Adzuna::API::Response::Category',
+                         'label': category, 'tag': category.lower().replace(' ', '-')},
+            'salary_min': salary_min if has_salary else None,
+            'salary_max': round(salary_min * rng.uniform(1.05, 1.3), -2) if has_salary else None,
+            'salary_is_predicted': '0' if has_salary else '1',
+            'contract_time': rng.choice(CONTRACT_TIMES),
+            'contract_type': rng.choice(CONTRACT_TYPES),
+            'created': (now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'redirect_url': f'http://127.0.0.1/details/{job_id}',
+        })
+    # Newest first, like Adzuna's default sort
+    corpus.sort(key=lambda job: job['created'], reverse=True)
+    return corpus
+
+
+def _tokens(text):
+    return set(re.findall(r'[a-z0-9+#]+', text.lower()))
+
+
+class StubCorpus:
+    """Postings plus inverted indexes over ``what`` and ``where`` terms"""
+
+    def __init__(self, postings):
+        self.postings = postings
+        self.what_index = {}
+        self.where_index = {}
+        for position, job in enumerate(postings):
+            for token in _tokens(f"{job['title']} {job['description']} {job['company']['display_name']}"):
+                self.what_index.setdefault(token, []).append(position)
+            for token in _tokens(' '.join(job['location']['area'] + [job['location']['display_name']])):
+                self.where_index.setdefault(token, []).append(position)
+
+    def search(self, what='', where=''):
+        """Positions of the postings matching every what/where term, newest first"""
+        matches = None
+        for index, text in ((self.what_index, what), (self.where_index, where)):
+            for token in _tokens(text):
+                positions = set(index.get(token, ()))
+                matches = positions if matches is None else matches & positions
+                if not matches:
+                    return []
+        return list(range(len(self.postings))) if matches is None else sorted(matches)
+
+
+class StubConfig:
+    """Fault and latency injection settings, adjustable while the server runs"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, rate_limit_rate=0.0, error_rate=0.0, seed=42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def draw(self):
+        """Pick this request's (delay seconds, injected status or None)"""
+        with self.lock:
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+            roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            return delay, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return delay, 503
+        return delay, None
+
+
+class AdzunaStubHandler(BaseHTTPRequestHandler):
+    path_pattern = re.compile(r'^/v1/api/jobs/(?P<country>[a-z]{2})/search/(?P<page>\d+)/?$')
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        match = self.path_pattern.match(url.path)
+        if not match:
+            return self._send_json(404, {'exception': 'NOT_FOUND', 'display': 'Unknown endpoint'})
+
+        delay, injected_status = self.server.config.draw()
+        if delay:
+            time.sleep(delay)
+        if injected_status == 429:
+            return self._send_json(429, {'exception': 'RATE_LIMIT_EXCEEDED'}, {'Retry-After': '1'})
+        if injected_status:
+            return self._send_json(injected_status, {'exception': 'SERVICE_UNAVAILABLE'})
+
+        params = parse_qs(url.query)
+        try:
+            per_page = min(int(params.get('results_per_page', ['10'])[0]), MAX_RESULTS_PER_PAGE)
+        except ValueError:
+            return self._send_json(400, {'exception': 'BAD_REQUEST', 'display': 'results_per_page must be an integer'})
+        page = max(int(match.group('page')), 1)
+
+        corpus = self.server.corpus
+        positions = corpus.search(params.get('what', [''])[0], params.get('where', [''])[0])
+        page_positions = positions[(page - 1) * per_page:page * per_page]
+        results = [corpus.postings[p] for p in page_positions]
+        salaries = [job['salary_min'] for job in results if job['salary_min']]
+        self._send_json(200, {
+            '__CLASS__': 'Adzuna::API::Response::JobSearchResults',
+            'count': len(positions),
+            'mean': round(sum(salaries) / len(salaries), 2) if salaries else 0,
+            'results': results,
+        })
+
+    def _send_json(self, status_code, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host='127.0.0.1', port=8765, corpus_size=10000, seed=42, config=None, quiet=True):
+    """Create (but do not start) a stub server; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), AdzunaStubHandler)
+    server.daemon_threads = True
+    server.corpus = StubCorpus(build_corpus(corpus_size, seed))
+    server.config = config or StubConfig(seed=seed)
+    server.quiet = quiet
+    return server
+
+
+def start_in_background(**kwargs):
+    """Start a stub server on a daemon thread; returns (server, base_url for ADZUNA_API_URL)"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f'http://{host}:{port}/v1/api'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local Adzuna search API stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--corpus-size', type=int, default=10000, help='Number of generated postings')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for the corpus and injected faults')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Mean added latency per request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Uniform +/- jitter around the latency')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    print(f"🏗️ Generating {args.corpus_size} postings (seed {args.seed})...")
+    server = make_server(
+        host=args.host,
+        port=args.port,
+        corpus_size=args.corpus_size,
+        seed=args.seed,
+        config=StubConfig(args.latency_ms, args.jitter_ms, args.rate_limit_rate, args.error_rate, args.seed),
+        quiet=not args.verbose,
+    )
+    print(f"✅ Adzuna stand-in listening on http://{args.host}:{args.port}/v1/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+End-to-end scraper benchmark against the local Adzuna stand-in
+
+Starts adzuna_stub_server in-process, points job_scraper at it and runs a batch
+of searches concurrently, reporting throughput and latency percentiles:
+
+    python bench_scraper.py --searches 200 --workers 8 --latency-ms 80 --error-rate 0.02
+
+To benchmark the Django endpoints or the scheduler instead, run the stub server on
+its own and start the backend with ADZUNA_API_URL pointing at it.
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import job_scraper
+from adzuna_stub_server import StubConfig, start_in_background
+
+QUERIES = ['software engineer', 'data scientist', 'nurse', 'teacher', 'electrician',
+           'accountant', 'devops', 'project manager', 'frontend developer', 'data analyst']
+LOCATIONS = ['Perth', 'Sydney', 'Melbourne', 'Brisbane', 'Adelaide']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the job scraper against the Adzuna stand-in')
+    parser.add_argument('--searches', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--results', type=int, default=100, help='Results requested per search')
+    parser.add_argument('--corpus-size', type=int, default=20000)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--requests-per-minute', type=float, default=0,
+                        help='Scraper rate budget (0 = unlimited, to measure raw throughput)')
+    args = parser.parse_args()
+
+    server, base_url = start_in_background(
+        port=0,
+        corpus_size=args.corpus_size,
+        config=StubConfig(args.latency_ms, args.jitter_ms, args.rate_limit_rate, args.error_rate),
+    )
+    job_scraper.API_BASE_URL = base_url
+    job_scraper.rate_limiter = job_scraper.RateLimiter(args.requests_per_minute or 10 ** 9, burst=args.workers)
+
+    searches = [(QUERIES[i % len(QUERIES)], LOCATIONS[i % len(LOCATIONS)]) for i in range(args.searches)]
+
+    def run(search):
+        started = time.perf_counter()
+        count = sum(1 for _ in job_scraper.iter_job_postings(search[0], search[1], results_per_page=args.results))
+        return time.perf_counter() - started, count
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        timings = list(pool.map(run, searches))
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    latencies = sorted(t for t, _ in timings)
+    postings = sum(c for _, c in timings)
+    print(f"Searches:   {len(timings)} in {elapsed:.2f}s ({len(timings) / elapsed:.1f}/s, {postings / elapsed:.0f} postings/s)")
+    print(f"Latency:    p50 {statistics.median(latencies) * 1000:.0f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms")
+    print(f"Postings:   {postings} ({postings / len(timings):.1f} per search)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,9 @@
+import asyncio
+import hashlib
 import os
+import threading
+import time
+import httpx
 import pandas as pd
 import requests
 from dotenv import load_dotenv
@@ -10,58 +15,298 @@ API_APP_KEY = os.getenv('ADZUNA_APP_KEY')
 API_COUNTRY = 'au'
 
 if not API_APP_ID or not API_APP_KEY:
-    print("⚠️ Missing Adzuna API credentials. Using mock data for testing.")
+    print("⚠️ Missing Adzuna API credentials. Searches will fail unless ADZUNA_API_URL points at a stand-in.")
     API_APP_ID = "mock_app_id"
     API_APP_KEY = "mock_app_key"
 
-def load_job_data(query, location, results_per_page=50):
-    base_url = f"https://api.adzuna.com/v1/api/jobs/{API_COUNTRY}/search/1"
+# Point this at AI/adzuna_stub_server.py for load and latency testing
+API_BASE_URL = os.getenv('ADZUNA_API_URL', 'https://api.adzuna.com/v1/api').rstrip('/')
+API_MAX_RESULTS_PER_PAGE = 50
+API_MAX_RETRIES = 3
+API_TIMEOUT = float(os.getenv('ADZUNA_TIMEOUT', '15'))
+
+# Adzuna allows roughly 25 calls a minute per app; every thread shares this budget
+API_REQUESTS_PER_MINUTE = int(os.getenv('ADZUNA_REQUESTS_PER_MINUTE', '25'))
+
+# Currency that Adzuna reports salaries in for each country endpoint
+COUNTRY_CURRENCIES = {
+    'au': 'AUD', 'at': 'EUR', 'be': 'EUR', 'br': 'BRL', 'ca': 'CAD', 'ch': 'CHF',
+    'de': 'EUR', 'es': 'EUR', 'fr': 'EUR', 'gb': 'GBP', 'in': 'INR', 'it': 'EUR',
+    'mx': 'MXN', 'nl': 'EUR', 'nz': 'NZD', 'pl': 'PLN', 'sg': 'SGD', 'us': 'USD',
+    'za': 'ZAR',
+}
+
+# Column names used by load_job_data (and the jobs.csv it has always produced)
+LEGACY_COLUMNS = {
+    'title': 'Job Title',
+    'company': 'Company',
+    'location': 'Location',
+    'description': 'Description',
+    'skills': 'Skills',
+}
+
+
+class RateLimiter:
+    """Thread-safe token bucket used to pace calls to the Adzuna API"""
+
+    def __init__(self, requests_per_minute, burst=1):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be made"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be made"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def _take(self):
+        """Take a token and return 0, or return the seconds until one is available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+
+rate_limiter = RateLimiter(API_REQUESTS_PER_MINUTE)
+
+
+def compute_content_hash(title, company, description, salary_min, salary_max):
+    """Stable fingerprint of the parts of a posting that matter downstream.
+
+    Text is lower-cased with whitespace collapsed and salaries are compared as
+    numbers, so cosmetic differences between scrapes do not count as changes.
+    """
+    def text(value):
+        return ' '.join(str(value or '').lower().split())
+
+    def number(value):
+        try:
+            return format(float(value), '.2f')
+        except (TypeError, ValueError):
+            return ''
+
+    payload = '\x1f'.join((text(title), text(company), text(description), number(salary_min), number(salary_max)))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class JobPosting:
+    """Compact record for one scraped job posting"""
+    __slots__ = ('id', 'title', 'company', 'location', 'description', 'skills',
+                 'salary_min', 'salary_max', 'created', 'redirect_url', 'content_hash')
+
+    def __init__(self, id, title, company, location, description, skills,
+                 salary_min=None, salary_max=None, created=None, redirect_url=None):
+        self.id = id
+        self.title = title
+        self.company = company
+        self.location = location
+        self.description = description
+        self.skills = skills
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.created = created
+        self.redirect_url = redirect_url
+        self.content_hash = compute_content_hash(title, company, description, salary_min, salary_max)
+
+    @classmethod
+    def from_adzuna(cls, job):
+        """Build a posting from one entry of the Adzuna ``results`` list"""
+        return cls(
+            id=str(job.get('id', '')),
+            title=job.get('title', 'Unknown'),
+            company=(job.get('company') or {}).get('display_name', 'Unknown'),
+            location=(job.get('location') or {}).get('display_name', 'Unknown'),
+            description=job.get('description', 'No description available'),
+            skills=(job.get('category') or {}).get('label', 'Unknown'),
+            salary_min=job.get('salary_min'),
+            salary_max=job.get('salary_max'),
+            created=job.get('created'),
+            redirect_url=job.get('redirect_url'),
+        )
+
+    def __repr__(self):
+        return f"JobPosting(id={self.id!r}, title={self.title!r}, company={self.company!r})"
+
+
+def iter_job_postings(query, location, results_per_page=50, country=None, use_mock=False):
+    """Yield JobPosting records for a search, straight from the Adzuna JSON.
+
+    Adzuna returns at most 50 results per page, so larger requests are read
+    page by page until enough results have been yielded. If the first page
+    fails the error is raised, unless ``use_mock`` is set (demo scripts only:
+    mock postings must never be ingested).
+    """
+    country = country or API_COUNTRY
+    page_size = min(results_per_page, API_MAX_RESULTS_PER_PAGE)
     params = {
         'app_id': API_APP_ID,
         'app_key': API_APP_KEY,
-        'results_per_page': results_per_page,
+        'results_per_page': page_size,
         'what': query,
         'where': location
     }
-    try:
-        response = requests.get(base_url, params=params)
+    remaining = results_per_page
+    page = 1
+    while remaining > 0:
+        try:
+            results = _fetch_page(country, page, params)
+        except requests.exceptions.HTTPError as e:
+            print(f"❌ Error fetching data: {e.response.status_code} - {e.response.text}")
+            if page == 1:
+                if not use_mock:
+                    raise
+                yield from _iter_mock_job_postings(query, location, results_per_page)
+            return
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+            if page == 1:
+                if not use_mock:
+                    raise
+                yield from _iter_mock_job_postings(query, location, results_per_page)
+            return
+
+        for job in results[:remaining]:
+            yield JobPosting.from_adzuna(job)
+        remaining -= len(results)
+        if len(results) < page_size:
+            return
+        page += 1
+
+
+def _fetch_page(country, page, params):
+    """Fetch one page of search results, retrying rate limits and server errors"""
+    url = f"{API_BASE_URL}/jobs/{country}/search/{page}"
+    for attempt in range(API_MAX_RETRIES + 1):
+        rate_limiter.acquire()
+        response = requests.get(url, params=params, timeout=API_TIMEOUT)
+        if (response.status_code == 429 or response.status_code >= 500) and attempt < API_MAX_RETRIES:
+            time.sleep(_retry_delay(response, attempt))
+            continue
         response.raise_for_status()
-        data = response.json()
-        jobs = []
-        for job in data.get('results', []):
-            jobs.append({
-                'Job Title': job.get('title', 'Unknown'),
-                'Company': job.get('company', {}).get('display_name', 'Unknown'),
-                'Location': job.get('location', {}).get('display_name', 'Unknown'),
-                'Description': job.get('description', 'No description available'),
-                'Skills': job.get('category', {}).get('label', 'Unknown'),
-                'Salary': job.get('salary_min', 'Not specified')
-            })
-        return pd.DataFrame(jobs)
-    except requests.exceptions.HTTPError as e:
+        return response.json().get('results', [])
+
+
+async def fetch_job_postings(query, location, results_per_page=50, country=None, client=None):
+    """Async counterpart of iter_job_postings, returning the postings as a list.
+
+    The first page is fetched on its own; the further pages it implies are then
+    fetched concurrently, over ``client`` or else an httpx.AsyncClient opened and
+    closed for this crawl. If the first page fails the error is raised: there is
+    no mock fallback here, callers serve the postings already ingested.
+    """
+    if client is None:
+        # Not cached per event loop: under WSGI every request runs on a new loop
+        async with httpx.AsyncClient(timeout=API_TIMEOUT) as client:
+            return await fetch_job_postings(query, location, results_per_page, country, client)
+    country = country or API_COUNTRY
+    page_size = min(results_per_page, API_MAX_RESULTS_PER_PAGE)
+    params = {
+        'app_id': API_APP_ID,
+        'app_key': API_APP_KEY,
+        'results_per_page': page_size,
+        'what': query,
+        'where': location
+    }
+    try:
+        results = await _fetch_page_async(client, country, 1, params)
+    except httpx.HTTPStatusError as e:
         print(f"❌ Error fetching data: {e.response.status_code} - {e.response.text}")
-        return _get_mock_job_data(query, location, results_per_page)
+        raise
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
-        return _get_mock_job_data(query, location, results_per_page)
+        raise
+
+    pages = -(-results_per_page // page_size)
+    if pages > 1 and len(results) == page_size:
+        later_pages = await asyncio.gather(
+            *(_fetch_page_async(client, country, page, params) for page in range(2, pages + 1)),
+            return_exceptions=True
+        )
+        # Like iter_job_postings, stop at the first failed or short page
+        for page_results in later_pages:
+            if isinstance(page_results, Exception):
+                print(f"❌ Error fetching data: {page_results}")
+                break
+            results.extend(page_results)
+            if len(page_results) < page_size:
+                break
+    return [JobPosting.from_adzuna(job) for job in results[:results_per_page]]
 
-def _get_mock_job_data(query, location, results_per_page=50):
-    """Return mock job data for testing when API is not available"""
+
+async def _fetch_page_async(client, country, page, params):
+    """Async _fetch_page: same retries, but waiting does not block the event loop"""
+    url = f"{API_BASE_URL}/jobs/{country}/search/{page}"
+    for attempt in range(API_MAX_RETRIES + 1):
+        await rate_limiter.acquire_async()
+        response = await client.get(url, params=params)
+        if (response.status_code == 429 or response.status_code >= 500) and attempt < API_MAX_RETRIES:
+            await asyncio.sleep(_retry_delay(response, attempt))
+            continue
+        response.raise_for_status()
+        return response.json().get('results', [])
+
+
+def _retry_delay(response, attempt):
+    """Seconds to wait before retrying, honouring Retry-After when present"""
+    retry_after = response.headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        return int(retry_after)
+    return 0.5 * 2 ** attempt
+
+
+def postings_to_frame(postings, columns=JobPosting.__slots__):
+    """Build a DataFrame from postings; only call this where a frame is needed"""
+    if not isinstance(postings, (list, tuple)):
+        postings = list(postings)
+    return pd.DataFrame({column: [getattr(p, column) for p in postings] for column in columns})
+
+
+def load_job_data(query, location, results_per_page=50, use_mock=False):
+    """Return the search results as a DataFrame with the legacy column names"""
+    df = postings_to_frame(iter_job_postings(query, location, results_per_page, use_mock=use_mock))
+    df['Salary'] = df['salary_min'].astype(object).where(df['salary_min'].notna(), 'Not specified')
+    return df.rename(columns=LEGACY_COLUMNS)
+
+
+def _iter_mock_job_postings(query, location, results_per_page=50):
+    """Yield mock job postings for demos when the API is not available; never ingest these"""
     import random
+    import zlib
     from datetime import datetime, timedelta
-    
-    mock_jobs = []
+
     companies = ['Tech Corp', 'Innovation Labs', 'Digital Solutions', 'Future Systems', 'Smart Technologies']
     skills_list = ['Python', 'JavaScript', 'React', 'Node.js', 'Docker', 'AWS', 'Machine Learning', 'Data Science']
-    
+    now = datetime.now()
+
     for i in range(min(results_per_page, 10)):  # Limit to 10 mock jobs
-        mock_jobs.append({
-            'Job Title': f'{query.title()} Developer',
-            'Company': random.choice(companies),
-            'Location': location,
-            'Description': f'We are looking for a skilled {query} to join our team. This role involves working with cutting-edge technologies and contributing to innovative projects.',
-            'Skills': random.choice(skills_list),
-            'Salary': f'${random.randint(60000, 120000)}'
-        })
-    
-    return pd.DataFrame(mock_jobs)
+        salary_min = random.randint(60000, 120000)
+        yield JobPosting(
+            id=f'mock_{zlib.crc32(f"{query}|{location}|{i}".encode())}',
+            title=f'{query.title()} Developer',
+            company=random.choice(companies),
+            location=location,
+            description=f'We are looking for a skilled {query} to join our team. This role involves working with cutting-edge technologies and contributing to innovative projects.',
+            skills=random.choice(skills_list),
+            salary_min=salary_min,
+            salary_max=salary_min,
+            created=(now - timedelta(days=i)).isoformat(),
+            redirect_url=None,
+        )
+
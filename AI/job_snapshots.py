@@ -0,0 +1,154 @@
+"""
+Columnar snapshots of scraped job batches
+
+Every scrape batch is written as its own Parquet file, partitioned by scrape date
+and query, so historical batches are kept instead of overwriting jobs.csv:
+
+    snapshots/scrape_date=2025-10-20/query=software-engineer/part-031245-1a2b3c4d.parquet
+
+read_snapshots() loads only the requested columns and partitions, memory-mapping
+the files, for model refits and offline evaluation.
+"""
+
+import os
+import re
+import uuid
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+
+DEFAULT_SNAPSHOT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+
+# Columns stored in every snapshot file (partition columns are in the path)
+SNAPSHOT_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('title', pa.string()),
+    ('company', pa.string()),
+    ('location', pa.string()),
+    ('description', pa.string()),
+    ('skills', pa.string()),
+    ('salary_min', pa.float64()),
+    ('salary_max', pa.float64()),
+    ('created', pa.timestamp('us', tz='UTC')),
+    ('redirect_url', pa.string()),
+    ('content_hash', pa.string()),
+    ('search_location', pa.string()),
+    ('country', pa.string()),
+    ('scraped_at', pa.timestamp('us', tz='UTC')),
+])
+
+PARTITION_SCHEMA = pa.schema([('scrape_date', pa.string()), ('query', pa.string())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor='hive')
+
+# Reading with the full schema lets older files that lack newer columns load as nulls
+DATASET_SCHEMA = pa.unify_schemas([SNAPSHOT_SCHEMA, PARTITION_SCHEMA])
+
+
+def query_slug(query):
+    """Partition-safe form of a search query"""
+    return re.sub(r'[^a-z0-9]+', '-', (query or '').lower()).strip('-') or 'all'
+
+
+def write_snapshot(postings, query, location='', country=None, root=DEFAULT_SNAPSHOT_ROOT, scraped_at=None):
+    """Write a batch of JobPosting records as a new Parquet file; returns its path or None if empty"""
+    postings = postings if isinstance(postings, (list, tuple)) else list(postings)
+    if not postings:
+        return None
+
+    scraped_at = scraped_at or datetime.now(timezone.utc)
+    count = len(postings)
+    table = pa.table({
+        'id': [p.id for p in postings],
+        'title': [p.title for p in postings],
+        'company': [p.company for p in postings],
+        'location': [p.location for p in postings],
+        'description': [p.description for p in postings],
+        'skills': [p.skills for p in postings],
+        'salary_min': [_to_float(p.salary_min) for p in postings],
+        'salary_max': [_to_float(p.salary_max) for p in postings],
+        'created': [_to_timestamp(p.created) for p in postings],
+        'redirect_url': [p.redirect_url for p in postings],
+        'content_hash': [p.content_hash for p in postings],
+        'search_location': [location] * count,
+        'country': [country] * count,
+        'scraped_at': [scraped_at] * count,
+    }, schema=SNAPSHOT_SCHEMA)
+
+    directory = os.path.join(root, f'scrape_date={scraped_at:%Y-%m-%d}', f'query={query_slug(query)}')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'part-{scraped_at:%H%M%S}-{uuid.uuid4().hex[:8]}.parquet')
+    pq.write_table(table, path, compression='zstd')
+    return path
+
+
+def read_snapshots(root=DEFAULT_SNAPSHOT_ROOT, columns=None, dates=None, queries=None,
+                   latest_only=False, as_pandas=True):
+    """Load snapshot rows, reading only the requested columns and partitions.
+
+    ``dates`` are 'YYYY-MM-DD' strings (or dates) and ``queries`` are search queries;
+    both prune whole partitions before any file is opened. With ``latest_only`` each
+    posting id appears once, taken from its most recent scrape.
+    """
+    if not os.path.isdir(root):
+        table = SNAPSHOT_SCHEMA.empty_table()
+        if columns:
+            table = table.select([c for c in columns if c in SNAPSHOT_SCHEMA.names])
+        return table.to_pandas() if as_pandas else table
+
+    dataset = ds.dataset(
+        root,
+        schema=DATASET_SCHEMA,
+        format='parquet',
+        partitioning=PARTITIONING,
+        filesystem=pafs.LocalFileSystem(use_mmap=True),
+    )
+
+    filter_expr = None
+    if dates:
+        filter_expr = _and(filter_expr, ds.field('scrape_date').isin([str(d) for d in dates]))
+    if queries:
+        filter_expr = _and(filter_expr, ds.field('query').isin([query_slug(q) for q in queries]))
+
+    read_columns = list(columns) if columns else None
+    if latest_only and read_columns is not None:
+        read_columns += [c for c in ('id', 'scraped_at') if c not in read_columns]
+
+    table = dataset.to_table(columns=read_columns, filter=filter_expr)
+    if latest_only and table.num_rows:
+        table = _latest_per_id(table)
+        if columns:
+            table = table.select(list(columns))
+    return table.to_pandas() if as_pandas else table
+
+
+def _latest_per_id(table):
+    """Keep the most recently scraped row for each posting id"""
+    ordered = table.sort_by([('id', 'ascending'), ('scraped_at', 'descending')])
+    ids = ordered.column('id').to_pylist()
+    keep = [i for i in range(len(ids)) if i == 0 or ids[i] != ids[i - 1]]
+    return ordered.take(keep)
+
+
+def _and(left, right):
+    return right if left is None else left & right
+
+
+def _to_float(value):
+    try:
+        return float(value) if value is not None and value != '' else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(value):
+    """Parse an ISO 8601 timestamp (as sent by Adzuna) into an aware datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
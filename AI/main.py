@@ -1,4 +1,6 @@
-from job_scraper import load_job_data
+from job_scraper import API_COUNTRY, iter_job_postings, postings_to_frame
+from job_snapshots import write_snapshot
+from salary_normalizer import normalize_salary_frame
 from recommender.job_recommender import JobRecommender
 import pandas as pd
 import re
@@ -7,9 +9,9 @@ import time
 def fetch_jobs_safely(query, location):
     """Try shorter queries automatically until we get results."""
     print(f"\n🔍 Fetching jobs related to '{query}' in {location}...")
-    job_df = load_job_data(query, location)
-    if not job_df.empty:
-        return job_df
+    postings = list(iter_job_postings(query, location, use_mock=True))
+    if postings:
+        return postings
 
     # If nothing found, trim query gradually
     terms = query.split()
@@ -18,10 +20,10 @@ def fetch_jobs_safely(query, location):
         shorter = " ".join(terms)
         print(f"⚠️ Retrying with shorter query: '{shorter}'...")
         time.sleep(1)
-        job_df = load_job_data(shorter, location)
-        if not job_df.empty:
-            return job_df
-    return pd.DataFrame()
+        postings = list(iter_job_postings(shorter, location, use_mock=True))
+        if postings:
+            return postings
+    return []
 
 def main():
     print("\n=== 🤖 AI Job Recommendation System ===\n")
@@ -58,30 +60,21 @@ def main():
     if len(search_terms) > 5:
         search_query = " ".join(search_terms[:5])
 
-    job_df = fetch_jobs_safely(search_query, location)
-    if job_df.empty:
+    postings = fetch_jobs_safely(search_query, location)
+    if not postings:
         print("❌ Still no jobs found after retrying.")
         return
 
-    print(f"✅ Fetched {len(job_df)} jobs from Adzuna.")
-    job_df.to_csv("jobs.csv", index=False)
-    print("💾 Saved jobs to jobs.csv")
-
-    df = pd.DataFrame({
-        "job_id": range(len(job_df)),
-        "title": job_df["Job Title"],
-        "company": job_df["Company"],
-        "description": job_df["Description"],
-        "skills": job_df["Skills"],
-        "location": job_df["Location"],
-        "posted_at": pd.Timestamp.now(),
-        "employment_type": "Full-time",
-        "remote": False,
-        "salary_min": job_df["Salary"],
-        "salary_max": job_df["Salary"],
-        "currency": "AUD",
-        "url": ""
-    })
+    print(f"✅ Fetched {len(postings)} jobs from Adzuna.")
+
+    snapshot_path = write_snapshot(postings, search_query, location, API_COUNTRY)
+    print(f"💾 Saved jobs to {snapshot_path}")
+
+    # The recommender works on a DataFrame, so this is the one place we build it
+    df = normalize_salary_frame(postings_to_frame(postings), currency="AUD")
+    df["employment_type"] = "Full-time"
+    df["remote"] = False
+    df["currency"] = "AUD"
 
     print("\n🔧 Training recommender model...")
     rec = JobRecommender().fit(df)
@@ -106,7 +99,7 @@ def main():
     else:
         pd.set_option("display.max_colwidth", 100)
         print("=== Top Job Recommendations ===\n")
-        print(recs[["title", "company", "location", "salary_min", "salary_max", "score"]]
+        print(recs[["title", "company", "location", "salary_annual_min", "salary_annual_max", "score"]]
               .to_string(index=False))
 
 if __name__ == "__main__":
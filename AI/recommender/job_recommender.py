@@ -14,6 +14,7 @@ class JobRecommenderConfig:
     ngram_range = (1, 2)
     max_features = 10000
     stop_words = "english"
+    salary_miss_weight = 0.85
 
 class JobRecommender:
     def __init__(self, config=None):
@@ -24,7 +25,11 @@ class JobRecommender:
 
     def fit(self, jobs_df):
         self.jobs = jobs_df.copy()
-        combined = self.jobs.apply(lambda x: " ".join([str(x[c]) for c in self.cfg.text_fields]), axis=1)
+        # Column-wise concatenation; avoids building a Series per row like apply(axis=1)
+        fields = iter(self.cfg.text_fields)
+        combined = self.jobs[next(fields)].astype(str)
+        for c in fields:
+            combined = combined + " " + self.jobs[c].astype(str)
         self.vectorizer = TfidfVectorizer(ngram_range=self.cfg.ngram_range, max_features=self.cfg.max_features, stop_words=self.cfg.stop_words)
         self.job_matrix = self.vectorizer.fit_transform(combined)
         return self
@@ -40,6 +45,22 @@ class JobRecommender:
     def recommend(self, *, user_vector, k=10, user_location=None, desired_salary_min=None, desired_salary_max=None):
         sims = cosine_similarity(user_vector, self.job_matrix).flatten()
         self.jobs["similarity"] = sims
-        self.jobs["score"] = sims
+        self.jobs["score"] = sims * self._salary_fit(desired_salary_min, desired_salary_max)
         recs = self.jobs.sort_values("score", ascending=False).head(k)
         return recs
+
+    def _salary_fit(self, desired_min, desired_max):
+        """Down-weight jobs whose annual salary range misses the desired range (needs salary_normalizer columns)"""
+        fit = np.ones(len(self.jobs))
+        if "salary_annual_min" not in self.jobs or (desired_min is None and desired_max is None):
+            return fit
+        annual_min = self.jobs["salary_annual_min"].to_numpy(dtype=float)
+        annual_max = self.jobs["salary_annual_max"].to_numpy(dtype=float)
+        miss = np.zeros(len(self.jobs), dtype=bool)
+        if desired_min is not None:
+            miss |= annual_max < desired_min
+        if desired_max is not None:
+            miss |= annual_min > desired_max
+        # NaN comparisons are False, so jobs without a salary are left alone
+        fit[miss] = self.cfg.salary_miss_weight
+        return fit
@@ -0,0 +1,149 @@
+"""
+Vectorized salary normalization
+
+Scraped salaries arrive as numbers, as strings ('$85000', '80k - 100k',
+'$45 per hour') or not at all, quoted per hour, day, week, month or year and in
+the currency of the Adzuna country endpoint. normalize_salary_frame() turns a
+whole batch into numeric annual min/max columns in one currency with pandas
+column operations, so salary filters and ranking can compare plain numbers:
+
+    df = normalize_salary_frame(postings_to_frame(postings), currency='AUD')
+    df[['salary_annual_min', 'salary_annual_max', 'salary_period']]
+"""
+
+import numpy as np
+import pandas as pd
+
+BASE_CURRENCY = 'AUD'
+
+# Approximate units of BASE_CURRENCY per unit of each currency; override with rates=
+CURRENCY_RATES = {
+    'AUD': 1.0, 'BRL': 0.28, 'CAD': 1.1, 'CHF': 1.7, 'EUR': 1.65, 'GBP': 1.95,
+    'INR': 0.018, 'MXN': 0.082, 'NZD': 0.91, 'PLN': 0.38, 'SGD': 1.15, 'USD': 1.5,
+    'ZAR': 0.083,
+}
+
+# Multipliers from a salary quoted per period to a yearly figure (38 hour week)
+PERIOD_MULTIPLIERS = {
+    'hourly': 38 * 52,
+    'daily': 5 * 52,
+    'weekly': 52,
+    'monthly': 12,
+    'yearly': 1,
+}
+
+# Checked in order; the first pattern that matches a salary string wins
+PERIOD_PATTERNS = [
+    ('hourly', r'(?:per|an|a|/)\s*(?:hour|hr)\b|\bhourly\b|\bp\.?h\b'),
+    ('daily', r'(?:per|a|/)\s*day\b|\bdaily\b|\bp\.?d\b'),
+    ('weekly', r'(?:per|a|/)\s*(?:week|wk)\b|\bweekly\b|\bp\.?w\b'),
+    ('monthly', r'(?:per|a|/)\s*(?:month|mth)\b|\bmonthly\b|\bp\.?m\b'),
+    ('yearly', r'(?:per|a|/)\s*(?:year|yr|annum)\b|\byearly\b|\bannual(?:ly)?\b|\bp\.?a\b'),
+]
+
+# Upper bounds used to guess the period of an amount that does not state one
+INFERRED_PERIOD_LIMITS = [('hourly', 300), ('daily', 2000), ('monthly', 20000)]
+
+# Annual amounts outside this range are treated as parse errors
+ANNUAL_BOUNDS = (1000, 5000000)
+
+_AMOUNT = r'(\d+(?:\.\d+)?)\s*(k)?'
+_RANGE_PATTERN = _AMOUNT + r'(?:\s*(?:-|–|to)\s*[^\d]{0,4}' + _AMOUNT + r')?'
+
+
+def parse_salary_text(text):
+    """Parse salary strings into numeric min/max and a stated period (or None).
+
+    ``text`` is a Series; non-string values parse as missing.
+    """
+    text = pd.Series(text, dtype='object')
+    cleaned = text.where(text.map(lambda v: isinstance(v, str)), '').astype('string').str.lower()
+    cleaned = cleaned.str.replace(r'(?<=\d),(?=\d{3})', '', regex=True)
+
+    parts = cleaned.str.extract(_RANGE_PATTERN)
+    low = _scaled(parts[0], parts[1])
+    high = _scaled(parts[2], parts[3])
+    # '80-100k' puts the k on the upper bound only
+    low = low.where(~(parts[1].isna() & parts[3].notna() & (low < 1000)), low * 1000)
+
+    return pd.DataFrame({
+        'salary_min': low,
+        'salary_max': high.fillna(low),
+        'salary_period': detect_period(cleaned),
+    }, index=text.index)
+
+
+def detect_period(text):
+    """The salary period stated in each string, or None"""
+    text = pd.Series(text, dtype='object').fillna('').astype('string').str.lower()
+    conditions = [text.str.contains(pattern, regex=True).fillna(False).to_numpy(dtype=bool)
+                  for _, pattern in PERIOD_PATTERNS]
+    periods = np.select(conditions, [name for name, _ in PERIOD_PATTERNS], default='')
+    return pd.Series(periods, index=text.index).replace('', None)
+
+
+def normalize_salary_frame(df, min_col='salary_min', max_col='salary_max', text_col=None,
+                           period_col=None, currency_col=None, currency=BASE_CURRENCY, rates=None):
+    """Add salary_annual_min/salary_annual_max (in BASE_CURRENCY) and salary_period columns.
+
+    Numeric values in ``min_col``/``max_col`` are used first. Strings in those
+    columns, or in ``text_col``, are parsed for amounts, ranges and periods. The
+    period comes from ``period_col`` when given, then from the text, and is
+    otherwise inferred from the amount. Rows in an unknown currency get no
+    annual salary.
+    """
+    rates = rates or CURRENCY_RATES
+    df = df.copy()
+    index = df.index
+
+    raw_min = df[min_col] if min_col in df else pd.Series(None, index=index, dtype='object')
+    raw_max = df[max_col] if max_col in df else pd.Series(None, index=index, dtype='object')
+    low = pd.to_numeric(raw_min, errors='coerce').astype('float64')
+    high = pd.to_numeric(raw_max, errors='coerce').astype('float64')
+
+    parsed_min = parse_salary_text(raw_min)
+    parsed_max = parse_salary_text(raw_max)
+    low = low.fillna(parsed_min['salary_min'])
+    high = high.fillna(parsed_max['salary_max']).fillna(parsed_min['salary_max'])
+    stated = parsed_min['salary_period'].fillna(parsed_max['salary_period'])
+
+    if text_col is not None and text_col in df:
+        parsed_text = parse_salary_text(df[text_col])
+        low = low.fillna(parsed_text['salary_min'])
+        high = high.fillna(parsed_text['salary_max'])
+        stated = stated.fillna(parsed_text['salary_period'])
+
+    low, high = low.fillna(high), high.fillna(low)
+    low, high = np.fmin(low, high), np.fmax(low, high)
+
+    if period_col is not None and period_col in df:
+        stated = df[period_col].where(df[period_col].isin(PERIOD_MULTIPLIERS.keys())).fillna(stated)
+    period = stated.fillna(_infer_period(high))
+
+    if currency_col is not None and currency_col in df:
+        currencies = df[currency_col].fillna(currency).astype(str).str.upper()
+    else:
+        currencies = pd.Series(currency.upper(), index=index)
+    factor = period.map(PERIOD_MULTIPLIERS) * currencies.map(rates)
+
+    lower_bound, upper_bound = ANNUAL_BOUNDS
+    annual_min = (low * factor).round(2)
+    annual_max = (high * factor).round(2)
+    valid = annual_min.between(lower_bound, upper_bound) & annual_max.between(lower_bound, upper_bound)
+
+    df['salary_annual_min'] = annual_min.where(valid).astype('float64')
+    df['salary_annual_max'] = annual_max.where(valid).astype('float64')
+    df['salary_period'] = period.where(low.notna(), 'yearly')
+    return df
+
+
+def _scaled(amount, thousands):
+    values = pd.to_numeric(amount.astype('object'), errors='coerce').astype('float64')
+    return values.where(thousands.isna(), values * 1000)
+
+
+def _infer_period(amount):
+    """Guess the period of an amount from its size: 45 is hourly, 85000 yearly"""
+    conditions = [(amount <= limit).to_numpy(dtype=bool) for _, limit in INFERRED_PERIOD_LIMITS]
+    periods = np.select(conditions, [name for name, _ in INFERRED_PERIOD_LIMITS], default='yearly')
+    return pd.Series(periods, index=amount.index)
@@ -30,25 +30,39 @@ logging.basicConfig(
 )
 
 class AIJobScheduler:
-    def __init__(self, interval_minutes=30):
+    """Periodically crawls the due entries of the crawl plan (see api.crawl_planner).
+
+    Each plan entry has its own refresh interval, so ``interval_minutes`` is only
+    how often the scheduler checks for due entries.
+    """
+
+    def __init__(self, interval_minutes=5, workers=4):
         self.interval_minutes = interval_minutes
+        self.workers = workers
         self.running = False
         self.thread = None
 
     def refresh_jobs(self):
-        """Refresh AI jobs"""
+        """Refresh AI jobs for every due crawl plan entry"""
         try:
             logging.info("Starting scheduled AI job refresh...")
             
             execute_from_command_line([
                 'manage.py', 
                 'refresh_ai_jobs',
-                '--query=software engineer',
-                '--location=Perth',
+                '--plan',
+                f'--workers={self.workers}',
                 '--limit=50',
-                '--save-to-csv'
+                '--save-snapshot'
             ])
             
+            # Crawled jobs are geocoded as they are ingested; this picks up the rest
+            execute_from_command_line(['manage.py', 'geocode_jobs'])
+            
+            # Keep the materialized facet counts and analytics rollups in step with the crawled jobs
+            execute_from_command_line(['manage.py', 'refresh_job_facets'])
+            execute_from_command_line(['manage.py', 'refresh_rollups'])
+            
             logging.info("Scheduled AI job refresh completed successfully!")
             
         except Exception as e:
@@ -89,7 +103,7 @@ class AIJobScheduler:
 
 def main():
     """Main function"""
-    scheduler = AIJobScheduler(interval_minutes=30)  # Refresh every 30 minutes
+    scheduler = AIJobScheduler(interval_minutes=5)  # Check the crawl plan every 5 minutes
     
     try:
         scheduler.start()
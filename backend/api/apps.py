@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from api import checks  # noqa: F401 (registers the system checks)
+        from api.geocoding import connect_geocoding
+        from api.http_cache import connect_invalidation
+        connect_invalidation()
+        connect_geocoding()
@@ -0,0 +1,216 @@
+"""
+In-memory prefix autocomplete for skills, job titles and locations
+
+Completions are answered from sorted arrays searched with bisect, so a request
+never touches the database. Each suggestion type keeps its normalized keys in
+one sorted list. Titles and locations are also indexed from every later word
+("dev" finds "Senior Python Developer"). The matches for a prefix are the
+contiguous slice [bisect_left(prefix), bisect_left(prefix + MAX_CHAR)). One- and
+two-character prefixes, whose slices are largest, have their top completions
+precomputed.
+
+Weights are popularity: active jobs requiring a skill, or active jobs with that
+title or location. The index is rebuilt in the background when jobs or skills
+change (jobs_changed and model signals in this process). Changes made by other
+processes are caught by a version check every VERSION_CHECK_INTERVAL seconds,
+which also runs in the background.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from django.db import connection
+from django.db.models import Count, Max, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from api.models import Job, JobSkill, JobSkillRequirement
+from api.signals import jobs_changed
+
+logger = logging.getLogger(__name__)
+
+SUGGESTION_TYPES = ('skill', 'title', 'location')
+
+MAX_LIMIT = 20
+
+# Prefixes up to this length get their top MAX_LIMIT completions precomputed
+PRECOMPUTED_PREFIX_LENGTH = 2
+
+# Titles and locations are also indexed from their 2nd..Nth word
+MAX_INDEXED_WORDS = 6
+
+VERSION_CHECK_INTERVAL = 30.0
+
+MAX_CHAR = '\U0010ffff'
+
+
+def normalize(text: str) -> str:
+    """Lower-cased text with runs of whitespace collapsed"""
+    return ' '.join((text or '').lower().split())
+
+
+class PrefixIndex:
+    """Sorted completion keys for one suggestion type"""
+
+    def __init__(self, weights: Dict[str, int], word_starts: bool):
+        entries = []
+        for text, weight in weights.items():
+            words = normalize(text).split(' ')
+            starts = range(min(len(words), MAX_INDEXED_WORDS)) if word_starts else range(1)
+            for key in dict.fromkeys(' '.join(words[start:]) for start in starts):
+                if key:
+                    entries.append((key, weight, text))
+        entries.sort(key=lambda entry: entry[0])
+        self.keys = [key for key, _, _ in entries]
+        self.entries = [(weight, text) for _, weight, text in entries]
+
+        self.top = {}
+        for length in range(1, PRECOMPUTED_PREFIX_LENGTH + 1):
+            groups = defaultdict(list)
+            for key, entry in zip(self.keys, self.entries):
+                groups[key[:length]].append(entry)
+            for prefix, group in groups.items():
+                self.top[prefix] = _best(group, MAX_LIMIT)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def complete(self, prefix: str, limit: int) -> List[Dict]:
+        """The ``limit`` heaviest entries whose key starts with ``prefix``"""
+        if len(prefix) <= PRECOMPUTED_PREFIX_LENGTH:
+            best = self.top.get(prefix, [])[:limit]
+        else:
+            lo = bisect_left(self.keys, prefix)
+            hi = bisect_left(self.keys, prefix + MAX_CHAR, lo)
+            best = _best(self.entries[lo:hi], limit)
+        return [{'text': text, 'weight': weight} for weight, text in best]
+
+
+def _best(entries, limit):
+    """Heaviest distinct texts, ties broken alphabetically"""
+    weights = {}
+    for weight, text in entries:
+        if weight > weights.get(text, -1):
+            weights[text] = weight
+    return heapq.nsmallest(limit, ((weight, text) for text, weight in weights.items()),
+                           key=lambda entry: (-entry[0], entry[1]))
+
+
+class AutocompleteSnapshot:
+    """Immutable prefix indexes; completions read them without locking"""
+
+    def __init__(self, indexes: Dict[str, PrefixIndex], version, built_at):
+        self.indexes = indexes
+        self.version = version
+        self.built_at = built_at
+
+
+class Autocomplete:
+    """Shared autocomplete index with background rebuilds"""
+
+    def __init__(self):
+        self.snapshot: Optional[AutocompleteSnapshot] = None
+        self.dirty = True
+        self.checked_at = 0.0
+        self.lock = threading.Lock()  # held for the whole build
+        self.refresh_lock = threading.Lock()  # guards self.refreshing only
+        self.refreshing = False
+
+    def complete(self, prefix: str, types=SUGGESTION_TYPES, limit: int = 10) -> List[Dict]:
+        """Top completions of ``prefix`` for each requested type"""
+        prefix = normalize(prefix)
+        snapshot = self.current()
+        if not prefix or snapshot is None:
+            return []
+        limit = min(limit, MAX_LIMIT)
+        return [
+            dict(suggestion, type=suggestion_type)
+            for suggestion_type in types
+            for suggestion in snapshot.indexes[suggestion_type].complete(prefix, limit)
+        ]
+
+    def current(self) -> Optional[AutocompleteSnapshot]:
+        """The index to query; built synchronously only the first time"""
+        if self.snapshot is None:
+            self.rebuild()
+        elif self.dirty:
+            self._refresh_in_background(check_version=False)
+        elif time.monotonic() - self.checked_at >= VERSION_CHECK_INTERVAL:
+            self._refresh_in_background(check_version=True)
+        return self.snapshot
+
+    def invalidate(self, **kwargs):
+        """Mark the index as out of date (signal receiver)"""
+        self.dirty = True
+
+    def rebuild(self):
+        """Build new prefix indexes from the database and swap them in"""
+        with self.lock:
+            self.dirty = False
+            version = _data_version()
+            skills = dict(JobSkill.objects.annotate(
+                weight=Count('jobskillrequirement', filter=Q(jobskillrequirement__job__is_active=True))
+            ).values_list('name', 'weight'))
+            self.snapshot = AutocompleteSnapshot({
+                'skill': PrefixIndex(skills, word_starts=False),
+                'title': PrefixIndex(_weights_by_text('title'), word_starts=True),
+                'location': PrefixIndex(_weights_by_text('location'), word_starts=True),
+            }, version, timezone.now())
+            self.checked_at = time.monotonic()
+            logger.info("Built autocomplete index: " + ', '.join(
+                f'{len(index)} {name} keys' for name, index in self.snapshot.indexes.items()
+            ))
+        return self.snapshot
+
+    def _refresh_in_background(self, check_version: bool):
+        with self.refresh_lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+        threading.Thread(target=self._refresh_worker, args=(check_version,), name='autocomplete-rebuild',
+                         daemon=True).start()
+
+    def _refresh_worker(self, check_version):
+        try:
+            self.checked_at = time.monotonic()
+            if not check_version or self.snapshot is None or _data_version() != self.snapshot.version:
+                self.rebuild()
+        except Exception as e:
+            logger.error(f"Error rebuilding autocomplete index: {e}")
+        finally:
+            self.refreshing = False
+            connection.close()
+
+
+def _weights_by_text(field: str) -> Dict[str, int]:
+    """Active job counts per distinct value, merged case-insensitively under the most common spelling"""
+    counts = Job.objects.filter(is_active=True).exclude(**{field: ''}).order_by().values_list(field).annotate(
+        count=Count('id')
+    )
+    merged, spelling = defaultdict(int), {}
+    for text, count in counts:
+        key = normalize(text)
+        merged[key] += count
+        if count > spelling.get(key, ('', 0))[1]:
+            spelling[key] = (text.strip(), count)
+    return {spelling[key][0]: weight for key, weight in merged.items()}
+
+
+def _data_version():
+    """Cheap fingerprint of the rows the index is built from"""
+    jobs = Job.objects.filter(is_active=True).aggregate(count=Count('id'), updated=Max('updated_at'))
+    skills = JobSkill.objects.aggregate(count=Count('id'), last=Max('id'))
+    return jobs['count'], jobs['updated'], skills['count'], skills['last'], JobSkillRequirement.objects.count()
+
+
+autocomplete = Autocomplete()
+jobs_changed.connect(autocomplete.invalidate, dispatch_uid='api.autocomplete')
+for _model in (Job, JobSkill, JobSkillRequirement):
+    post_save.connect(autocomplete.invalidate, sender=_model, dispatch_uid=f'api.autocomplete.save.{_model.__name__}')
+    post_delete.connect(autocomplete.invalidate, sender=_model,
+                        dispatch_uid=f'api.autocomplete.delete.{_model.__name__}')
@@ -0,0 +1,36 @@
+"""
+System checks for the API app
+"""
+
+import importlib.util
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.compatibility, deploy=True)
+def check_asgi_server(app_configs, **kwargs):
+    """The async views need an ASGI server; backend.asgi is served with uvicorn"""
+    if importlib.util.find_spec('uvicorn') is None:
+        return [Warning(
+            'uvicorn is not installed.',
+            hint='Install requirements.txt and serve backend.asgi:application with uvicorn. Under WSGI '
+                 'the async views (AI jobs, resume upload, user profile/sync) hold a thread per request.',
+            id='api.W001',
+        )]
+    return []
+
+
+@register(Tags.caches, deploy=True)
+def check_http_cache(app_configs, **kwargs):
+    """Cached responses must be shared by the workers and served from memory"""
+    alias = getattr(settings, 'HTTP_CACHE_ALIAS', 'default')
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    if backend.endswith(('.locmem.LocMemCache', '.db.DatabaseCache', '.dummy.DummyCache')):
+        return [Warning(
+            f'HTTP_CACHE_ALIAS {alias!r} uses {backend.rsplit(".", 1)[-1]}.',
+            hint='Set REDIS_URL so API responses are cached in Redis, shared by every worker. A per-process '
+                 'cache misses other processes\' invalidations; the database cache queries on every hit.',
+            id='api.W002',
+        )]
+    return []
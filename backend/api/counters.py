@@ -0,0 +1,119 @@
+"""
+Write-coalesced counters
+
+Hot counters (job views, applications, recommendation impressions) are not
+written on every hit. Increments are buffered in memory per row and flushed
+periodically as one ``UPDATE ... SET field = field + delta`` per distinct delta.
+This keeps hot rows out of lock contention and loses no increments to
+read-modify-write races.
+
+Buffers are flushed every COUNTER_FLUSH_INTERVAL seconds, when COUNTER_MAX_PENDING
+rows are waiting, and at interpreter exit (graceful worker restarts). A worker
+that crashes loses at most one interval of increments.
+"""
+
+import atexit
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_MAX_PENDING = 1000
+
+
+class BufferedCounter:
+    """In-memory increments of one integer field, flushed in batches"""
+
+    def __init__(self, model, field: str, flush_interval: float = None, max_pending: int = None):
+        self.model = model
+        self.field = field
+        self.flush_interval = flush_interval or getattr(settings, 'COUNTER_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+        self.max_pending = max_pending or getattr(settings, 'COUNTER_MAX_PENDING', DEFAULT_MAX_PENDING)
+        self.deltas: Dict[int, int] = defaultdict(int)
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+
+    def incr(self, pk: int, amount: int = 1):
+        """Count ``amount`` for a row; written to the database on the next flush"""
+        with self.lock:
+            self.deltas[pk] += amount
+            full = len(self.deltas) >= self.max_pending
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._flush_periodically, name=f'counter-{self.field}', daemon=True
+                )
+                self.thread.start()
+        if full:
+            self.wakeup.set()
+
+    def pending(self, pk: int) -> int:
+        """Increments for a row that are not in the database yet"""
+        with self.lock:
+            return self.deltas.get(pk, 0)
+
+    def flush(self) -> int:
+        """Write buffered increments; returns the number of rows updated"""
+        with self.flush_lock:
+            with self.lock:
+                deltas, self.deltas = self.deltas, defaultdict(int)
+            if not deltas:
+                return 0
+
+            by_delta = defaultdict(list)
+            for pk, delta in deltas.items():
+                by_delta[delta].append(pk)
+            try:
+                # All or nothing, so a failed flush can put every increment back
+                with transaction.atomic():
+                    for delta, pks in by_delta.items():
+                        self.model.objects.filter(pk__in=pks).update(**{self.field: F(self.field) + delta})
+            except Exception as e:
+                logger.error(f"Error flushing {self.model.__name__}.{self.field} counters: {e}")
+                self._restore(deltas)
+                return 0
+            return len(deltas)
+
+    def _restore(self, deltas):
+        """Put back increments that could not be written so the next flush retries them"""
+        with self.lock:
+            for pk, delta in deltas.items():
+                self.deltas[pk] += delta
+
+    def _flush_periodically(self):
+        while True:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+
+def get_counter(model, field: str) -> BufferedCounter:
+    """The process-wide buffered counter for ``model.field``"""
+    key = (model._meta.label, field)
+    with _counters_lock:
+        if key not in _counters:
+            _counters[key] = BufferedCounter(model, field)
+        return _counters[key]
+
+
+def flush_all() -> int:
+    """Flush every counter in this process"""
+    with _counters_lock:
+        counters = list(_counters.values())
+    return sum(counter.flush() for counter in counters)
+
+
+_counters: Dict[Tuple[str, str], BufferedCounter] = {}
+_counters_lock = threading.Lock()
+atexit.register(flush_all)
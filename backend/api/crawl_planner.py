@@ -0,0 +1,287 @@
+"""
+Crawl planner for the AI job scheduler
+
+The plan is a table of (query, location, country) searches taken from what users
+actually search for and from their profiles. Each entry is refreshed on its own
+interval: popular searches whose results change often are crawled more often,
+rarely used or stable ones less often. Due entries are crawled by a small worker
+pool that shares the scraper's Adzuna rate budget.
+"""
+
+import logging
+import math
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from api.models import CrawlPlanEntry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COUNTRY = 'au'
+DEFAULT_SEARCHES = [('software engineer', 'perth', DEFAULT_COUNTRY)]
+
+MIN_REFRESH_INTERVAL = timedelta(minutes=15)
+MAX_REFRESH_INTERVAL = timedelta(hours=12)
+POPULARITY_HALF_LIFE = timedelta(days=3)
+CHANGE_RATE_SMOOTHING = 0.3
+
+# Entries below this popularity and unrequested for INACTIVE_AFTER stop being crawled
+MIN_ACTIVE_POPULARITY = 0.1
+INACTIVE_AFTER = timedelta(days=14)
+# Deactivated entries unrequested for this long are deleted
+DELETE_AFTER = timedelta(days=90)
+DEFAULT_RESULTS_PER_PAGE = 50
+
+# Request-triggered (stale-while-revalidate) refreshes run here, one per entry at a time
+_background_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='crawl-refresh')
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+class UnsupportedCountry(ValueError):
+    """The country has no Adzuna endpoint"""
+
+
+def validate_country(country: Optional[str]) -> Optional[str]:
+    """A user-supplied country as an Adzuna country code, or None for the default.
+
+    The code becomes part of the upstream URL path, so anything outside
+    job_scraper.COUNTRY_CURRENCIES is rejected.
+    """
+    if not country:
+        return None
+    code = country.strip().lower()
+    if code not in _load_scraper().COUNTRY_CURRENCIES:
+        raise UnsupportedCountry(f'Unsupported country: {country[:20]!r}')
+    return code
+
+
+def normalize_search(query: str, location: str, country: Optional[str] = None):
+    """Normalize a search so equivalent requests share one plan entry"""
+    return (
+        ' '.join((query or '').lower().split())[:255],
+        ' '.join((location or '').lower().split())[:255],
+        (country or DEFAULT_COUNTRY).lower()[:2],
+    )
+
+
+def record_search(query: str, location: str, country: Optional[str] = None) -> Optional[CrawlPlanEntry]:
+    """Count one user request for a search, adding it to the plan if it is new; returns the entry"""
+    query, location, country = normalize_search(query, location, country)
+    if not query:
+        return None
+    now = timezone.now()
+    updated = CrawlPlanEntry.objects.filter(query=query, location=location, country=country).update(
+        pending_hits=F('pending_hits') + 1, last_requested_at=now, is_active=True
+    )
+    if not updated:
+        CrawlPlanEntry.objects.bulk_create([
+            CrawlPlanEntry(query=query, location=location, country=country,
+                           pending_hits=1, last_requested_at=now, decayed_at=now)
+        ], ignore_conflicts=True)
+    return CrawlPlanEntry.objects.filter(query=query, location=location, country=country).first()
+
+
+def search_freshness(entry: Optional[CrawlPlanEntry]) -> Dict:
+    """How fresh the locally ingested results for a plan entry are"""
+    if entry is None or entry.last_crawled_at is None:
+        return {'last_refreshed': None, 'age_seconds': None, 'stale': True,
+                'refreshing': entry is not None and entry.pk in _refreshing}
+    now = timezone.now()
+    return {
+        'last_refreshed': entry.last_crawled_at.isoformat(),
+        'age_seconds': int((now - entry.last_crawled_at).total_seconds()),
+        'stale': entry.next_crawl_at is None or entry.next_crawl_at <= now,
+        'refreshing': entry.pk in _refreshing,
+    }
+
+
+def refresh_in_background(entry: CrawlPlanEntry) -> bool:
+    """Crawl an entry on the background pool unless it is already being refreshed"""
+    with _refreshing_lock:
+        if entry.pk in _refreshing:
+            return False
+        _refreshing.add(entry.pk)
+
+    def run():
+        try:
+            _crawl_in_worker(entry, DEFAULT_RESULTS_PER_PAGE, False)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(entry.pk)
+
+    _background_pool.submit(run)
+    return True
+
+
+def seed_from_profiles(country: Optional[str] = None, limit: int = 500) -> int:
+    """Add plan entries for the skills/location combinations found in user profiles"""
+    try:
+        from database.mongodb_connection import get_mongodb_collection
+        users = get_mongodb_collection('users').find(
+            {'location': {'$nin': [None, '']}, 'skills.0': {'$exists': True}},
+            {'skills': 1, 'location': 1},
+        )
+        searches = Counter(
+            normalize_search(' '.join(user['skills'][:2]), user['location'], country)
+            for user in users
+        )
+    except Exception as e:
+        logger.warning(f"Could not read user profiles for the crawl plan: {e}")
+        return 0
+
+    now = timezone.now()
+    created = CrawlPlanEntry.objects.bulk_create([
+        CrawlPlanEntry(query=query, location=location, country=country,
+                       popularity=float(count), decayed_at=now)
+        for (query, location, country), count in searches.most_common(limit)
+        if query
+    ], ignore_conflicts=True)
+    return len(created)
+
+
+def refresh_plan():
+    """Fold recorded hits into popularity, decaying older demand, and prune searches nobody makes"""
+    now = timezone.now()
+    if not CrawlPlanEntry.objects.exists():
+        CrawlPlanEntry.objects.bulk_create([
+            CrawlPlanEntry(query=query, location=location, country=country, decayed_at=now)
+            for query, location, country in DEFAULT_SEARCHES
+        ], ignore_conflicts=True)
+
+    # Each entry decays from its own last decay, so entries added since the last refresh do
+    # not stop the others decaying. Entries without popularity yet (new ones) have nothing to
+    # decay and take one UPDATE; the rest take one per distinct decayed_at, in practice one.
+    entries = CrawlPlanEntry.objects.exclude(popularity=0)
+    for decayed_at in entries.order_by().values_list('decayed_at', flat=True).distinct():
+        elapsed = max(now - decayed_at, timedelta(0)) if decayed_at is not None else timedelta(0)
+        entries.filter(Q(decayed_at=decayed_at) if decayed_at is not None else Q(decayed_at__isnull=True)).update(
+            popularity=F('popularity') * 0.5 ** (elapsed / POPULARITY_HALF_LIFE) + F('pending_hits'),
+            pending_hits=0,
+            decayed_at=now,
+        )
+    CrawlPlanEntry.objects.filter(popularity=0).update(popularity=F('pending_hits'), pending_hits=0, decayed_at=now)
+    prune_plan(now)
+
+
+def prune_plan(now=None) -> Dict[str, int]:
+    """Deactivate cold entries and delete long-inactive ones, so one-off searches are not crawled forever.
+
+    Entries that were never requested (seeded from profiles) age from when they were created.
+    A new request for a deactivated search reactivates it (see record_search).
+    """
+    now = now or timezone.now()
+    last_requested = Coalesce('last_requested_at', 'created_at')
+    entries = CrawlPlanEntry.objects.annotate(last_requested=last_requested)
+    deactivated = entries.filter(
+        is_active=True, popularity__lt=MIN_ACTIVE_POPULARITY, pending_hits=0,
+        last_requested__lt=now - INACTIVE_AFTER,
+    ).update(is_active=False)
+    deleted, _ = entries.filter(is_active=False, last_requested__lt=now - DELETE_AFTER).delete()
+    if deactivated or deleted:
+        logger.info(f"Crawl plan: deactivated {deactivated} cold entries, deleted {deleted} inactive ones")
+    return {'deactivated': deactivated, 'deleted': deleted}
+
+
+def refresh_interval(popularity: float, change_rate: float) -> timedelta:
+    """How long a plan entry's results are considered fresh"""
+    weight = (1.0 + math.sqrt(max(popularity, 0.0))) * (0.5 + min(max(change_rate, 0.0), 1.0))
+    return min(MAX_REFRESH_INTERVAL, max(MIN_REFRESH_INTERVAL, MAX_REFRESH_INTERVAL / weight))
+
+
+def due_entries(limit: Optional[int] = None) -> List[CrawlPlanEntry]:
+    """Entries whose refresh is due, most popular first"""
+    entries = CrawlPlanEntry.objects.filter(is_active=True).filter(
+        Q(next_crawl_at__isnull=True) | Q(next_crawl_at__lte=timezone.now())
+    ).order_by('-popularity', 'next_crawl_at')
+    return list(entries[:limit] if limit else entries)
+
+
+def crawl_entry(entry: CrawlPlanEntry, results_per_page: int = 50, save_snapshot: bool = False) -> Dict[str, int]:
+    """Scrape and ingest one plan entry, then schedule its next crawl"""
+    scraper = _load_scraper()
+    postings = scraper.iter_job_postings(entry.query, entry.location,
+                                         results_per_page=results_per_page, country=entry.country)
+    if save_snapshot:
+        postings = list(postings)
+    return _ingest_crawl(entry, postings, scraper, save_snapshot)
+
+
+async def acrawl_entry(entry: CrawlPlanEntry, results_per_page: int = DEFAULT_RESULTS_PER_PAGE) -> Dict[str, int]:
+    """crawl_entry for async views: the Adzuna round trip does not hold a thread"""
+    scraper = _load_scraper()
+    postings = await scraper.fetch_job_postings(entry.query, entry.location,
+                                                results_per_page=results_per_page, country=entry.country)
+    return await sync_to_async(_ingest_crawl)(entry, postings, scraper, False)
+
+
+def _ingest_crawl(entry, postings, scraper, save_snapshot) -> Dict[str, int]:
+    """Ingest a crawl's postings and schedule the entry's next crawl"""
+    from api.ingestion import ingest_postings
+
+    stats = ingest_postings(postings, currency=scraper.COUNTRY_CURRENCIES.get(entry.country, 'USD'))
+    if save_snapshot:
+        write_delta_snapshot(postings, stats, entry.query, entry.location, entry.country)
+
+    observed = (stats['created'] + stats['updated']) / stats['received'] if stats['received'] else 0.0
+    entry.change_rate = (1 - CHANGE_RATE_SMOOTHING) * entry.change_rate + CHANGE_RATE_SMOOTHING * observed
+    entry.last_crawled_at = timezone.now()
+    entry.last_result_count = stats['received']
+    entry.next_crawl_at = entry.last_crawled_at + refresh_interval(entry.popularity, entry.change_rate)
+    entry.save(update_fields=['change_rate', 'last_crawled_at', 'last_result_count', 'next_crawl_at'])
+    return stats
+
+
+def write_delta_snapshot(postings: List, stats: Dict, query: str, location: str, country: str):
+    """Snapshot only the postings that ingestion reported as added or changed"""
+    from job_snapshots import write_snapshot
+    delta = set(stats['delta']['added']) | set(stats['delta']['changed'])
+    return write_snapshot([p for p in postings if str(p.id) in delta], query, location, country)
+
+
+def run_crawl_plan(max_workers: int = 4, max_entries: Optional[int] = None,
+                   results_per_page: int = 50, save_snapshot: bool = False) -> List[Dict]:
+    """Crawl every due plan entry on a worker pool and return a per-entry summary"""
+    refresh_plan()
+    entries = due_entries(max_entries)
+    if not entries:
+        logger.info("No crawl plan entries are due")
+        return []
+
+    logger.info(f"Crawling {len(entries)} due plan entries with {max_workers} workers")
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda entry: _crawl_in_worker(entry, results_per_page, save_snapshot), entries))
+
+
+def _crawl_in_worker(entry: CrawlPlanEntry, results_per_page: int, save_snapshot: bool) -> Dict:
+    """Crawl one entry from a pool thread; failures are reported, not raised"""
+    summary = {'entry': str(entry), 'error': None}
+    try:
+        summary.update(crawl_entry(entry, results_per_page, save_snapshot))
+    except Exception as e:
+        logger.error(f"Error crawling {entry}: {e}")
+        summary['error'] = str(e)
+    finally:
+        # Each pool thread opens its own connection
+        connection.close()
+    return summary
+
+
+def _load_scraper():
+    """Import the AI job scraper module"""
+    ai_folder_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'AI')
+    if ai_folder_path not in sys.path:
+        sys.path.append(ai_folder_path)
+    import job_scraper
+    return job_scraper
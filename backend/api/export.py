@@ -0,0 +1,91 @@
+"""
+Streaming export of job search results
+
+Large pulls no longer go through job_list page by page, which repeats the COUNT
+and the OFFSET scan on every request. export_jobs() walks one query with a
+server-side cursor (``.iterator(chunk_size=...)``) and serializes it chunk by
+chunk through a JobProjection. Encoded lines are yielded as they are produced,
+so a StreamingHttpResponse sends them without ever holding the full result in
+memory.
+
+Under ASGI, Django collects a sync streaming iterator into a list before
+sending anything, so the export is handed over as an async iterator instead
+(aguard_stream), which pulls batches of lines from a worker thread.
+"""
+
+import csv
+import logging
+from itertools import islice
+from typing import AsyncIterator, Dict, Iterable, Iterator, List
+
+from asgiref.sync import sync_to_async
+
+from api.renderers import FastJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def export_jobs(jobs_query, projection, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict]:
+    """Serialized jobs, read ``chunk_size`` rows at a time from a server-side cursor"""
+    chunk: List[Dict] = []
+    for row in projection.apply(jobs_query).iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield from projection.serialize(chunk)
+            chunk = []
+    if chunk:
+        yield from projection.serialize(chunk)
+
+
+def ndjson_lines(items: Iterable[Dict]) -> Iterator[bytes]:
+    """One JSON document per line"""
+    renderer = FastJSONRenderer()
+    for item in items:
+        yield renderer.render(item) + b'\n'
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of buffering it"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(items: Iterable[Dict], fields: List[str]) -> Iterator[str]:
+    """A header row, then one row per item; list values are joined with '; '"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for item in items:
+        yield writer.writerow([
+            '; '.join(value) if isinstance(value, list) else value for value in (item[name] for name in fields)
+        ])
+
+
+def guard_stream(lines: Iterator, description: str) -> Iterator:
+    """Log errors raised mid-stream; the status code has already been sent, so the body just ends"""
+    try:
+        yield from lines
+    except Exception as e:
+        logger.error(f"Error streaming {description}: {e}")
+
+
+async def aguard_stream(lines: Iterable, description: str, batch_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator:
+    """guard_stream for ASGI: each batch of lines is produced on the request's sync thread, then sent"""
+    lines = iter(lines)
+    # Thread-sensitive, so the query's cursor stays on the thread (and connection) that opened it
+    next_batch = sync_to_async(lambda: list(islice(lines, batch_size)))
+    try:
+        while True:
+            batch = await next_batch()
+            if not batch:
+                return
+            yield batch[0][:0].join(batch)
+    except Exception as e:
+        logger.error(f"Error streaming {description}: {e}")
@@ -0,0 +1,116 @@
+"""
+Facet counts for the job filters
+
+The jobs page shows how many jobs match each category, location, job type and
+work location. facet_counts() computes all four for a filtered queryset in one
+statement. On PostgreSQL it uses GROUPING SETS, a single pass over the matching
+rows. Other databases get a UNION ALL of one GROUP BY per facet.
+
+For very large tables, unfiltered counts can be served from JobFacetCount, a
+materialized copy rebuilt by refresh_facet_table() (the refresh_job_facets
+command, run by the AI job scheduler). Set JOB_FACETS_MATERIALIZED to use it.
+"""
+
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, Value
+from django.utils import timezone
+
+# Facet name -> the Job column it counts
+FACETS = {
+    'category': 'category__name',
+    'location': 'location',
+    'job_type': 'job_type',
+    'work_location': 'work_location',
+}
+
+DEFAULT_FACET_LIMIT = 20
+
+# Materialized counts older than this are ignored in favour of a live query
+DEFAULT_MATERIALIZED_MAX_AGE = timedelta(hours=1)
+
+
+def facet_counts(jobs_query, limit: Optional[int] = DEFAULT_FACET_LIMIT) -> Dict[str, List[Dict]]:
+    """Counts per value of every facet, most common first, ``limit`` values per facet"""
+    jobs_query = jobs_query.order_by()
+    if connection.vendor == 'postgresql':
+        rows = _grouping_sets(jobs_query)
+    else:
+        rows = _union_of_groups(jobs_query)
+    return _top_values(rows, limit)
+
+
+def _grouping_sets(jobs_query):
+    aliases = {name: f'facet_{name}' for name in FACETS}
+    filtered = jobs_query.values(**{aliases[name]: F(column) for name, column in FACETS.items()})
+    sql, params = filtered.query.sql_with_params()
+    columns = list(aliases.values())
+    grouping = ', '.join(f'GROUPING({column})' for column in columns)
+    sets = ', '.join(f'({column})' for column in columns)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {", ".join(columns)}, {grouping}, COUNT(*) FROM ({sql}) AS filtered '
+            f'GROUP BY GROUPING SETS ({sets})',
+            params,
+        )
+        results = cursor.fetchall()
+
+    # GROUPING(column) is 0 in the rows grouped by that column
+    rows = []
+    names = list(FACETS)
+    for result in results:
+        values, flags, count = result[:len(names)], result[len(names):-1], result[-1]
+        index = flags.index(0)
+        rows.append((names[index], values[index], count))
+    return rows
+
+
+def _union_of_groups(jobs_query):
+    groups = [
+        jobs_query.annotate(facet=Value(name), value=F(column)).values('facet', 'value').annotate(count=Count('id'))
+        for name, column in FACETS.items()
+    ]
+    union = groups[0].union(*groups[1:], all=True)
+    return [(row['facet'], row['value'], row['count']) for row in union]
+
+
+def _top_values(rows, limit):
+    facets = {name: [] for name in FACETS}
+    for facet, value, count in rows:
+        facets[facet].append({'value': value, 'count': count})
+    for values in facets.values():
+        values.sort(key=lambda item: (-item['count'], item['value'] or ''))
+        if limit:
+            del values[limit:]
+    return facets
+
+
+def materialized_facet_counts(limit: Optional[int] = DEFAULT_FACET_LIMIT) -> Optional[Dict[str, List[Dict]]]:
+    """Unfiltered counts from JobFacetCount, or None if the table is empty or stale"""
+    from api.models import JobFacetCount
+
+    max_age = getattr(settings, 'JOB_FACETS_MAX_AGE', DEFAULT_MATERIALIZED_MAX_AGE)
+    rows = list(JobFacetCount.objects.values_list('facet', 'value', 'count', 'refreshed_at'))
+    if not rows or min(row[3] for row in rows) < timezone.now() - max_age:
+        return None
+    return _top_values([row[:3] for row in rows], limit)
+
+
+def refresh_facet_table() -> int:
+    """Rebuild JobFacetCount from the active jobs; returns the number of rows written"""
+    from api.http_cache import invalidate
+    from api.models import Job, JobFacetCount
+
+    counts = facet_counts(Job.objects.filter(is_active=True), limit=None)
+    now = timezone.now()
+    with transaction.atomic():
+        JobFacetCount.objects.all().delete()
+        created = JobFacetCount.objects.bulk_create([
+            JobFacetCount(facet=facet, value=item['value'], count=item['count'], refreshed_at=now)
+            for facet, values in counts.items() for item in values
+        ])
+    invalidate('job_facets')
+    return len(created)
@@ -0,0 +1,294 @@
+"""
+Location normalization and radius search
+
+Job locations and searched locations are free text, so ``location__icontains``
+lets "Perth" match "Perth Amboy" and cannot express "within 30 km". Locations
+are resolved to canonical places from a bundled offline gazetteer
+(data/gazetteer.csv): a name or alias, optionally qualified by a state or
+country ("Perth, WA", "Perth, Scotland"). Without a qualifier the most populous
+place wins.
+
+Resolutions are cached in GeocodeCache, keyed by the normalized text. The cache
+is read before the gazetteer, so a row can be edited to correct or add a place.
+Jobs store the resulting place_id, latitude and longitude. Ingested jobs are
+geocoded after commit through jobs_changed, and the geocode_jobs command
+backfills everything else.
+
+Radius queries first filter on a latitude/longitude bounding box, which
+job_lat_lon_idx serves, and then compute the exact haversine distance for the
+remaining rows only.
+"""
+
+import csv
+import logging
+import math
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.csv')
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+# A location without ?radius_km= matches jobs this close to the place (its suburbs)
+DEFAULT_RADIUS_KM = 25.0
+MAX_RADIUS_KM = 20000.0
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Country names accepted as qualifiers, besides the ISO code
+COUNTRY_NAMES = {
+    'AU': ('australia',),
+    'NZ': ('new zealand',),
+    'SG': ('singapore',),
+    'IN': ('india',),
+    'GB': ('united kingdom', 'uk', 'great britain', 'britain'),
+    'IE': ('ireland',),
+    'DE': ('germany',),
+    'CA': ('canada',),
+    'US': ('united states', 'united states of america', 'usa'),
+}
+
+
+class Place(NamedTuple):
+    id: str
+    name: str
+    admin: str
+    country: str
+    latitude: float
+    longitude: float
+    population: int
+
+
+class GeoPoint(NamedTuple):
+    place_id: str
+    latitude: float
+    longitude: float
+
+
+def _phrase(text: str) -> str:
+    """Lower-cased words of ``text``; punctuation and postcodes are dropped"""
+    return ' '.join(word for word in re.sub(r'[^\w\s]', ' ', text.lower()).split() if not word.isdigit())
+
+
+def cache_key(text: str) -> str:
+    """Normalized location text, as stored in GeocodeCache"""
+    return ' '.join((text or '').lower().split())[:255]
+
+
+class Gazetteer:
+    """Places by name and alias, with the state and country terms that qualify them"""
+
+    def __init__(self, places: Iterable[Place], qualifiers: Dict[str, set], names: Dict[str, List[str]]):
+        self.places = {place.id: place for place in places}
+        self.qualifiers = qualifiers  # place id -> accepted qualifier phrases
+        self.by_name: Dict[str, List[Place]] = {}
+        for place_id, place_names in names.items():
+            for name in place_names:
+                self.by_name.setdefault(name, []).append(self.places[place_id])
+        self.qualifier_terms = set().union(*qualifiers.values()) if qualifiers else set()
+
+    @classmethod
+    def from_csv(cls, path: str = GAZETTEER_PATH) -> 'Gazetteer':
+        places, qualifiers, names = [], {}, {}
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                place = Place(row['place_id'], row['name'], row['admin'], row['country'],
+                              float(row['latitude']), float(row['longitude']), int(row['population'] or 0))
+                places.append(place)
+                terms = {row['admin'], row['admin_name'], row['country'], *COUNTRY_NAMES.get(row['country'], ())}
+                qualifiers[place.id] = {_phrase(term) for term in terms if term}
+                aliases = [alias for alias in row['aliases'].split('|') if alias]
+                names[place.id] = list(dict.fromkeys(_phrase(name) for name in [row['name'], *aliases]))
+        return cls(places, qualifiers, names)
+
+    def lookup(self, text: str) -> Optional[Place]:
+        """The place a free-text location refers to, or None.
+
+        Comma-separated parts are tried in order. Within a part the longest
+        leading run of words that names a place wins, and the rest of the part
+        and the later parts may qualify it with a state or country.
+        """
+        parts = [phrase for phrase in (_phrase(part) for part in (text or '').split(',')) if phrase]
+        for index, part in enumerate(parts):
+            words = part.split(' ')
+            for length in range(len(words), 0, -1):
+                candidates = self.by_name.get(' '.join(words[:length]))
+                if not candidates:
+                    continue
+                phrases = [' '.join(words[length:]), *parts[index + 1:]]
+                known = [phrase for phrase in phrases if phrase in self.qualifier_terms]
+                matching = [place for place in candidates if all(q in self.qualifiers[place.id] for q in known)]
+                if matching:
+                    return max(matching, key=lambda place: place.population)
+        return None
+
+
+@lru_cache(maxsize=1)
+def load_gazetteer() -> Gazetteer:
+    """The bundled gazetteer, loaded once per process"""
+    return Gazetteer.from_csv()
+
+
+def geocode_many(texts: Iterable[str]) -> Dict[str, Optional[GeoPoint]]:
+    """Resolve location texts to points, with one cache query and one insert for new texts"""
+    from api.models import GeocodeCache
+
+    keys = {text: cache_key(text) for text in set(texts) if cache_key(text)}
+    resolved = {
+        query: (place_id, latitude, longitude)
+        for query, place_id, latitude, longitude in GeocodeCache.objects.filter(
+            query__in=set(keys.values())
+        ).values_list('query', 'place_id', 'latitude', 'longitude')
+    }
+
+    missing = set(keys.values()) - resolved.keys()
+    if missing:
+        gazetteer = load_gazetteer()
+        new_entries = []
+        for query in missing:
+            place = gazetteer.lookup(query)
+            resolved[query] = (place.id, place.latitude, place.longitude) if place else ('', None, None)
+            new_entries.append(GeocodeCache(query=query, place_id=resolved[query][0],
+                                            latitude=resolved[query][1], longitude=resolved[query][2]))
+        GeocodeCache.objects.bulk_create(new_entries, ignore_conflicts=True, batch_size=DEFAULT_BATCH_SIZE)
+
+    points = {}
+    for text, query in keys.items():
+        place_id, latitude, longitude = resolved[query]
+        points[text] = GeoPoint(place_id, latitude, longitude) if place_id and latitude is not None else None
+    return points
+
+
+def geocode(text: str) -> Optional[GeoPoint]:
+    """Resolve one location text"""
+    return geocode_many([text]).get(text) if text else None
+
+
+def geocode_jobs(jobs_query, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Store place_id/latitude/longitude on the given jobs; returns how many changed"""
+    from api.models import Job
+
+    updated, last_id = 0, 0
+    while True:
+        batch = list(jobs_query.filter(id__gt=last_id).order_by('id').only(
+            'id', 'location', 'place_id', 'latitude', 'longitude'
+        )[:batch_size])
+        if not batch:
+            return updated
+        last_id = batch[-1].id
+        points = geocode_many(job.location for job in batch)
+        changed = []
+        for job in batch:
+            point = points.get(job.location) or GeoPoint('', None, None)
+            if (job.place_id, job.latitude, job.longitude) != tuple(point):
+                job.place_id, job.latitude, job.longitude = point
+                changed.append(job)
+        Job.objects.bulk_update(changed, ['place_id', 'latitude', 'longitude'], batch_size=batch_size)
+        updated += len(changed)
+
+
+def connect_geocoding():
+    """Geocode ingested jobs once their batch has committed"""
+    from api.signals import jobs_changed
+
+    jobs_changed.connect(_on_jobs_changed, dispatch_uid='geocoding.jobs_changed')
+
+
+def _on_jobs_changed(sender, added_ids=(), changed_ids=(), **kwargs):
+    from api.models import Job
+
+    job_ids = [*added_ids, *changed_ids]
+    if not job_ids:
+        return
+    try:
+        geocode_jobs(Job.objects.filter(id__in=job_ids))
+    except Exception as e:
+        logger.error(f"Error geocoding {len(job_ids)} changed jobs: {e}")
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Q:
+    """Latitude/longitude ranges containing every point within ``radius_km``"""
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    box = Q(latitude__gte=max(min_lat, -90.0), latitude__lte=min(max_lat, 90.0))
+    if min_lat <= -90 or max_lat >= 90:
+        return box  # the circle contains a pole, so every longitude
+    # Longitude degrees are shortest at the box edge farthest from the equator
+    delta_lon = delta_lat / math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if delta_lon >= 180:
+        return box
+    min_lon, max_lon = longitude - delta_lon, longitude + delta_lon
+    if min_lon < -180:
+        return box & (Q(longitude__gte=min_lon + 360) | Q(longitude__lte=max_lon))
+    if max_lon > 180:
+        return box & (Q(longitude__gte=min_lon) | Q(longitude__lte=max_lon - 360))
+    return box & Q(longitude__gte=min_lon, longitude__lte=max_lon)
+
+
+def haversine_distance(latitude: float, longitude: float) -> Case:
+    """Great-circle distance in km from a point to each job's coordinates, computed in the database"""
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    half_chord = (
+        Power(Sin((Radians('latitude') - lat) / 2), 2) +
+        Cos(Radians('latitude')) * math.cos(lat) * Power(Sin((Radians('longitude') - lon) / 2), 2)
+    )
+    # PostgreSQL's LEAST skips NULLs, so jobs without coordinates are kept out explicitly
+    return Case(
+        When(latitude__isnull=False, longitude__isnull=False,
+             then=2 * EARTH_RADIUS_KM * ASin(Sqrt(Least(half_chord, Value(1.0))))),
+        output_field=FloatField(),
+    )
+
+
+def search_point(location: str = '', latitude: str = '', longitude: str = '') -> Optional[GeoPoint]:
+    """The point a search is centred on: explicit ?lat=&lon=, else the geocoded location"""
+    try:
+        lat, lon = float(latitude), float(longitude)
+        if -90 <= lat <= 90 and -180 <= lon <= 180:
+            return GeoPoint('', lat, lon)
+    except ValueError:
+        pass
+    return geocode(location) if location else None
+
+
+def search_radius(radius_km: str = '') -> float:
+    """The requested ?radius_km=, bounded, else the configured default"""
+    try:
+        return min(max(float(radius_km), 0.0), MAX_RADIUS_KM)
+    except ValueError:
+        return getattr(settings, 'LOCATION_SEARCH_RADIUS_KM', DEFAULT_RADIUS_KM)
+
+
+def filter_by_location(jobs_query, location: str, point: Optional[GeoPoint], radius_km: str = ''):
+    """Restrict jobs to a searched location.
+
+    Around a point, jobs within the radius match and get ``distance_km``. Jobs
+    not geocoded yet, and locations the gazetteer does not know, fall back to a
+    substring match.
+    """
+    if point is None:
+        return jobs_query.filter(location__icontains=location)
+    radius = search_radius(radius_km)
+
+    jobs_query = jobs_query.annotate(distance_km=haversine_distance(point.latitude, point.longitude))
+    # The bounding box is an indexed range scan; the exact distance is only checked inside it
+    matches = bounding_box(point.latitude, point.longitude, radius) & Q(distance_km__lte=radius)
+    if location:
+        matches |= Q(latitude__isnull=True, location__icontains=location)
+    return jobs_query.filter(matches)
+
+
+def with_distance(jobs_query):
+    """Make sure ``distance_km`` is annotated; it is None when the search has no point"""
+    if 'distance_km' in jobs_query.query.annotations:
+        return jobs_query
+    return jobs_query.annotate(distance_km=Value(None, output_field=FloatField()))
@@ -0,0 +1,167 @@
+"""
+Response caching for read-mostly API endpoints
+
+cache_response() stores a view's 200 responses per endpoint and query string for a
+per-endpoint TTL. Fields that change on every hit, such as a job's view count, are
+not served from the cache: a ``live`` function reads them per request and merges
+them into the cached payload. It tags them with a strong ETag (a hash of the payload) and
+answers a matching If-None-Match with 304 Not Modified. Cache keys include a
+generation number per endpoint, and optionally per object, which model signals
+bump when the underlying rows change (see connect_invalidation()). Stale entries
+are therefore never served and simply expire.
+
+Generations live in the HTTP_CACHE_ALIAS cache. In production that is the
+'shared' Redis cache (REDIS_URL), so that writes in one process, such as the
+scheduler's ingestion, invalidate every worker. It must be memory-backed: with
+the database cache every hit costs two SELECTs and takes no load off the
+database. A per-process cache (LocMem, the default without REDIS_URL) only sees
+its own process's invalidations; use one only when a single process serves the
+API and writes the data.
+"""
+
+import hashlib
+import json
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+GENERATION_TTL = 7 * 24 * 3600
+
+
+def cache_response(namespace: str, ttl: int, object_kwarg: str = None, live=None):
+    """Cache a GET view's responses; ``object_kwarg`` names the URL kwarg for per-object invalidation.
+
+    ``live(data, *args, **kwargs)`` returns the cached payload updated with fields read
+    fresh for every request; the ETag covers them.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            object_id = kwargs.get(object_kwarg) if object_kwarg else None
+            try:
+                key = _response_key(namespace, object_id, request)
+                cached = _cache().get(key)
+            except Exception as e:
+                logger.warning(f"HTTP cache unavailable for {namespace}: {e}")
+                return view(request, *args, **kwargs)
+
+            if cached is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                cached = {'etag': _etag(response.data), 'data': response.data}
+                try:
+                    _cache().set(key, cached, ttl)
+                except Exception as e:
+                    logger.warning(f"Could not cache {namespace} response: {e}")
+
+            data, etag = cached['data'], cached['etag']
+            if live is not None:
+                data = live(data, *args, **kwargs)
+                etag = _etag(data)
+            if etag in _if_none_match(request):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response(data)
+            response['ETag'] = etag
+            response['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+
+def invalidate(namespace: str, object_id=None):
+    """Drop cached responses of an endpoint, or only those for one object"""
+    key = _generation_key(namespace, object_id)
+    cache = _cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, GENERATION_TTL)
+
+
+# Endpoints whose responses embed each model; object-level entries name the
+# attribute holding the job id, so only that job's detail is invalidated
+DEPENDENCIES = {
+    'Job': [('job_list', None), ('job_facets', None), ('job_detail', 'id')],
+    'Company': [('job_list', None), ('job_detail', None)],
+    'JobCategory': [('categories', None), ('job_list', None), ('job_facets', None), ('job_detail', None)],
+    'JobSkill': [('skills', None), ('job_list', None), ('job_detail', None)],
+    'JobSkillRequirement': [('job_list', None), ('job_detail', 'job_id')],
+}
+
+
+def connect_invalidation():
+    """Invalidate cached responses when the models they are built from change"""
+    from api import models
+    from api.signals import jobs_changed
+
+    if isinstance(_cache(), LocMemCache):
+        logger.warning("HTTP_CACHE_ALIAS is a per-process cache: changes made by other processes "
+                       "(scheduler, other workers) will not invalidate cached responses")
+    elif isinstance(_cache(), DatabaseCache):
+        logger.warning("HTTP_CACHE_ALIAS is a database cache: every cache hit still queries the "
+                       "database; set REDIS_URL to use Redis")
+
+    for model_name in DEPENDENCIES:
+        model = getattr(models, model_name)
+        post_save.connect(_on_model_change, sender=model, dispatch_uid=f'http_cache.save.{model_name}')
+        post_delete.connect(_on_model_change, sender=model, dispatch_uid=f'http_cache.delete.{model_name}')
+    # Bulk ingestion bypasses post_save
+    jobs_changed.connect(_on_jobs_changed, dispatch_uid='http_cache.jobs_changed')
+
+
+def _on_model_change(sender, instance, **kwargs):
+    try:
+        for namespace, id_attr in DEPENDENCIES[sender.__name__]:
+            invalidate(namespace, getattr(instance, id_attr) if id_attr else None)
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached responses for {sender.__name__}: {e}")
+
+
+def _on_jobs_changed(sender, changed_ids=(), deactivated_ids=(), **kwargs):
+    try:
+        invalidate('job_list')
+        invalidate('job_facets')
+        for job_id in [*changed_ids, *deactivated_ids]:
+            invalidate('job_detail', job_id)
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached job responses: {e}")
+
+
+def _response_key(namespace, object_id, request):
+    generation_keys = [_generation_key(namespace)]
+    if object_id is not None:
+        generation_keys.append(_generation_key(namespace, object_id))
+    generations = _cache().get_many(generation_keys)
+    params = sorted((key, request.GET.getlist(key)) for key in request.GET)
+    digest = hashlib.sha1(json.dumps([request.path, params]).encode()).hexdigest()
+    versions = ':'.join(str(generations.get(key, 0)) for key in generation_keys)
+    return f'httpcache:{namespace}:{versions}:{digest}'
+
+
+def _generation_key(namespace, object_id=None):
+    return f'httpcache:gen:{namespace}' + (f':{object_id}' if object_id is not None else '')
+
+
+def _etag(data):
+    payload = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return '"' + hashlib.sha256(payload.encode()).hexdigest()[:32] + '"'
+
+
+def _if_none_match(request):
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    return {tag.strip() for tag in header.split(',') if tag.strip()}
+
+
+def _cache():
+    return caches[getattr(settings, 'HTTP_CACHE_ALIAS', 'default')]
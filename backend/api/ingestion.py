@@ -0,0 +1,279 @@
+"""
+Ingestion of scraped job postings into the Job/Company tables
+
+Postings carry a content hash (job_scraper.compute_content_hash). Postings whose
+hash matches the stored job are only marked as seen; new and changed postings are
+written, and their ids are broadcast through api.signals.jobs_changed so
+downstream stages can update incrementally.
+"""
+
+import logging
+import os
+import sys
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.models import Company, Job, JobCategory
+from api.signals import jobs_changed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+# External ids of the scraper's demo postings (job_scraper._iter_mock_job_postings); never stored
+MOCK_ID_PREFIX = 'mock_'
+
+# Fields refreshed on every upsert of an existing posting
+UPSERT_UPDATE_FIELDS = [
+    'title', 'company', 'category', 'description', 'location',
+    'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+    'salary_annual_min', 'salary_annual_max', 'application_url',
+    'posted_date', 'is_active', 'last_seen_at', 'content_hash', 'updated_at',
+]
+
+
+def ingest_postings(postings: Iterable, source: str = 'adzuna', currency: str = 'AUD',
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
+    """Upsert scraped postings into Job, keyed by their external (Adzuna) id.
+
+    Postings are consumed as a stream and written in batches. Each batch costs a
+    fixed number of queries regardless of its size. Returns counts plus ``delta``,
+    the external ids of the postings that were added or changed.
+    """
+    stats = {'received': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0,
+             'delta': {'added': [], 'changed': []}}
+    seen_at = timezone.now()
+
+    batch = []
+    for posting in postings:
+        batch.append(posting)
+        if len(batch) >= batch_size:
+            _merge_stats(stats, _ingest_batch(batch, source, currency, seen_at))
+            batch = []
+    if batch:
+        _merge_stats(stats, _ingest_batch(batch, source, currency, seen_at))
+
+    logger.info(f"Ingested {stats['received']} postings from {source}: {stats['created']} created, "
+                f"{stats['updated']} updated, {stats['unchanged']} unchanged, {stats['skipped']} skipped")
+    return stats
+
+
+def deactivate_missing_jobs(source: str = 'adzuna', max_age: timedelta = timedelta(hours=48)) -> int:
+    """Deactivate scraped jobs that have not been seen by any crawl within ``max_age``"""
+    cutoff = timezone.now() - max_age
+    with transaction.atomic():
+        stale = Job.objects.filter(source=source, is_active=True, last_seen_at__lt=cutoff)
+        job_ids = list(stale.order_by().values_list('id', flat=True))
+        if not job_ids:
+            return 0
+        Job.objects.filter(id__in=job_ids).update(is_active=False, updated_at=timezone.now())
+        transaction.on_commit(lambda: jobs_changed.send(
+            sender=Job, added_ids=[], changed_ids=[], deactivated_ids=job_ids
+        ))
+    logger.info(f"Deactivated {len(job_ids)} {source} jobs not seen since {cutoff.isoformat()}")
+    return len(job_ids)
+
+
+def normalize_stored_salaries(only_missing: bool = True, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Fill salary_annual_min/max for stored jobs from their salary, period and currency"""
+    jobs = Job.objects.exclude(salary_min__isnull=True, salary_max__isnull=True)
+    if only_missing:
+        jobs = jobs.filter(salary_annual_min__isnull=True)
+    normalizer = _load_salary_normalizer()
+
+    updated, last_id = 0, 0
+    while True:
+        rows = list(
+            jobs.filter(id__gt=last_id).order_by('id').values_list(
+                'id', 'salary_min', 'salary_max', 'salary_period', 'salary_currency'
+            )[:batch_size]
+        )
+        if not rows:
+            return updated
+        last_id = rows[-1][0]
+        frame = normalizer.normalize_salary_frame(
+            pd.DataFrame(rows, columns=['id', 'salary_min', 'salary_max', 'salary_period', 'salary_currency']),
+            period_col='salary_period', currency_col='salary_currency',
+        )
+        Job.objects.bulk_update([
+            Job(id=job_id, salary_annual_min=_to_decimal(annual_min), salary_annual_max=_to_decimal(annual_max))
+            for job_id, annual_min, annual_max in zip(
+                frame['id'], frame['salary_annual_min'], frame['salary_annual_max']
+            )
+        ], ['salary_annual_min', 'salary_annual_max'])
+        updated += len(rows)
+
+
+def _ingest_batch(batch: List, source: str, currency: str, seen_at) -> Dict:
+    """Upsert one batch of postings, writing only those that are new or changed"""
+    # Later duplicates of the same id win; ON CONFLICT cannot touch a row twice
+    postings = {
+        str(posting.id): posting for posting in batch
+        if posting.id and not str(posting.id).startswith(MOCK_ID_PREFIX)
+    }
+    mock_count = sum(1 for posting in batch if str(posting.id).startswith(MOCK_ID_PREFIX))
+    if mock_count:
+        logger.warning(f"Skipped {mock_count} mock postings; only real search results are ingested")
+    stats = {'received': len(batch), 'created': 0, 'updated': 0, 'unchanged': 0,
+             'skipped': len(batch) - len(postings), 'delta': {'added': [], 'changed': []}}
+    if not postings:
+        return stats
+
+    with transaction.atomic():
+        existing = {
+            external_id: (content_hash, is_active)
+            for external_id, content_hash, is_active in Job.objects.filter(
+                external_id__in=postings.keys()
+            ).order_by().values_list('external_id', 'content_hash', 'is_active')
+        }
+        added, changed, unchanged = [], [], []
+        for external_id, posting in postings.items():
+            if external_id not in existing:
+                added.append(external_id)
+            elif existing[external_id] != (posting.content_hash, True):
+                changed.append(external_id)
+            else:
+                unchanged.append(external_id)
+
+        if unchanged:
+            Job.objects.filter(external_id__in=unchanged).update(last_seen_at=seen_at)
+
+        written = added + changed
+        if written:
+            company_ids = _resolve_companies({_company_name(postings[eid]) for eid in written})
+            category_ids = _resolve_categories({postings[eid].skills for eid in written if postings[eid].skills})
+            salaries = _annualize_salaries([postings[eid] for eid in written], currency)
+            Job.objects.bulk_create(
+                [
+                    _build_job(eid, postings[eid], source, currency, seen_at, company_ids, category_ids, salary)
+                    for eid, salary in zip(written, salaries)
+                ],
+                update_conflicts=True,
+                unique_fields=['external_id'],
+                update_fields=UPSERT_UPDATE_FIELDS,
+            )
+            job_ids = dict(
+                Job.objects.filter(external_id__in=written).order_by().values_list('external_id', 'id')
+            )
+            added_ids = [job_ids[eid] for eid in added]
+            changed_ids = [job_ids[eid] for eid in changed]
+            transaction.on_commit(lambda: jobs_changed.send(
+                sender=Job, added_ids=added_ids, changed_ids=changed_ids, deactivated_ids=[]
+            ))
+
+    stats.update(created=len(added), updated=len(changed), unchanged=len(unchanged),
+                 delta={'added': added, 'changed': changed})
+    return stats
+
+
+def _build_job(external_id, posting, source, currency, seen_at, company_ids, category_ids, salary) -> Job:
+    """Map a posting onto an unsaved Job instance"""
+    annual_min, annual_max, period = salary
+    return Job(
+        external_id=external_id,
+        source=source,
+        title=(posting.title or 'Unknown')[:255],
+        company_id=company_ids[_company_name(posting)],
+        category_id=category_ids.get((posting.skills or '')[:100]),
+        description=posting.description or '',
+        requirements='',
+        location=(posting.location or 'Unknown')[:255],
+        salary_min=_to_decimal(posting.salary_min),
+        salary_max=_to_decimal(posting.salary_max),
+        salary_currency=currency,
+        salary_period=period,
+        salary_annual_min=_to_decimal(annual_min),
+        salary_annual_max=_to_decimal(annual_max),
+        application_url=posting.redirect_url if posting.redirect_url and len(posting.redirect_url) <= 500 else None,
+        posted_date=_parse_created(posting.created) or seen_at,
+        is_active=True,
+        last_seen_at=seen_at,
+        content_hash=posting.content_hash,
+    )
+
+
+def _annualize_salaries(postings: List, currency: str) -> List:
+    """Annual (min, max, period) salaries for a batch of postings, in one vectorized pass"""
+    normalizer = _load_salary_normalizer()
+    frame = normalizer.normalize_salary_frame(pd.DataFrame({
+        'salary_min': [posting.salary_min for posting in postings],
+        'salary_max': [posting.salary_max for posting in postings],
+    }, dtype='object'), currency=currency)
+    return list(zip(frame['salary_annual_min'], frame['salary_annual_max'], frame['salary_period']))
+
+
+def _load_salary_normalizer():
+    """Import the AI salary normalizer module"""
+    ai_folder_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'AI')
+    if ai_folder_path not in sys.path:
+        sys.path.append(ai_folder_path)
+    import salary_normalizer
+    return salary_normalizer
+
+
+def _company_name(posting) -> str:
+    return (posting.company or 'Unknown')[:255]
+
+
+def _resolve_companies(names) -> Dict[str, int]:
+    """Map company names to ids, creating the missing ones in bulk"""
+    company_ids = {}
+    # Company.name is not unique; reuse the oldest row for each name
+    for company_id, name in Company.objects.filter(name__in=names).order_by('-id').values_list('id', 'name'):
+        company_ids[name] = company_id
+
+    missing = names - company_ids.keys()
+    if missing:
+        Company.objects.bulk_create([Company(name=name) for name in missing])
+        for company_id, name in Company.objects.filter(name__in=missing).order_by('-id').values_list('id', 'name'):
+            company_ids[name] = company_id
+    return company_ids
+
+
+def _resolve_categories(names) -> Dict[str, int]:
+    """Map category labels to JobCategory ids, creating the missing ones in bulk"""
+    names = {name[:100] for name in names}
+    if not names:
+        return {}
+    JobCategory.objects.bulk_create([JobCategory(name=name) for name in names], ignore_conflicts=True)
+    return dict(JobCategory.objects.filter(name__in=names).values_list('name', 'id'))
+
+
+def _to_decimal(value) -> Optional[Decimal]:
+    """Convert a numeric salary to Decimal, dropping anything unusable"""
+    if value is None or value == '' or value != value:  # NaN from the salary normalizer
+        return None
+    try:
+        amount = Decimal(str(value)).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        return None
+    return amount if amount.is_finite() and abs(amount) < Decimal('1e8') else None
+
+
+def _parse_created(created):
+    """Parse the posting's created timestamp into an aware datetime"""
+    if not created:
+        return None
+    try:
+        posted = parse_datetime(str(created))
+    except ValueError:
+        return None
+    if posted is not None and timezone.is_naive(posted):
+        posted = timezone.make_aware(posted)
+    return posted
+
+
+def _merge_stats(total: Dict, batch: Dict):
+    for key, value in batch.items():
+        if key == 'delta':
+            total['delta']['added'].extend(value['added'])
+            total['delta']['changed'].extend(value['changed'])
+        else:
+            total[key] += value
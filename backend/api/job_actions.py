@@ -0,0 +1,164 @@
+"""
+Batched job actions (save, unsave, apply, view)
+
+The frontend fires save/unsave/apply calls in bursts, e.g. when syncing saved
+jobs from localStorage. apply_job_actions() takes the whole list and applies it
+in one transaction with a fixed number of queries: one lookup for the jobs, a
+bulk insert for saves and applications, one delete for unsaves, and a bulk
+insert for the receipts.
+
+Every action carries a client-supplied ``key``. Its result is stored as a
+JobActionReceipt, so a retried batch replays the stored results instead of
+applying the actions (and counting applications and views) again.
+"""
+
+from datetime import timedelta
+from typing import Dict, List
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+ACTIONS = ('save', 'unsave', 'apply', 'view')
+
+MAX_BATCH_SIZE = 500
+
+# Keys are only remembered this long; a retry after that applies the action again
+RECEIPT_TTL = timedelta(days=7)
+
+
+class InvalidBatch(ValueError):
+    """Raised when a batch as a whole cannot be processed"""
+
+
+def apply_job_actions(user, actions: List[Dict]) -> List[Dict]:
+    """Apply a batch of actions for ``user``; returns one result per action, in order.
+
+    Each action is ``{'key', 'action', 'job_id'}``, or ``external_id`` instead of
+    ``job_id`` for AI jobs. Invalid actions get an error result and do not stop
+    the others.
+    """
+    from api.counters import get_counter
+    from api.models import Job, JobActionReceipt, JobApplication, SavedJob
+
+    if not isinstance(actions, list):
+        raise InvalidBatch('actions must be a list')
+    if len(actions) > MAX_BATCH_SIZE:
+        raise InvalidBatch(f'At most {MAX_BATCH_SIZE} actions per batch')
+
+    now = timezone.now()
+    with transaction.atomic():
+        JobActionReceipt.objects.filter(user=user, created_at__lt=now - RECEIPT_TTL).delete()
+        keys = [item.get('key') for item in actions if isinstance(item, dict)]
+        receipts = dict(JobActionReceipt.objects.filter(
+            user=user, key__in=[key for key in keys if isinstance(key, str)]
+        ).values_list('key', 'result'))
+        jobs = _resolve_jobs(Job, actions)
+
+        results, pending, seen = [], [], set()
+        for item in actions:
+            result = _validate(item, jobs, receipts, seen)
+            results.append(result)
+            if result['status'] == 'pending':
+                pending.append(result)
+
+        # Save/unsave: the last action on a job wins
+        saved_state = {}
+        for result in pending:
+            if result['action'] in ('save', 'unsave'):
+                saved_state[result['job_id']] = result['action'] == 'save'
+        to_save = [job_id for job_id, saved in saved_state.items() if saved]
+        to_unsave = [job_id for job_id, saved in saved_state.items() if not saved]
+        if to_save:
+            SavedJob.objects.bulk_create(
+                [SavedJob(user=user, job_id=job_id, saved_date=now) for job_id in to_save], ignore_conflicts=True
+            )
+        if to_unsave:
+            SavedJob.objects.filter(user=user, job_id__in=to_unsave).delete()
+
+        # Apply: one application per job; only new applications are counted
+        to_apply = list(dict.fromkeys(result['job_id'] for result in pending if result['action'] == 'apply'))
+        new_applications = []
+        if to_apply:
+            existing = set(JobApplication.objects.filter(user=user, job_id__in=to_apply).values_list('job_id', flat=True))
+            new_applications = [job_id for job_id in to_apply if job_id not in existing]
+            JobApplication.objects.bulk_create(
+                [JobApplication(user=user, job_id=job_id, applied_date=now) for job_id in new_applications],
+                ignore_conflicts=True
+            )
+
+        for result in pending:
+            result['status'] = 'ok'
+        JobActionReceipt.objects.bulk_create([
+            JobActionReceipt(user=user, key=result['key'], action=result['action'], result=result, created_at=now)
+            for result in pending
+        ], ignore_conflicts=True)
+
+        # Counters are buffered and written in batches (see api.counters)
+        def count():
+            for job_id in new_applications:
+                get_counter(Job, 'applications_count').incr(job_id)
+            for result in pending:
+                if result['action'] == 'view':
+                    get_counter(Job, 'views_count').incr(result['job_id'])
+        transaction.on_commit(count)
+
+    return results
+
+
+def _resolve_jobs(Job, actions):
+    """Map the job_id and external_id values of a batch to job pks, in one query"""
+    ids, external_ids = set(), set()
+    for item in actions:
+        if not isinstance(item, dict):
+            continue
+        # Same precedence and types as _validate
+        if 'external_id' in item:
+            if isinstance(item['external_id'], str):
+                external_ids.add(item['external_id'])
+        elif _is_job_id(item.get('job_id')):
+            ids.add(item['job_id'])
+    if not ids and not external_ids:
+        return {}
+
+    jobs = {}
+    for job_id, external_id in Job.objects.filter(
+        Q(id__in=ids) | Q(external_id__in=external_ids)
+    ).values_list('id', 'external_id'):
+        jobs[('job_id', job_id)] = job_id
+        if external_id:
+            jobs[('external_id', external_id)] = job_id
+    return jobs
+
+
+def _validate(item, jobs, receipts, seen):
+    if not isinstance(item, dict):
+        return {'key': None, 'status': 'error', 'error': 'Action must be an object'}
+    key, action = item.get('key'), item.get('action')
+    result = {'key': key, 'action': action}
+    if not isinstance(key, str) or not key or len(key) > 100:
+        return dict(result, status='error', error='A key of 1-100 characters is required')
+    if key in receipts:
+        return dict(receipts[key], replayed=True)
+    if key in seen:
+        return dict(result, status='error', error='Duplicate key in batch')
+    seen.add(key)
+    if action not in ACTIONS:
+        return dict(result, status='error', error=f'Unknown action: {action}')
+
+    if 'external_id' in item:
+        if not isinstance(item['external_id'], str):
+            return dict(result, status='error', error='external_id must be a string')
+        job_id = jobs.get(('external_id', item['external_id']))
+    else:
+        if not _is_job_id(item.get('job_id')):
+            return dict(result, status='error', error='job_id must be an integer')
+        job_id = jobs.get(('job_id', item['job_id']))
+    if job_id is None:
+        return dict(result, status='error', error='Job not found')
+    return dict(result, job_id=job_id, status='pending')
+
+
+def _is_job_id(value) -> bool:
+    # bool is an int subclass, but true/false are not job ids
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -0,0 +1,194 @@
+"""
+In-memory search index over the ingested jobs
+
+get_ai_jobs answers from this index instead of scraping and fitting a recommender
+per request. The index is a TF-IDF matrix (fitted by the AI JobRecommender) over
+every active Job row. It is rebuilt in the background when jobs change: in this
+process through the jobs_changed signal, and across processes (the scheduler runs
+separately) by polling a cheap version of the Job table. Searches keep using the
+previous index until the new one is ready.
+"""
+
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from django.db import connection
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from api.geocoding import EARTH_RADIUS_KM, GeoPoint, search_radius
+from api.models import Job
+from api.signals import jobs_changed
+
+logger = logging.getLogger(__name__)
+
+# How often a search checks whether another process changed the Job table
+VERSION_CHECK_INTERVAL = 30.0
+
+
+class IndexSnapshot:
+    """An immutable, fitted index; searches read it without locking"""
+
+    def __init__(self, job_ids, locations, latitudes, longitudes, vectorizer, matrix, version, built_at):
+        self.job_ids = job_ids
+        self.locations = locations
+        self.latitudes = latitudes  # NaN where the job is not geocoded
+        self.longitudes = longitudes
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        self.version = version
+        self.built_at = built_at
+
+
+class JobIndex:
+    """Shared index of active jobs with stale-while-revalidate rebuilds"""
+
+    def __init__(self):
+        self.snapshot: Optional[IndexSnapshot] = None
+        self.dirty = True
+        self.checked_at = 0.0
+        self.lock = threading.Lock()  # held for the whole build
+        self.rebuild_lock = threading.Lock()  # guards self.rebuilding only
+        self.rebuilding = False
+
+    def search(self, query: str = '', skills: Optional[List[str]] = None, resume_text: str = '',
+               location: str = '', point: Optional[GeoPoint] = None, limit: int = 20,
+               wait_for_rebuild: bool = False) -> List[Tuple[int, float]]:
+        """Return (job id, score) pairs for the best matching active jobs.
+
+        ``point`` is the geocoded ``location`` (see api.geocoding.search_point); without
+        one the location is matched by substring.
+        """
+        snapshot = self.current(wait_for_rebuild)
+        if snapshot is None or not len(snapshot.job_ids):
+            return []
+
+        user_text = ' '.join(filter(None, [query, ' '.join(skills or []), resume_text]))
+        # TF-IDF rows are L2-normalized, so the dot product is the cosine similarity
+        scores = (snapshot.matrix @ snapshot.vectorizer.transform([user_text]).T).toarray().ravel()
+        if location:
+            scores = np.where(_location_matches(snapshot, location, point), scores, 0.0)
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(snapshot.job_ids[i]), float(scores[i])) for i in candidates]
+
+    def profile_terms(self, text: str, limit: int = 30) -> Dict[str, float]:
+        """The heaviest terms of ``text``'s TF-IDF vector in the index vocabulary, with their weights"""
+        snapshot = self.current()
+        if snapshot is None or snapshot.vectorizer is None:
+            return {}
+        vector = snapshot.vectorizer.transform([text])
+        names = snapshot.vectorizer.get_feature_names_out()
+        heaviest = np.argsort(-vector.data, kind='stable')[:limit]
+        return {str(names[vector.indices[i]]): round(float(vector.data[i]), 4) for i in heaviest}
+
+    def current(self, wait_for_rebuild: bool = False) -> Optional[IndexSnapshot]:
+        """The index to search, scheduling a rebuild if it is out of date"""
+        if self.snapshot is None or wait_for_rebuild:
+            if self.snapshot is None or self._is_stale():
+                self.rebuild()
+            return self.snapshot
+        if self._is_stale():
+            self._rebuild_in_background()
+        return self.snapshot
+
+    def invalidate(self, **kwargs):
+        """Mark the index as out of date (jobs_changed receiver)"""
+        self.dirty = True
+
+    def rebuild(self):
+        """Build a new index from the active jobs and swap it in"""
+        with self.lock:
+            # Cleared first so an invalidation during the build is not lost
+            self.dirty = False
+            version = _data_version()
+            rows = list(
+                Job.objects.filter(is_active=True).order_by('id').values_list(
+                    'id', 'title', 'description', 'category__name', 'location', 'latitude', 'longitude'
+                )
+            )
+            frame = pd.DataFrame(rows, columns=['id', 'title', 'description', 'skills', 'location',
+                                                'latitude', 'longitude'])
+            coordinates = [frame.pop(column).astype(float).to_numpy() for column in ('latitude', 'longitude')]
+            frame = frame.fillna('')
+            if frame.empty:
+                self.snapshot = IndexSnapshot(np.array([], dtype=np.int64), frame['location'], *coordinates,
+                                              None, None, version, timezone.now())
+            else:
+                recommender = _load_recommender()().fit(frame)
+                self.snapshot = IndexSnapshot(
+                    frame['id'].to_numpy(), frame['location'].str.lower().reset_index(drop=True), *coordinates,
+                    recommender.vectorizer, recommender.job_matrix.tocsr(), version, timezone.now(),
+                )
+            self.checked_at = time.monotonic()
+            logger.info(f"Built job index over {len(frame)} active jobs")
+        return self.snapshot
+
+    def _is_stale(self) -> bool:
+        if self.dirty:
+            return True
+        if time.monotonic() - self.checked_at < VERSION_CHECK_INTERVAL:
+            return False
+        self.checked_at = time.monotonic()
+        return self.snapshot is None or _data_version() != self.snapshot.version
+
+    def _rebuild_in_background(self):
+        with self.rebuild_lock:
+            if self.rebuilding:
+                return
+            self.rebuilding = True
+        threading.Thread(target=self._rebuild_worker, name='job-index-rebuild', daemon=True).start()
+
+    def _rebuild_worker(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.error(f"Error rebuilding job index: {e}")
+        finally:
+            self.rebuilding = False
+            connection.close()
+
+
+def _location_matches(snapshot: IndexSnapshot, location: str, point: Optional[GeoPoint]) -> np.ndarray:
+    """Which indexed jobs are at a searched location, matched like api.geocoding.filter_by_location"""
+    substring = snapshot.locations.str.contains(location.lower(), regex=False).to_numpy()
+    if point is None:
+        return substring
+    lat, lon = np.radians(snapshot.latitudes), np.radians(snapshot.longitudes)
+    half_chord = (np.sin((lat - math.radians(point.latitude)) / 2) ** 2 +
+                  np.cos(lat) * math.cos(math.radians(point.latitude)) *
+                  np.sin((lon - math.radians(point.longitude)) / 2) ** 2)
+    with np.errstate(invalid='ignore'):
+        distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(half_chord, 1.0)))
+        nearby = distance <= search_radius()
+    # Jobs not geocoded yet fall back to the substring match
+    return nearby | (np.isnan(snapshot.latitudes) & substring)
+
+
+def _data_version():
+    """Cheap fingerprint of the active jobs; changes when rows are added, edited or deactivated"""
+    version = Job.objects.filter(is_active=True).aggregate(count=Count('id'), updated=Max('updated_at'))
+    return version['count'], version['updated']
+
+
+def _load_recommender():
+    """Import the AI JobRecommender class"""
+    ai_folder_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'AI')
+    if ai_folder_path not in sys.path:
+        sys.path.append(ai_folder_path)
+    from recommender.job_recommender import JobRecommender
+    return JobRecommender
+
+
+job_index = JobIndex()
+jobs_changed.connect(job_index.invalidate, dispatch_uid='api.job_index')
@@ -0,0 +1,157 @@
+"""
+Django management command to compare the sync and async AI jobs request paths
+
+Both paths serve cold searches, each of which needs an Adzuna round trip. They
+run against the local Adzuna stand-in (AI/adzuna_stub_server.py) with injected
+latency, on a temporary test database:
+
+- sync: the request path before the async views, on a pool of --threads
+  threads, the concurrency limit of a threaded WSGI worker
+- async: GET /api/jobs/ai/ through the ASGI application, all requests at once
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+ROLES = ['Software Engineer', 'Frontend Developer', 'Data Scientist', 'Data Analyst', 'DevOps Engineer',
+         'Registered Nurse', 'Primary School Teacher', 'Electrician', 'Civil Engineer', 'Accountant',
+         'Project Manager', 'Sales Representative']
+SENIORITY = ['', 'Junior ', 'Senior ', 'Lead ', 'Graduate ']
+LOCATIONS = ['Perth', 'Sydney', 'Melbourne', 'Brisbane', 'Adelaide', 'Canberra', 'Hobart']
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput and latency of the sync and async AI jobs request paths'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=64,
+            help='Distinct cold searches sent to each path'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Worker threads for the sync path'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=200.0,
+            help='Latency the Adzuna stand-in adds to every page'
+        )
+
+    def handle(self, *args, **options):
+        ai_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__)))))), 'AI')
+        if ai_folder not in sys.path:
+            sys.path.append(ai_folder)
+        import job_scraper
+        from adzuna_stub_server import StubConfig, start_in_background
+
+        server, base_url = start_in_background(port=0, corpus_size=5000, config=StubConfig(options['latency_ms']))
+        job_scraper.API_BASE_URL = base_url
+        job_scraper.rate_limiter = job_scraper.RateLimiter(10 ** 9, burst=10 ** 6)
+
+        searches = [
+            (f'{seniority}{role}', location)
+            for seniority in SENIORITY for role in ROLES for location in LOCATIONS
+        ]
+        if options['requests'] * 2 > len(searches):
+            self.stdout.write(self.style.ERROR(f"--requests can be at most {len(searches) // 2}"))
+            return
+
+        with tempfile.TemporaryDirectory() as directory:
+            old_name = self._create_test_database(directory)
+            try:
+                self.stdout.write(f"{options['requests']} cold searches per path, "
+                                  f"{options['latency_ms']:.0f} ms upstream latency")
+                sync_searches = searches[:options['requests']]
+                async_searches = searches[options['requests']:options['requests'] * 2]
+                self._report(f"sync, {options['threads']} threads", self._run_sync(sync_searches, options['threads']))
+                self._report('async (ASGI)', asyncio.run(self._run_async(async_searches)))
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                server.shutdown()
+
+    def _create_test_database(self, directory):
+        """Switch to a fresh test database; SQLite gets a file so every thread sees it"""
+        old_name = connection.settings_dict['NAME']
+        if connection.vendor == 'sqlite':
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(directory, 'bench.sqlite3')
+            # Concurrent writers queue for the lock instead of failing with "database is locked"
+            connection.settings_dict['OPTIONS'].update(transaction_mode='IMMEDIATE', timeout=60)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        return old_name
+
+    def _run_sync(self, searches, threads):
+        """The AI jobs request path before the async views: crawl, then rank, holding a thread throughout"""
+        from api.crawl_planner import DEFAULT_RESULTS_PER_PAGE, crawl_entry, record_search
+        from api.job_index import job_index
+        from api.models import Job
+        from api.views import _serialize_ai_job
+
+        def request(search):
+            started = time.perf_counter()
+            try:
+                entry = record_search(*search)
+                crawl_entry(entry, results_per_page=DEFAULT_RESULTS_PER_PAGE)
+                matches = job_index.search(query=search[0], location=search[1], limit=20, wait_for_rebuild=True)
+                jobs = Job.objects.select_related('company', 'category').in_bulk([job_id for job_id, _ in matches])
+                [_serialize_ai_job(jobs[job_id], round(score * 100, 1)) for job_id, score in matches if job_id in jobs]
+            finally:
+                connection.close()
+            return started, time.perf_counter()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            intervals = list(pool.map(request, searches))
+        return time.perf_counter() - started, intervals
+
+    async def _run_async(self, searches):
+        """Concurrent GET /api/jobs/ai/ requests, served in-process by the ASGI application"""
+        import httpx
+        from django.core.asgi import get_asgi_application
+
+        transport = httpx.ASGITransport(app=get_asgi_application())
+
+        async with httpx.AsyncClient(transport=transport, base_url='http://localhost', timeout=None) as client:
+            async def request(search):
+                started = time.perf_counter()
+                response = await client.get('/api/jobs/ai/', params={'query': search[0], 'location': search[1]})
+                response.raise_for_status()
+                return started, time.perf_counter()
+
+            started = time.perf_counter()
+            intervals = await asyncio.gather(*(request(search) for search in searches))
+        return time.perf_counter() - started, intervals
+
+    def _report(self, label, run):
+        elapsed, intervals = run
+        latencies = sorted(end - start for start, end in intervals)
+        self.stdout.write(
+            f"{label:<20} {len(intervals) / elapsed:>7.1f} req/s  "
+            f"p50 {statistics.median(latencies) * 1000:>6.0f} ms  "
+            f"p95 {latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000:>6.0f} ms  "
+            f"peak in flight {self._peak_in_flight(intervals)}"
+        )
+
+    @staticmethod
+    def _peak_in_flight(intervals):
+        """Most requests open at the same moment"""
+        events = sorted([(start, 1) for start, _ in intervals] + [(end, -1) for _, end in intervals])
+        peak = in_flight = 0
+        for _, change in events:
+            in_flight += change
+            peak = max(peak, in_flight)
+        return peak
@@ -0,0 +1,131 @@
+"""
+Django management command to measure job list serialization cost
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+SAMPLE_DESCRIPTION = ('We are looking for an experienced engineer to join a growing team. ' * 40).strip()
+
+
+class Rollback(Exception):
+    """Raised to discard the sample jobs created for the benchmark"""
+
+
+class Command(BaseCommand):
+    help = 'Compare payload size and CPU time per response of the job list serialization paths'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=100,
+            help='Number of jobs per response'
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Responses rendered per serialization path'
+        )
+        parser.add_argument(
+            '--fields',
+            type=str,
+            default='id,title,company,location,salary,description,posted_date',
+            help='Sparse fieldset measured alongside the full projection'
+        )
+        parser.add_argument(
+            '--description-length',
+            type=int,
+            default=200,
+            help='Description truncation measured with the sparse fieldset'
+        )
+
+    def handle(self, *args, **options):
+        # Sample jobs are only created when the database has too few, and are rolled back
+        try:
+            with transaction.atomic():
+                self._ensure_jobs(options['page_size'])
+                self._report(options)
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def _report(self, options):
+        from api.models import Job
+        from api.projections import JOB_LIST_FIELDS, JobProjection
+        from api.renderers import FastJSONRenderer, orjson
+
+        page_size, iterations = options['page_size'], options['iterations']
+        jobs_query = Job.objects.filter(is_active=True).order_by('-posted_date', '-id')
+        full = JobProjection(JOB_LIST_FIELDS)
+        sparse = JobProjection(JOB_LIST_FIELDS, options['fields'].split(','), options['description_length'])
+
+        paths = [
+            ('model instances + JSONRenderer', lambda: self._baseline(jobs_query, page_size), JSONRenderer()),
+            ('projection + FastJSONRenderer', lambda: self._projected(full, jobs_query, page_size),
+             FastJSONRenderer()),
+            (f"?fields=...&description_length={options['description_length']}",
+             lambda: self._projected(sparse, jobs_query, page_size), FastJSONRenderer()),
+        ]
+
+        self.stdout.write(f"{page_size} jobs per response, {iterations} iterations, "
+                          f"orjson {'available' if orjson else 'not installed'}")
+        for label, build, renderer in paths:
+            started = time.process_time()
+            for _ in range(iterations):
+                payload = renderer.render({'success': True, 'jobs': build()})
+            cpu_ms = (time.process_time() - started) * 1000 / iterations
+            self.stdout.write(f'{label:<45} {len(payload):>9,} bytes {cpu_ms:>8.2f} ms CPU/response')
+
+    @staticmethod
+    def _baseline(jobs_query, page_size):
+        """The serialization job_list used before projections"""
+        from api.views import _required_skill_names, _with_required_skills
+
+        jobs = _with_required_skills(jobs_query.select_related('company', 'category'))[:page_size]
+        return [{
+            'id': job.id,
+            'title': job.title,
+            'company': job.company.name,
+            'company_id': job.company.id,
+            'location': job.location,
+            'salary': f"${job.salary_min:,.0f} - ${job.salary_max:,.0f}" if job.salary_min and job.salary_max else "Salary not specified",
+            'description': job.description,
+            'requirements': _required_skill_names(job),
+            'job_type': job.job_type,
+            'work_location': job.work_location,
+            'category': job.category.name if job.category else None,
+            'posted_date': job.posted_date.isoformat(),
+            'application_deadline': job.application_deadline.isoformat() if job.application_deadline else None,
+            'is_featured': job.is_featured,
+            'views_count': job.views_count,
+            'applications_count': job.applications_count
+        } for job in jobs]
+
+    @staticmethod
+    def _projected(projection, jobs_query, page_size):
+        return projection.serialize(list(projection.apply(jobs_query)[:page_size]))
+
+    def _ensure_jobs(self, page_size):
+        from api.models import Company, Job, JobSkill, JobSkillRequirement
+
+        missing = page_size - Job.objects.filter(is_active=True).count()
+        if missing <= 0:
+            return
+        company, _ = Company.objects.get_or_create(name='Benchmark Corp')
+        skills = [JobSkill.objects.get_or_create(name=name)[0] for name in ('Python', 'Django', 'SQL', 'AWS')]
+        now = timezone.now()
+        jobs = Job.objects.bulk_create([
+            Job(title=f'Software Engineer {i}', company=company, location='Perth, WA', description=SAMPLE_DESCRIPTION,
+                requirements=SAMPLE_DESCRIPTION, salary_min=90000, salary_max=120000, posted_date=now)
+            for i in range(missing)
+        ])
+        JobSkillRequirement.objects.bulk_create([
+            JobSkillRequirement(job=job, skill=skill, is_required=True) for job in jobs for skill in skills
+        ])
+        self.stdout.write(f'Created {missing} temporary sample jobs')
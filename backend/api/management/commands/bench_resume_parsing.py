@@ -0,0 +1,232 @@
+"""
+Django management command to measure resume parsing throughput
+
+Synthetic TXT, DOCX and PDF resumes are parsed:
+
+- serially in this process, per format (the cost of api.resume_parser alone)
+- on the parser process pool, reported in resumes per second and per second
+  per core
+- through the whole pipeline (api.resumes.parse_resume), cold and then again
+  with every result cached by content hash
+
+The pipeline runs against a temporary test database and media directory.
+"""
+
+import io
+import os
+import random
+import statistics
+import tempfile
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import override_settings
+
+SKILLS = ['Python', 'Django', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'SQL', 'PostgreSQL', 'AWS',
+          'Docker', 'Kubernetes', 'Machine Learning', 'Data Analysis', 'Excel', 'Power BI', 'Tableau',
+          'Project Management', 'Agile', 'Scrum', 'Java', 'C++', 'C#', 'Go', 'Git', 'Linux', 'Azure',
+          'Customer Service', 'Sales', 'Accounting', 'Financial Reporting', 'Patient Care', 'Teaching',
+          'Communication', 'Leadership', 'Stakeholder Management', 'AutoCAD', 'Electrical Wiring']
+ROLES = ['Software Engineer', 'Data Analyst', 'Project Manager', 'Registered Nurse', 'Accountant',
+         'Civil Engineer', 'Teacher', 'Sales Representative', 'DevOps Engineer', 'Electrician']
+COMPANIES = ['Acme Corp', 'Southern Cross Health', 'Harbour Bank', 'Pilbara Mining', 'Coastal Schools',
+             'Nimbus Cloud', 'Redgum Retail', 'Swan Engineering']
+FILLER = ('delivered improved managed built supported reduced led designed reported trained maintained '
+          'the team project system customers process costs quality weekly across new existing').split()
+DEGREES = ['Bachelor of Science', 'Master of Business Administration', 'Diploma of Nursing',
+           'Bachelor of Engineering', 'PhD in Computer Science']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+def sample_resume(rng: random.Random) -> str:
+    """A plausible resume of a few hundred words"""
+    role = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, rng.randint(6, 14))
+    lines = [f'Candidate {rng.randint(1, 10 ** 6)}', role,
+             f'{rng.randint(2, 15)}+ years of experience in {", ".join(skills[:3])}.', '', 'EXPERIENCE']
+    year = 2025
+    for _ in range(rng.randint(2, 5)):
+        start = year - rng.randint(1, 4)
+        end = 'Present' if year == 2025 else f'{rng.choice(MONTHS)} {year}'
+        lines.append(f'{role}, {rng.choice(COMPANIES)}  {rng.choice(MONTHS)} {start} - {end}')
+        for _ in range(rng.randint(3, 6)):
+            words = rng.choices(FILLER, k=rng.randint(8, 16)) + [rng.choice(skills)]
+            rng.shuffle(words)
+            lines.append('- ' + ' '.join(words).capitalize() + '.')
+        year = start
+    lines += ['', 'EDUCATION', f'{rng.choice(DEGREES)}, University of Western Australia 2008 - 2011',
+              '', 'SKILLS', ', '.join(skills)]
+    return '\n'.join(lines)
+
+
+def docx_bytes(text: str) -> bytes:
+    """A minimal DOCX with one paragraph per line; the same text always gives the same bytes"""
+    paragraphs = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+                         for line in text.split('\n'))
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{paragraphs}</w:body></w:document>')
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/></Types>'
+    )
+    relationships = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="word/document.xml" Type="http://schemas.openxmlformats.org/'
+        'officeDocument/2006/relationships/officeDocument"/></Relationships>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in [('[Content_Types].xml', content_types), ('_rels/.rels', relationships),
+                              ('word/document.xml', document)]:
+            # A fixed timestamp: writestr(name, ...) would stamp the current time
+            entry = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            archive.writestr(entry, content, compress_type=zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+
+def pdf_bytes(text: str) -> bytes:
+    """A single-page PDF drawing each line with a standard font, in a compressed content stream"""
+    def literal(line):
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    operators = ' T* '.join(f'({literal(line)}) Tj' for line in text.split('\n'))
+    stream = zlib.compress(f'BT /F1 9 Tf 11 TL 40 800 Td {operators} ET'.encode('latin-1', 'replace'))
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 4 0 R >> >> '
+        b'/Contents 5 0 R >>',
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream',
+    ]
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+FORMATS = {
+    '.txt': lambda text: text.encode(),
+    '.docx': docx_bytes,
+    '.pdf': pdf_bytes,
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure resume parsing throughput: serial, on the parser process pool, and through the cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resumes',
+            type=int,
+            default=300,
+            help='Synthetic resumes, split evenly across TXT, DOCX and PDF'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=1,
+            help='Seed for the synthetic resumes'
+        )
+
+    def handle(self, *args, **options):
+        from api import resume_parser, resumes
+
+        rng = random.Random(options['seed'])
+        files = []
+        for i in range(options['resumes']):
+            extension = list(FORMATS)[i % len(FORMATS)]
+            files.append((FORMATS[extension](sample_resume(rng)), extension))
+        workers = resumes.parse_workers()
+        cores = min(workers, os.cpu_count() or 1)
+        extractor = 'pypdf' if resume_parser.PdfReader is not None else 'built-in reader'
+        self.stdout.write(f"{len(files)} resumes, {len(SKILLS)} taxonomy skills, {workers} parser processes "
+                          f"on {os.cpu_count()} cores; PDF text through the {extractor}")
+
+        for extension in FORMATS:
+            timings = []
+            for data, file_extension in files:
+                if file_extension == extension:
+                    started = time.perf_counter()
+                    resume_parser.analyze(data, extension, SKILLS)
+                    timings.append(time.perf_counter() - started)
+            self.stdout.write(f"serial {extension:<6} {statistics.median(timings) * 1000:>7.2f} ms/resume (median)")
+
+        started = time.perf_counter()
+        pool = resumes._process_pool()
+        list(pool.map(resume_parser.analyze, *zip(*[(b'warm up', '.txt', SKILLS)] * workers)))
+        self.stdout.write(f"process pool start  {time.perf_counter() - started:>7.2f} s (once per server process)")
+        started = time.perf_counter()
+        list(pool.map(resume_parser.analyze, *zip(*[(data, extension, SKILLS) for data, extension in files]),
+                      chunksize=4))
+        elapsed = time.perf_counter() - started
+        self._report('process pool', len(files), elapsed, cores)
+
+        with tempfile.TemporaryDirectory() as directory:
+            old_name = self._create_test_database(directory)
+            try:
+                with override_settings(MEDIA_ROOT=directory):
+                    self._run_pipeline(files, workers, cores)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                resumes._reset_process_pool()
+
+    def _run_pipeline(self, files, workers, cores):
+        """parse_resume for every stored file: cold, then answered from the ResumeAnalysis cache"""
+        import hashlib
+
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+
+        from api.models import JobSkill
+        from api.resumes import parse_resume
+
+        JobSkill.objects.bulk_create([JobSkill(name=name) for name in SKILLS])
+        stored = []
+        for data, extension in files:
+            content_hash = hashlib.sha256(data).hexdigest()
+            stored.append((default_storage.save(f'resumes/{content_hash}{extension}', ContentFile(data)),
+                           content_hash))
+
+        def parse(item):
+            try:
+                return parse_resume(*item)
+            finally:
+                connection.close()
+
+        for label in ('pipeline, cold', 'pipeline, cached'):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers * 2) as threads:
+                list(threads.map(parse, stored))
+            self._report(label, len(stored), time.perf_counter() - started, cores)
+
+    def _create_test_database(self, directory):
+        """Switch to a fresh test database; SQLite gets a file so every thread sees it"""
+        old_name = connection.settings_dict['NAME']
+        if connection.vendor == 'sqlite':
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(directory, 'bench.sqlite3')
+            # Concurrent writers queue for the lock instead of failing with "database is locked"
+            connection.settings_dict['OPTIONS'].update(transaction_mode='IMMEDIATE', timeout=60)
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        return old_name
+
+    def _report(self, label, count, elapsed, cores):
+        self.stdout.write(f"{label:<18} {count / elapsed:>8.1f} resumes/s  "
+                          f"{count / elapsed / cores:>8.1f} resumes/s per core")
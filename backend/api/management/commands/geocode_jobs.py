@@ -0,0 +1,45 @@
+"""
+Django management command to backfill place ids and coordinates on stored jobs
+"""
+
+from django.core.management.base import BaseCommand
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Resolve job locations to gazetteer places and store place_id, latitude and longitude'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-geocode every job, not only those without coordinates, and retry cached misses'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of jobs geocoded per query'
+        )
+
+    def handle(self, *args, **options):
+        from api.geocoding import geocode_jobs
+        from api.models import GeocodeCache, Job
+
+        try:
+            jobs = Job.objects.all()
+            if options['all']:
+                # Misses are cached too; drop them so an updated gazetteer gets another try
+                GeocodeCache.objects.filter(place_id='').delete()
+            else:
+                jobs = jobs.filter(latitude__isnull=True)
+            updated = geocode_jobs(jobs, batch_size=options['batch_size'])
+            self.stdout.write(
+                self.style.SUCCESS(f'Geocoded {updated} jobs')
+            )
+        except Exception as e:
+            logger.error(f"Error geocoding jobs: {e}")
+            self.stdout.write(
+                self.style.ERROR(f'Error geocoding jobs: {e}')
+            )
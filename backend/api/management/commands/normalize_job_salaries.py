@@ -0,0 +1,41 @@
+"""
+Django management command to backfill annualized salaries on stored jobs
+"""
+
+from django.core.management.base import BaseCommand
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Compute salary_annual_min/salary_annual_max for stored jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute every job with a salary, not only those missing annual values'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of jobs normalized per query'
+        )
+
+    def handle(self, *args, **options):
+        from api.ingestion import normalize_stored_salaries
+
+        try:
+            updated = normalize_stored_salaries(
+                only_missing=not options['all'],
+                batch_size=options['batch_size'],
+            )
+            self.stdout.write(
+                self.style.SUCCESS(f'Normalized salaries for {updated} jobs')
+            )
+        except Exception as e:
+            logger.error(f"Error normalizing job salaries: {e}")
+            self.stdout.write(
+                self.style.ERROR(f'Error normalizing job salaries: {e}')
+            )
@@ -2,11 +2,11 @@
 Django management command to refresh AI jobs from the scraper
 """
 
+from datetime import timedelta
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 import os
 import sys
-import pandas as pd
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,6 +27,12 @@ class Command(BaseCommand):
             default='Perth',
             help='Job search location'
         )
+        parser.add_argument(
+            '--country',
+            type=str,
+            default=None,
+            help='Adzuna country code (defaults to the scraper\'s API_COUNTRY)'
+        )
         parser.add_argument(
             '--limit',
             type=int,
@@ -36,7 +42,45 @@ class Command(BaseCommand):
         parser.add_argument(
             '--save-to-csv',
             action='store_true',
-            help='Save results to CSV file'
+            help='Save results to AI/jobs.csv, overwriting the previous file (legacy; prefer --save-snapshot)'
+        )
+        parser.add_argument(
+            '--save-snapshot',
+            action='store_true',
+            help='Append results to the date/query partitioned Parquet snapshots in AI/snapshots'
+        )
+        parser.add_argument(
+            '--ingest',
+            action='store_true',
+            help='Upsert the fetched jobs into the Job/Company tables'
+        )
+        parser.add_argument(
+            '--deactivate-after-hours',
+            type=int,
+            default=48,
+            help='With --ingest, deactivate scraped jobs not seen for this many hours (0 disables)'
+        )
+        parser.add_argument(
+            '--plan',
+            action='store_true',
+            help='Crawl every due entry of the crawl plan instead of a single query (implies --ingest)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='With --plan, number of concurrent crawl workers'
+        )
+        parser.add_argument(
+            '--max-entries',
+            type=int,
+            default=None,
+            help='With --plan, crawl at most this many due entries'
+        )
+        parser.add_argument(
+            '--seed-from-profiles',
+            action='store_true',
+            help='With --plan, add plan entries derived from user profiles first'
         )
 
     def handle(self, *args, **options):
@@ -45,45 +89,79 @@ class Command(BaseCommand):
         )
 
         try:
-            # Add AI folder to Python path
-            ai_folder_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'AI')
+            # Add AI folder to Python path (repository root / AI)
+            ai_folder_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))), 'AI')
             if ai_folder_path not in sys.path:
                 sys.path.append(ai_folder_path)
 
+            if options['plan']:
+                self._run_plan(options)
+                return
+
             # Import AI modules
-            from job_scraper import load_job_data
+            from job_scraper import API_COUNTRY, COUNTRY_CURRENCIES, iter_job_postings, postings_to_frame
 
             query = options['query']
             location = options['location']
             limit = options['limit']
+            country = options['country']
 
             self.stdout.write(f'Fetching jobs for: "{query}" in {location} (limit: {limit})')
 
             # Fetch jobs from AI scraper
-            job_df = load_job_data(query, location, results_per_page=limit)
+            postings = list(iter_job_postings(query, location, results_per_page=limit, country=country))
 
-            if job_df.empty:
+            if not postings:
                 self.stdout.write(
                     self.style.WARNING('No jobs found for the given criteria')
                 )
                 return
 
             self.stdout.write(
-                self.style.SUCCESS(f'Successfully fetched {len(job_df)} jobs')
+                self.style.SUCCESS(f'Successfully fetched {len(postings)} jobs')
             )
 
             # Save to CSV if requested
             if options['save_to_csv']:
                 csv_path = os.path.join(ai_folder_path, 'jobs.csv')
-                job_df.to_csv(csv_path, index=False)
+                postings_to_frame(postings).to_csv(csv_path, index=False)
                 self.stdout.write(
                     self.style.SUCCESS(f'Jobs saved to CSV: {csv_path}')
                 )
 
+            # Upsert into the job tables if requested
+            stats = None
+            if options['ingest']:
+                from api.ingestion import ingest_postings
+
+                stats = ingest_postings(postings, currency=COUNTRY_CURRENCIES.get(country or API_COUNTRY, 'USD'))
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Ingested {stats['received']} jobs: {stats['created']} created, "
+                        f"{stats['updated']} updated, {stats['unchanged']} unchanged, {stats['skipped']} skipped"
+                    )
+                )
+                self._deactivate_missing(options)
+
+            # Keep a typed, partitioned snapshot of this batch if requested;
+            # after ingestion only the added and changed postings are kept
+            if options['save_snapshot']:
+                if stats is not None:
+                    from api.crawl_planner import write_delta_snapshot
+
+                    snapshot_path = write_delta_snapshot(postings, stats, query, location, country or API_COUNTRY)
+                else:
+                    from job_snapshots import write_snapshot
+
+                    snapshot_path = write_snapshot(postings, query, location, country or API_COUNTRY)
+                self.stdout.write(
+                    self.style.SUCCESS(f'Jobs saved to snapshot: {snapshot_path or "no changes"}')
+                )
+
             # Display sample jobs
             self.stdout.write('\nSample jobs found:')
-            for i, (index, row) in enumerate(job_df.head(3).iterrows()):
-                self.stdout.write(f'{i+1}. {row.get("Job Title", "Unknown")} at {row.get("Company", "Unknown")}')
+            for i, posting in enumerate(postings[:3]):
+                self.stdout.write(f'{i+1}. {posting.title} at {posting.company}')
 
             self.stdout.write(
                 self.style.SUCCESS('AI job refresh completed successfully!')
@@ -94,3 +172,39 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.ERROR(f'Error refreshing AI jobs: {e}')
             )
+
+    def _run_plan(self, options):
+        """Crawl the due entries of the crawl plan"""
+        from api.crawl_planner import run_crawl_plan, seed_from_profiles
+
+        if options['seed_from_profiles']:
+            self.stdout.write(f'Added {seed_from_profiles(options["country"])} plan entries from user profiles')
+
+        results = run_crawl_plan(
+            max_workers=options['workers'],
+            max_entries=options['max_entries'],
+            results_per_page=options['limit'],
+            save_snapshot=options['save_snapshot'],
+        )
+        for result in results:
+            if result['error']:
+                self.stdout.write(self.style.ERROR(f"{result['entry']}: {result['error']}"))
+            else:
+                self.stdout.write(
+                    f"{result['entry']}: {result['received']} jobs, "
+                    f"{result['created']} new, {result['updated']} updated, {result['unchanged']} unchanged"
+                )
+        self._deactivate_missing(options)
+        self.stdout.write(
+            self.style.SUCCESS(f'Crawled {len(results)} plan entries')
+        )
+
+    def _deactivate_missing(self, options):
+        """Deactivate scraped jobs that no crawl has seen recently"""
+        from api.ingestion import deactivate_missing_jobs
+
+        if options['deactivate_after_hours']:
+            deactivated = deactivate_missing_jobs(
+                max_age=timedelta(hours=options['deactivate_after_hours'])
+            )
+            self.stdout.write(f'Deactivated {deactivated} jobs no longer listed')
@@ -0,0 +1,25 @@
+"""
+Django management command to rebuild the materialized job facet counts
+"""
+
+from django.core.management.base import BaseCommand
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Rebuild the JobFacetCount table used for unfiltered facet counts'
+
+    def handle(self, *args, **options):
+        from api.facets import refresh_facet_table
+
+        try:
+            written = refresh_facet_table()
+            self.stdout.write(
+                self.style.SUCCESS(f'Refreshed job facet counts ({written} values)')
+            )
+        except Exception as e:
+            logger.error(f"Error refreshing job facet counts: {e}")
+            self.stdout.write(
+                self.style.ERROR(f'Error refreshing job facet counts: {e}')
+            )
@@ -0,0 +1,34 @@
+"""
+Django management command to bring the analytics rollups up to date
+"""
+
+from django.core.management.base import BaseCommand
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Command(BaseCommand):
+    help = 'Recompute the daily analytics rollups touched since the last refresh'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild every rollup from scratch (picks up deleted rows)'
+        )
+
+    def handle(self, *args, **options):
+        from api.rollups import refresh_rollups
+
+        try:
+            refreshed = refresh_rollups(full=options['full'])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    'Refreshed rollups: ' + ', '.join(f'{name}: {days} buckets' for name, days in refreshed.items())
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error refreshing rollups: {e}")
+            self.stdout.write(
+                self.style.ERROR(f'Error refreshing rollups: {e}')
+            )
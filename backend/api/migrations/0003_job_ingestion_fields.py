@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_company_jobcategory_jobskill_job_jobapplication_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='source',
+            field=models.CharField(choices=[('manual', 'Manual'), ('adzuna', 'Adzuna')], default='manual', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='application_url',
+            field=models.URLField(blank=True, max_length=500, null=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_job_ingestion_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlPlanEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255)),
+                ('location', models.CharField(max_length=255)),
+                ('country', models.CharField(default='au', max_length=2)),
+                ('popularity', models.FloatField(default=0.0)),
+                ('pending_hits', models.PositiveIntegerField(default=0)),
+                ('decayed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_requested_at', models.DateTimeField(blank=True, null=True)),
+                ('change_rate', models.FloatField(default=0.5)),
+                ('last_crawled_at', models.DateTimeField(blank=True, null=True)),
+                ('next_crawl_at', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('last_result_count', models.PositiveIntegerField(default=0)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['next_crawl_at'],
+                'unique_together': {('query', 'location', 'country')},
+            },
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:59
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# PostgreSQL only: the trigger that maintains Job.search_vector, its GIN index and
+# trigram indexes for fuzzy title/company matching (see api.search).
+POSTGRES_FORWARD = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    """
+    CREATE OR REPLACE FUNCTION api_job_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT name FROM api_company WHERE id = NEW.company_id), '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.requirements, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER api_job_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, company_id, requirements, description ON api_job
+        FOR EACH ROW EXECUTE PROCEDURE api_job_search_vector_update()
+    """,
+    # A renamed company re-indexes its jobs by touching their title
+    """
+    CREATE OR REPLACE FUNCTION api_company_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE api_job SET title = title WHERE company_id = NEW.id;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER api_company_search_vector_trigger
+        AFTER UPDATE OF name ON api_company
+        FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE PROCEDURE api_company_search_vector_update()
+    """,
+    'UPDATE api_job SET title = title',
+    'CREATE INDEX IF NOT EXISTS api_job_search_vector_gin ON api_job USING GIN (search_vector)',
+    'CREATE INDEX IF NOT EXISTS api_job_title_trgm ON api_job USING GIN (title gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS api_company_name_trgm ON api_company USING GIN (name gin_trgm_ops)',
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS api_company_name_trgm',
+    'DROP INDEX IF EXISTS api_job_title_trgm',
+    'DROP INDEX IF EXISTS api_job_search_vector_gin',
+    'DROP TRIGGER IF EXISTS api_company_search_vector_trigger ON api_company',
+    'DROP FUNCTION IF EXISTS api_company_search_vector_update()',
+    'DROP TRIGGER IF EXISTS api_job_search_vector_trigger ON api_job',
+    'DROP FUNCTION IF EXISTS api_job_search_vector_update()',
+]
+
+
+def _run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_job_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(_run_on_postgres(POSTGRES_FORWARD), _run_on_postgres(POSTGRES_REVERSE)),
+    ]
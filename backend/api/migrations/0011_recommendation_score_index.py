@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_jobactionreceipt'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobrecommendation',
+            index=models.Index(fields=['user', '-match_score', '-job'], name='rec_user_score_job_idx'),
+        ),
+    ]
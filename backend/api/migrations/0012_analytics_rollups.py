@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_recommendation_score_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyJobRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('dimension', models.CharField(choices=[('skill', 'Skill'), ('title', 'Title'), ('location', 'Location')], max_length=20)),
+                ('key', models.CharField(max_length=255)),
+                ('job_count', models.PositiveIntegerField(default=0)),
+                ('salary_count', models.PositiveIntegerField(default=0)),
+                ('salary_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('salary_min', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('salary_max', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+            ],
+            options={
+                'unique_together': {('dimension', 'day', 'key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyApplicationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='application_rollups', to='api.firebaseuser')),
+            ],
+            options={
+                'unique_together': {('user', 'day')},
+            },
+        ),
+    ]
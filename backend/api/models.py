@@ -1,5 +1,8 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
@@ -74,6 +77,11 @@ class Job(models.Model):
         ('hybrid', 'Hybrid'),
     ]
 
+    SOURCE_CHOICES = [
+        ('manual', 'Manual'),
+        ('adzuna', 'Adzuna'),
+    ]
+
     # Basic job information
     title = models.CharField(max_length=255)
     company = models.ForeignKey(Company, on_delete=models.CASCADE, related_name='jobs')
@@ -89,16 +97,23 @@ class Job(models.Model):
     location = models.CharField(max_length=255)
     job_type = models.CharField(max_length=20, choices=JOB_TYPE_CHOICES, default='full-time')
     work_location = models.CharField(max_length=20, choices=WORK_LOCATION_CHOICES, default='on-site')
+    # Gazetteer place and coordinates resolved from location, for radius search (see api.geocoding)
+    place_id = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
     
     # Salary information
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_currency = models.CharField(max_length=3, default='USD')
     salary_period = models.CharField(max_length=20, default='yearly')  # yearly, monthly, hourly
+    # Annualized in AUD by salary_normalizer, for numeric filtering and ranking
+    salary_annual_min = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, db_index=True)
+    salary_annual_max = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True, db_index=True)
     
     # Application details
     application_deadline = models.DateTimeField(null=True, blank=True)
-    application_url = models.URLField(blank=True, null=True)
+    application_url = models.URLField(max_length=500, blank=True, null=True)
     application_email = models.EmailField(blank=True, null=True)
     
     # Status and metadata
@@ -107,6 +122,15 @@ class Job(models.Model):
     views_count = models.PositiveIntegerField(default=0)
     applications_count = models.PositiveIntegerField(default=0)
     
+    # Scraped postings (see api.ingestion)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='manual')
+    external_id = models.CharField(max_length=64, unique=True, null=True, blank=True)  # e.g. Adzuna job id
+    last_seen_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    content_hash = models.CharField(max_length=32, blank=True, default='')  # see job_scraper.compute_content_hash
+    
+    # Weighted full-text document, maintained by a database trigger on PostgreSQL (see api.search)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    
     # Timestamps
     posted_date = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -117,6 +141,12 @@ class Job(models.Model):
 
     class Meta:
         ordering = ['-posted_date', '-created_at']
+        indexes = [
+            # Keyset pagination of active jobs (see api.pagination)
+            models.Index(fields=['is_active', '-posted_date', '-id'], name='job_active_posted_id_idx'),
+            # Bounding-box prefilter of radius searches (see api.geocoding)
+            models.Index(fields=['latitude', 'longitude'], name='job_lat_lon_idx'),
+        ]
 
 class JobSkill(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -215,3 +245,158 @@ class JobRecommendation(models.Model):
     class Meta:
         unique_together = ['user', 'job']
         ordering = ['-match_score', '-created_at']
+        indexes = [
+            # A user's recommendations, best first, for keyset pagination (see api.recommendations)
+            models.Index(fields=['user', '-match_score', '-job'], name='rec_user_score_job_idx'),
+        ]
+
+class CrawlPlanEntry(models.Model):
+    """A (query, location, country) search the AI job scheduler keeps fresh"""
+    query = models.CharField(max_length=255)
+    location = models.CharField(max_length=255)
+    country = models.CharField(max_length=2, default='au')
+
+    # Demand: decayed request count, plus hits recorded since the last decay
+    popularity = models.FloatField(default=0.0)
+    pending_hits = models.PositiveIntegerField(default=0)
+    decayed_at = models.DateTimeField(null=True, blank=True)
+    last_requested_at = models.DateTimeField(null=True, blank=True)
+
+    # Supply: how much the results changed on recent crawls (0.0 - 1.0)
+    change_rate = models.FloatField(default=0.5)
+    last_crawled_at = models.DateTimeField(null=True, blank=True)
+    next_crawl_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_result_count = models.PositiveIntegerField(default=0)
+
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.query} in {self.location} ({self.country})"
+
+    class Meta:
+        unique_together = ['query', 'location', 'country']
+        ordering = ['next_crawl_at']
+
+class JobFacetCount(models.Model):
+    """Active job counts per filter value, refreshed periodically for large tables (see api.facets)"""
+    facet = models.CharField(max_length=30)
+    value = models.CharField(max_length=255, null=True, blank=True)
+    count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
+    class Meta:
+        unique_together = ['facet', 'value']
+        ordering = ['facet', '-count']
+
+class GeocodeCache(models.Model):
+    """Place resolved for a free-text location; rows can be edited to correct the gazetteer (see api.geocoding)"""
+    query = models.CharField(max_length=255, unique=True)  # normalized location text
+    place_id = models.CharField(max_length=64, blank=True, default='')  # '' when nothing matched
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    resolved_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.query} -> {self.place_id or '?'}"
+
+class JobActionReceipt(models.Model):
+    """Result of a batched job action, kept so a retried request with the same key is not applied twice"""
+    user = models.ForeignKey(FirebaseUser, on_delete=models.CASCADE, related_name='job_action_receipts')
+    key = models.CharField(max_length=100)  # client-supplied idempotency key
+    action = models.CharField(max_length=20)
+    result = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.user_id} {self.action} ({self.key})"
+
+    class Meta:
+        unique_together = ['user', 'key']
+
+# Analytics rollups, maintained incrementally by the refresh_rollups command (see api.rollups)
+class DailyJobRollup(models.Model):
+    """Active jobs posted on one day, per skill, title or location"""
+    DIMENSION_CHOICES = [
+        ('skill', 'Skill'),
+        ('title', 'Title'),
+        ('location', 'Location'),
+    ]
+
+    day = models.DateField()
+    dimension = models.CharField(max_length=20, choices=DIMENSION_CHOICES)
+    key = models.CharField(max_length=255)
+    job_count = models.PositiveIntegerField(default=0)
+    # Annualized AUD salaries (midpoint of the range) of the jobs that have one
+    salary_count = models.PositiveIntegerField(default=0)
+    salary_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    salary_min = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    salary_max = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.day} {self.dimension}={self.key}: {self.job_count}"
+
+    class Meta:
+        unique_together = ['dimension', 'day', 'key']
+
+class DailyApplicationRollup(models.Model):
+    """Applications a user submitted on one day"""
+    user = models.ForeignKey(FirebaseUser, on_delete=models.CASCADE, related_name='application_rollups')
+    day = models.DateField()
+    applications = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id} {self.day}: {self.applications}"
+
+    class Meta:
+        unique_together = ['user', 'day']
+
+class RollupWatermark(models.Model):
+    """How far a rollup has consumed its source table's changes"""
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)  # max updated_at processed
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.watermark}"
+
+class ResumeUpload(models.Model):
+    """An uploaded resume and its parse job; the id is the handle clients poll (see api.resumes)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    firebase_uid = models.CharField(max_length=128, db_index=True)
+    file_name = models.CharField(max_length=255)  # as uploaded
+    file_path = models.CharField(max_length=255)  # in default_storage, named by content hash
+    content_hash = models.CharField(max_length=64, db_index=True)  # SHA-256 of the file
+    size = models.PositiveBigIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class ResumeAnalysis(models.Model):
+    """Parse result for one resume file, shared by every upload of the same content (see api.resumes)"""
+    content_hash = models.CharField(max_length=64, unique=True)  # SHA-256 of the file
+    parser_version = models.CharField(max_length=50)  # results of older parsers are recomputed
+    result = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.parser_version})"
@@ -0,0 +1,159 @@
+"""
+Projection-based serialization for job listings
+
+List endpoints used to load full Job instances, including long description and
+requirements text and the joined company/category rows, and then copy every
+field into a dict. A JobProjection selects only the columns needed for the
+fields a response will contain, through ``.values()``, and builds the output
+dicts from those rows.
+
+Clients can ask for a sparse fieldset (``?fields=id,title,company``) and a
+truncated description (``?description_length=200``). The description is cut
+in the database, so the full text never leaves it.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db.models.functions import Length, Substr
+
+# Output field -> the columns it is built from. 'requirements' comes from
+# JobSkillRequirement in one extra query per page.
+JOB_LIST_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'company': ('company__name',),
+    'company_id': ('company_id',),
+    'location': ('location',),
+    'salary': ('salary_min', 'salary_max'),
+    'description': ('description',),
+    'requirements': (),
+    'job_type': ('job_type',),
+    'work_location': ('work_location',),
+    'category': ('category__name',),
+    'posted_date': ('posted_date',),
+    'application_deadline': ('application_deadline',),
+    'is_featured': ('is_featured',),
+    'views_count': ('views_count',),
+    'applications_count': ('applications_count',),
+}
+
+JOB_SEARCH_FIELDS = {
+    **{name: JOB_LIST_FIELDS[name] for name in (
+        'id', 'title', 'company', 'location', 'salary', 'job_type', 'work_location', 'category',
+        'posted_date', 'is_featured',
+    )},
+    'relevance': ('relevance',),
+    'match_score': ('relevance',),
+    'distance_km': ('distance_km',),
+}
+
+# Columns every projection selects: 'id' for requirements and 'posted_date' for cursors
+KEY_COLUMNS = ('id', 'posted_date')
+
+MAX_DESCRIPTION_LENGTH = 10000
+
+
+class InvalidFields(ValueError):
+    """Raised for a ?fields= or ?description_length= value the endpoint cannot serve"""
+
+
+def _salary(row):
+    salary_min, salary_max = row['salary_min'], row['salary_max']
+    if salary_min and salary_max:
+        return f"${salary_min:,.0f} - ${salary_max:,.0f}"
+    return "Salary not specified"
+
+
+def _isoformat(column):
+    return lambda row: row[column].isoformat() if row[column] else None
+
+
+def _description(row):
+    if 'description_full_length' not in row:
+        return row['description']
+    excerpt = row['description']
+    return excerpt + '…' if row['description_full_length'] > len(excerpt) else excerpt
+
+
+FORMATTERS = {
+    'company': lambda row: row['company__name'],
+    'category': lambda row: row['category__name'],
+    'salary': _salary,
+    'description': _description,
+    'posted_date': _isoformat('posted_date'),
+    'application_deadline': _isoformat('application_deadline'),
+    'match_score': lambda row: round(row['relevance'] * 100, 1),
+    'distance_km': lambda row: round(row['distance_km'], 1) if row['distance_km'] is not None else None,
+}
+
+
+class JobProjection:
+    """The columns and output dicts for one requested set of job fields"""
+
+    def __init__(self, available: Dict[str, Tuple[str, ...]], fields: Optional[Iterable[str]] = None,
+                 description_length: Optional[int] = None):
+        self.fields = list(fields) if fields else list(available)
+        unknown = [name for name in self.fields if name not in available]
+        if unknown:
+            raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+        self.description_length = description_length if 'description' in self.fields else None
+        self.columns = list(dict.fromkeys(
+            KEY_COLUMNS + tuple(column for name in self.fields for column in available[name])
+        ))
+
+    @classmethod
+    def from_request(cls, request, available: Dict[str, Tuple[str, ...]]):
+        """Build from the ?fields= and ?description_length= query parameters"""
+        fields = [name.strip() for name in request.GET.get('fields', '').split(',') if name.strip()]
+        description_length = request.GET.get('description_length', '')
+        if description_length:
+            try:
+                description_length = int(description_length)
+            except ValueError:
+                raise InvalidFields(f'Invalid description_length: {description_length!r}')
+            if not 0 < description_length <= MAX_DESCRIPTION_LENGTH:
+                raise InvalidFields(f'description_length must be between 1 and {MAX_DESCRIPTION_LENGTH}')
+        return cls(available, fields, description_length or None)
+
+    def apply(self, jobs_query):
+        """Restrict a Job queryset to the projected columns; it then yields dict rows"""
+        if self.description_length:
+            jobs_query = jobs_query.annotate(
+                description_excerpt=Substr('description', 1, self.description_length),
+                description_full_length=Length('description'),
+            )
+            columns = ['description_excerpt' if column == 'description' else column for column in self.columns]
+            return jobs_query.values(*columns, 'description_full_length')
+        return jobs_query.values(*self.columns)
+
+    def serialize(self, rows: List[Dict]) -> List[Dict]:
+        """Output dicts for rows produced by a queryset passed through apply()"""
+        if self.description_length:
+            for row in rows:
+                row['description'] = row.pop('description_excerpt')
+        requirements = self._required_skills(rows) if 'requirements' in self.fields else None
+
+        results = []
+        for row in rows:
+            item = {}
+            for name in self.fields:
+                if name == 'requirements':
+                    item[name] = requirements.get(row['id'], [])
+                elif name in FORMATTERS:
+                    item[name] = FORMATTERS[name](row)
+                else:
+                    item[name] = row[name]
+            results.append(item)
+        return results
+
+    @staticmethod
+    def _required_skills(rows) -> Dict[int, List[str]]:
+        from api.models import JobSkillRequirement
+
+        skills = {}
+        requirements = JobSkillRequirement.objects.filter(
+            job_id__in=[row['id'] for row in rows], is_required=True
+        ).order_by('id').values_list('job_id', 'skill__name')
+        for job_id, name in requirements:
+            skills.setdefault(job_id, []).append(name)
+        return skills
@@ -0,0 +1,240 @@
+"""
+Personalized job recommendations
+
+A user's recommendations are stored as JobRecommendation rows and served best
+first. Pages are fetched with one keyset query on (match_score, job) using
+rec_user_score_job_idx, and only active jobs are returned.
+
+Users without rows, or with rows older than RECOMMENDATION_TTL, get recommendations
+computed on demand from the shared in-memory job index (see api.job_index). The
+profile is built from the titles and categories of their saved and applied jobs,
+the skills and profile terms of their latest parsed resume (see api.resumes),
+plus any skills sent with the request. Computation runs on a small worker pool
+and the results are written back from there. The request waits at most
+RECOMMENDATION_LATENCY_BUDGET seconds. After that it falls back to the stale rows,
+or to an empty "pending" response, and the next request picks up the rows that
+were written back.
+"""
+
+import base64
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.pagination import InvalidCursor
+
+logger = logging.getLogger(__name__)
+
+ALGORITHM_VERSION = 'job-index-v1'
+
+# Stored rows older than this are recomputed on the next request
+RECOMMENDATION_TTL = timedelta(hours=12)
+
+# Recommendations computed and stored per user
+STORED_PER_USER = 100
+
+DEFAULT_LATENCY_BUDGET = 0.8  # seconds
+
+DESCRIPTION_PREVIEW_LENGTH = 300
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='recommend')
+_computing = {}  # user id -> Future, so concurrent requests share one computation
+_computing_lock = threading.Lock()
+
+
+def encode_cursor(match_score: float, job_id: int) -> str:
+    """Opaque cursor pointing just after the given recommendation"""
+    payload = json.dumps([match_score, job_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Return the (match_score, job id) a cursor points after"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        match_score, job_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(match_score), int(job_id)
+    except (ValueError, TypeError, json.JSONDecodeError) as e:
+        raise InvalidCursor(f'Invalid cursor: {cursor!r}') from e
+
+
+def recommend(user=None, cursor: Optional[str] = None, limit: int = 20, skills: Optional[List[str]] = None,
+              location: str = '', budget: Optional[float] = None) -> Dict:
+    """A page of recommendations for ``user`` (None for anonymous, skills-only requests).
+
+    The result has ``recommendations``, ``next_cursor`` and ``source``: 'stored',
+    'computed', 'stale' (computation ran past the budget) or 'pending' (past the
+    budget with nothing stored yet).
+    """
+    after = decode_cursor(cursor) if cursor else None
+    stored = []
+    if user is not None:
+        stored = _stored_page(user, after, limit)
+        # Later pages always continue the stored ranking
+        if after is not None or (stored and stored[0].created_at >= timezone.now() - RECOMMENDATION_TTL):
+            return _stored_response(stored, limit, 'stored')
+
+    if budget is None:
+        budget = getattr(settings, 'RECOMMENDATION_LATENCY_BUDGET', DEFAULT_LATENCY_BUDGET)
+    future = _compute_in_background(user, skills or [], location)
+    try:
+        matches = future.result(timeout=budget)
+    except TimeoutError:
+        logger.info(f"Recommendations for user {getattr(user, 'pk', None)} exceeded the {budget}s budget")
+        if stored:
+            return _stored_response(stored, limit, 'stale')
+        return {'recommendations': [], 'next_cursor': None, 'source': 'pending'}
+    return _computed_response(matches, limit, after)
+
+
+def _stored_page(user, after, limit):
+    from api.models import JobRecommendation
+
+    rows = JobRecommendation.objects.filter(user=user, job__is_active=True).select_related('job__company')
+    if after is not None:
+        match_score, job_id = after
+        rows = rows.filter(Q(match_score__lt=match_score) | Q(match_score=match_score, job_id__lt=job_id))
+    return list(rows.order_by('-match_score', '-job_id')[:limit + 1])
+
+
+def _stored_response(rows, limit, source):
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1].match_score, page[-1].job_id) if len(rows) > limit else None
+    return {
+        'recommendations': [_serialize(row.job, row.match_score, row.reason) for row in page],
+        'next_cursor': next_cursor,
+        'source': source,
+    }
+
+
+def _computed_response(matches, limit, after=None):
+    from api.models import Job
+
+    # Same order and cursor semantics as _stored_page, so anonymous clients can page too
+    matches = sorted(matches, key=lambda match: (-match[1], -match[0]))
+    if after is not None:
+        match_score, job_id = after
+        matches = [match for match in matches
+                   if match[1] < match_score or (match[1] == match_score and match[0] < job_id)]
+    page = matches[:limit]
+    jobs = Job.objects.select_related('company').in_bulk([job_id for job_id, _, _ in page])
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(matches) > limit else None
+    return {
+        'recommendations': [
+            _serialize(jobs[job_id], match_score, reason) for job_id, match_score, reason in page if job_id in jobs
+        ],
+        'next_cursor': next_cursor,
+        'source': 'computed',
+    }
+
+
+def _serialize(job, match_score, reason):
+    return {
+        'id': job.id,
+        'title': job.title,
+        'company': job.company.name,
+        'location': job.location,
+        'salary': f"${job.salary_min:,.0f} - ${job.salary_max:,.0f}" if job.salary_min and job.salary_max else "Salary not specified",
+        'description': job.description[:DESCRIPTION_PREVIEW_LENGTH],
+        'match_score': match_score,
+        'reason': reason,
+        'posted_date': job.posted_date.isoformat(),
+        'job_type': job.job_type,
+        'work_location': job.work_location
+    }
+
+
+def _compute_in_background(user, skills, location):
+    """Submit a computation, or join the one already running for this user"""
+    user_id = getattr(user, 'pk', None)
+    with _computing_lock:
+        if user_id is not None and user_id in _computing:
+            return _computing[user_id]
+        future = _pool.submit(_compute, user_id, skills, location)
+        if user_id is not None:
+            _computing[user_id] = future
+            future.add_done_callback(lambda _: _forget(user_id))
+    return future
+
+
+def _forget(user_id):
+    with _computing_lock:
+        _computing.pop(user_id, None)
+
+
+def _compute(user_id, skills, location) -> List[Tuple[int, float, str]]:
+    """Rank jobs for a user from the shared index and store them; runs on the worker pool"""
+    from api.geocoding import search_point
+    from api.job_index import job_index
+
+    try:
+        history = _history_text(user_id) if user_id is not None else ''
+        resume = _resume_text(user_id) if user_id is not None else ''
+        matches = job_index.search(query=history, skills=skills, resume_text=resume, location=location,
+                                   point=search_point(location), limit=STORED_PER_USER)
+        if history and skills:
+            reason = 'Matches your skills and jobs you saved or applied for'
+        elif history:
+            reason = 'Similar to jobs you saved or applied for'
+        elif resume and not skills:
+            reason = 'Matches your resume'
+        else:
+            reason = 'Matches your skills'
+        matches = [(job_id, round(score * 100, 2), reason) for job_id, score in matches]
+        if user_id is not None:
+            _store(user_id, matches)
+        return matches
+    except Exception as e:
+        logger.error(f"Error computing recommendations for user {user_id}: {e}")
+        raise
+    finally:
+        connection.close()
+
+
+def _history_text(user_id, limit: int = 20) -> str:
+    """Titles and categories of the jobs a user saved or applied for, most recent first"""
+    from api.models import JobApplication, SavedJob
+
+    fields = ('job__title', 'job__category__name')
+    saved = SavedJob.objects.filter(user_id=user_id).order_by('-saved_date').values_list(*fields)[:limit]
+    applied = JobApplication.objects.filter(user_id=user_id).order_by('-applied_date').values_list(*fields)[:limit]
+    return ' '.join(value for row in [*saved, *applied] for value in row if value)
+
+
+def _resume_text(user_id) -> str:
+    """Skills and profile terms of the user's latest parsed resume"""
+    from api.models import FirebaseUser, ResumeUpload
+    from api.resumes import profile_text
+
+    uid = FirebaseUser.objects.filter(pk=user_id).values_list('uid', flat=True).first()
+    result = ResumeUpload.objects.filter(firebase_uid=uid, status='done').values_list('result', flat=True).first()
+    return profile_text(result)
+
+
+def _store(user_id, matches):
+    """Replace a user's stored recommendations"""
+    from api.models import JobRecommendation
+
+    now = timezone.now()
+    with transaction.atomic():
+        JobRecommendation.objects.filter(user_id=user_id).exclude(
+            job_id__in=[job_id for job_id, _, _ in matches]
+        ).delete()
+        JobRecommendation.objects.bulk_create(
+            [
+                JobRecommendation(user_id=user_id, job_id=job_id, match_score=match_score, reason=reason,
+                                  algorithm_version=ALGORITHM_VERSION, created_at=now)
+                for job_id, match_score, reason in matches
+            ],
+            update_conflicts=True,
+            unique_fields=['user', 'job'],
+            update_fields=['match_score', 'reason', 'algorithm_version', 'created_at'],
+        )
@@ -0,0 +1,37 @@
+"""
+Fast JSON rendering for large responses
+
+FastJSONRenderer encodes responses with orjson when it is installed, which is
+several times faster than the standard library encoder that DRF's JSONRenderer
+uses. Values orjson does not handle itself (Decimal, lazy strings, datetimes,
+to keep DRF's formatting) go through DRF's encoder, so values come out as
+they would from JSONRenderer. Without orjson, or when indentation is requested (the browsable
+API), it renders exactly like JSONRenderer.
+"""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return orjson.dumps(data, default=_encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except orjson.JSONEncodeError:
+            # e.g. non-string dict keys, which the standard encoder coerces
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+_encoder = JSONEncoder()
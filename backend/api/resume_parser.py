@@ -0,0 +1,286 @@
+"""
+Resume text extraction and analysis
+
+Everything here is a pure function of the file's bytes and the skill taxonomy:
+no database or settings access. api.resumes can therefore run it in worker
+processes.
+
+- Text: PDF (through pypdf when installed, otherwise a basic reader for
+  text-based PDFs), DOCX (the document XML, read with the standard library)
+  and plain text.
+- Skills: every run of up to MAX_SKILL_WORDS tokens is looked up among the
+  normalized JobSkill names, so the cost is linear in the resume length
+  whatever the size of the taxonomy.
+- Experience: the largest of any stated "N years of experience" and the total
+  of the (merged) date ranges of roles.
+- Education: the highest degree level mentioned.
+"""
+
+import io
+import re
+import zipfile
+import zlib
+from collections import Counter
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pragma: no cover - optional dependency
+    PdfReader = None
+
+PARSER_VERSION = 'resume-parser-v1'
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Longest skill name, in tokens, that is looked up
+MAX_SKILL_WORDS = 4
+
+# A DOCX whose document XML inflates beyond this is rejected
+MAX_DOCX_XML_SIZE = 50 * 1024 * 1024
+
+# The basic PDF reader inflates content streams up to this size in total and
+# ignores the rest of the file
+MAX_PDF_STREAM_SIZE = 50 * 1024 * 1024
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9+#]+(?:\.[a-z0-9+#]+)*')
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1
+)}
+_MONTH = r'(?:(?P<{0}>jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?\s+|(?P<{0}_number>\d{{1,2}})/)?'
+DATE_RANGE_PATTERN = re.compile(
+    _MONTH.format('start_month') + r'(?P<start_year>(?:19|20)\d{2})\s*(?:-|–|—|to|until)\s*(?:'
+    + _MONTH.format('end_month') + r'(?P<end_year>(?:19|20)\d{2})|(?P<ongoing>present|current|now|today))',
+    re.IGNORECASE,
+)
+STATED_YEARS_PATTERN = re.compile(
+    r'(\d{1,2})\s*\+?\s*(?:years?|yrs?)\'?\b[^.\n]{0,40}?\bexperience', re.IGNORECASE
+)
+# Date ranges on lines like these are studies, not work
+EDUCATION_LINE_PATTERN = re.compile(r'universit|college|school|degree|bachelor|master|diploma|phd', re.IGNORECASE)
+
+# Highest first
+EDUCATION_LEVELS = [
+    ('Doctorate', re.compile(r'\bph\.?\s?d\b|\bdoctorate\b|\bdoctor of\b', re.IGNORECASE)),
+    ('Master', re.compile(r"\bmaster'?s?\b|\bm\.?sc\b|\bmba\b|\bm\.?eng\b", re.IGNORECASE)),
+    ('Bachelor', re.compile(r"\bbachelor'?s?\b|\bb\.?sc\b|\bb\.?eng\b|\bb\.?a\.|\bbs\b", re.IGNORECASE)),
+    ('Diploma', re.compile(r'\bdiploma\b', re.IGNORECASE)),
+    ('Certificate', re.compile(r'\bcert(?:ificate)?\s+(?:i{1,3}|iv)\b', re.IGNORECASE)),
+]
+
+W_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class UnsupportedFormat(ValueError):
+    """The file is not a PDF, DOCX or text file"""
+
+
+def extract_text(data: bytes, extension: str = '') -> str:
+    """Plain text of a resume, detected from its content first and its extension second"""
+    if data.startswith(b'%PDF-'):
+        return _pdf_text(data)
+    if data.startswith(b'PK') and extension != '.txt':
+        return _docx_text(data)
+    try:
+        return data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        if extension == '.txt':
+            return data.decode('cp1252', errors='replace')
+    raise UnsupportedFormat(f'Unsupported resume format: {extension or "unknown"}')
+
+
+def _pdf_text(data: bytes) -> str:
+    if PdfReader is not None:
+        reader = PdfReader(io.BytesIO(data))
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+    return _pdf_text_fallback(data)
+
+
+_PDF_STREAM = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.DOTALL)
+_PDF_TOKEN = re.compile(rb'\((?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*\)|\[|\]|-?\d*\.?\d+|[A-Za-z\'"*]+')
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+
+def _pdf_text_fallback(data: bytes) -> str:
+    """Text drawn by the content streams of a text-based PDF.
+
+    Only handles literal strings in single-byte encodings. Install pypdf for
+    PDFs with embedded CID fonts.
+    """
+    lines, line = [], []
+    budget = MAX_PDF_STREAM_SIZE
+    for match in _PDF_STREAM.finditer(data):
+        if budget <= 0:
+            break
+        stream = match.group(1)
+        decompressor = zlib.decompressobj()
+        try:
+            # Bounded, so a small compressed stream cannot inflate without limit
+            stream = decompressor.decompress(stream, budget)
+        except zlib.error:
+            stream = stream[:budget]  # not compressed
+        budget = 0 if decompressor.unconsumed_tail else budget - len(stream)
+        for token in _PDF_TOKEN.findall(stream):
+            if token.startswith(b'('):
+                line.append(_pdf_string(token[1:-1]))
+            elif token.lstrip(b'-').replace(b'.', b'', 1).isdigit():
+                # Large negative kerning inside a TJ array separates words
+                if line and float(token) < -200:
+                    line.append(' ')
+            elif token in (b'Td', b'TD', b'T*', b"'", b'"', b'ET'):
+                if line:
+                    lines.append(''.join(line))
+                    line = []
+    if line:
+        lines.append(''.join(line))
+    return '\n'.join(lines)
+
+
+def _pdf_string(raw: bytes) -> str:
+    out, i = bytearray(), 0
+    while i < len(raw):
+        char = raw[i:i + 1]
+        if char == b'\\' and i + 1 < len(raw):
+            following = raw[i + 1:i + 2]
+            octal = re.match(rb'[0-7]{1,3}', raw[i + 1:i + 4])
+            if octal:
+                out.append(int(octal.group(), 8) & 0xFF)
+                i += 1 + len(octal.group())
+                continue
+            out += _PDF_ESCAPES.get(following, following)
+            i += 2
+            continue
+        out += char
+        i += 1
+    return out.decode('latin-1')
+
+
+def _docx_text(data: bytes) -> str:
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            if archive.getinfo('word/document.xml').file_size > MAX_DOCX_XML_SIZE:
+                raise UnsupportedFormat('DOCX document is too large')
+            root = ElementTree.fromstring(archive.read('word/document.xml'))
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise UnsupportedFormat('Not a DOCX file') from e
+    paragraphs = []
+    for paragraph in root.iter(f'{W_NAMESPACE}p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f'{W_NAMESPACE}t':
+                parts.append(node.text or '')
+            elif node.tag == f'{W_NAMESPACE}tab':
+                parts.append('\t')
+            elif node.tag in (f'{W_NAMESPACE}br', f'{W_NAMESPACE}cr'):
+                parts.append('\n')
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens; keeps names like c++, c# and node.js whole"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SkillMatcher:
+    """Finds taxonomy skills in text by looking up each run of up to MAX_SKILL_WORDS tokens"""
+
+    def __init__(self, names: Sequence[str]):
+        self.phrases: Dict[str, str] = {}  # normalized phrase -> skill name
+        for name in names:
+            tokens = tokenize(name)
+            # Single letters ("C", "R") match too much prose to be useful
+            if tokens and len(tokens) <= MAX_SKILL_WORDS and len(''.join(tokens)) > 1:
+                self.phrases.setdefault(' '.join(tokens), name)
+        # Multi-word lookups are only tried from a token that starts some phrase
+        self.first_words = {phrase.split(' ')[0] for phrase in self.phrases if ' ' in phrase}
+
+    def find(self, text: str) -> List[str]:
+        """Skills mentioned in ``text``, most mentioned first"""
+        tokens = tokenize(text)
+        counts, first_seen = Counter(), {}
+        for i, token in enumerate(tokens):
+            longest = MAX_SKILL_WORDS if token in self.first_words else 1
+            for length in range(min(longest, len(tokens) - i), 0, -1):
+                name = self.phrases.get(' '.join(tokens[i:i + length]))
+                if name is not None:
+                    counts[name] += 1
+                    first_seen.setdefault(name, i)
+                    break
+        return sorted(counts, key=lambda name: (-counts[name], first_seen[name]))
+
+
+@lru_cache(maxsize=4)
+def _matcher(names: tuple) -> SkillMatcher:
+    """Matchers are reused while the taxonomy is unchanged (per worker process)"""
+    return SkillMatcher(names)
+
+
+def estimate_experience(text: str, today: Optional[date] = None) -> Optional[float]:
+    """Years of experience: a stated figure or the total of the role date ranges, whichever is larger"""
+    today = today or date.today()
+    stated = [int(years) for years in STATED_YEARS_PATTERN.findall(text) if 0 < int(years) <= 50]
+
+    spans = []
+    for match in DATE_RANGE_PATTERN.finditer(text):
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        line_end = text.find('\n', match.end())
+        if EDUCATION_LINE_PATTERN.search(text[line_start:line_end if line_end != -1 else len(text)]):
+            continue
+        start = int(match['start_year']) * 12 + _month(match, 'start_month', 1) - 1
+        if match['ongoing']:
+            end = today.year * 12 + today.month - 1
+        else:
+            end = int(match['end_year']) * 12 + _month(match, 'end_month', 12) - 1
+        if start <= end <= today.year * 12 + today.month - 1 and end - start < 50 * 12:
+            spans.append((start, end + 1))
+
+    # Overlapping roles count once
+    months, covered_until = 0, None
+    for start, end in sorted(spans):
+        if covered_until is not None and start < covered_until:
+            start = covered_until
+        if end > start:
+            months += end - start
+            covered_until = end
+
+    years = max([*stated, months / 12]) if stated or months else None
+    return round(years, 1) if years is not None else None
+
+
+def _month(match, group, default):
+    if match[group]:
+        return MONTHS[match[group][:3].lower()]
+    number = match[f'{group}_number']
+    return int(number) if number and 1 <= int(number) <= 12 else default
+
+
+def experience_label(years: Optional[float]) -> Optional[str]:
+    if years is None:
+        return None
+    return f'{int(years)}+ years' if years >= 1 else 'Less than 1 year'
+
+
+def highest_education(text: str) -> Optional[str]:
+    for level, pattern in EDUCATION_LEVELS:
+        if pattern.search(text):
+            return level
+    return None
+
+
+def analyze(data: bytes, extension: str, skill_names: Sequence[str], today: Optional[date] = None) -> Dict:
+    """Text, skills, experience and education of one resume file"""
+    text = extract_text(data, extension)
+    years = estimate_experience(text, today)
+    return {
+        'parser_version': PARSER_VERSION,
+        'text': text,
+        'word_count': len(text.split()),
+        'skills': _matcher(tuple(skill_names)).find(text),
+        'experience_years': years,
+        'experience': experience_label(years),
+        'education': highest_education(text),
+    }
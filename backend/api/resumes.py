@@ -0,0 +1,367 @@
+"""
+Streaming resume uploads and the parse job handed off for each
+
+Uploads are never held in memory whole. ResumeUploadHandler sees every chunk
+of the multipart body as it is parsed: it updates a SHA-256 digest and a size
+count, then passes the chunk on to Django's TemporaryFileUploadHandler, which
+appends it to a file on disk. Uploads larger than RESUME_MAX_UPLOAD_SIZE are
+rejected from their Content-Length before the body is parsed, or as soon as
+their chunks pass the limit.
+
+Stored files are named by their content hash, so a resume uploaded again (by
+anyone) is stored once. Storage receives the temporary file, which
+FileSystemStorage moves into place and other backends copy chunk by chunk.
+
+Each upload gets a ResumeUpload row, the handle clients poll. The file is
+parsed after the request has returned: a coordinating thread per upload reads
+the file and the JobSkill taxonomy, and the CPU-bound work in
+api.resume_parser (text extraction, skill and experience extraction) runs on a
+pool of RESUME_PARSE_WORKERS processes, off the request threads and the GIL.
+The coordinator then adds the recommender profile (the resume's heaviest terms
+in the job index vocabulary) and records the result. A resume still not parsed
+after RESUME_PARSE_TIMEOUT seconds fails its upload, and the worker processes
+are replaced.
+
+Results are cached in ResumeAnalysis by content hash and parser version. A
+resume uploaded again, from any account, is answered from there when it is
+uploaded and never reaches the workers; concurrent uploads of the same file
+share one parse.
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload, TemporaryFileUploadHandler
+from django.db import OperationalError, connection
+from django.db.models import Count
+from django.utils import timezone
+
+from api import resume_parser
+from api.singleflight import get_flight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # bytes
+
+DEFAULT_PARSE_TIMEOUT = 60.0  # seconds
+
+# Attempts at recording a parse outcome; a lost write would leave the upload 'processing' forever
+OUTCOME_WRITE_ATTEMPTS = 5
+
+# Allowance for the multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD = 64 * 1024
+
+UPLOAD_FIELD = 'resume'
+
+# Characters of extracted text kept in the result
+EXTRACTED_TEXT_LIMIT = 5000
+
+PROFILE_TERMS = 30
+
+# In-demand skills a resume is compared against in resume_insights
+DEMAND_SKILLS = 20
+
+EDUCATION_POINTS = {'Doctorate': 15, 'Master': 15, 'Bachelor': 12, 'Diploma': 8, 'Certificate': 5}
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='resume-parse')
+_processes: Optional[ProcessPoolExecutor] = None
+_processes_lock = threading.Lock()
+
+
+class UploadTooLarge(Exception):
+    """The upload is over RESUME_MAX_UPLOAD_SIZE"""
+
+
+class ParseTimeout(Exception):
+    """The parser processes took longer than RESUME_PARSE_TIMEOUT over a resume"""
+
+
+def max_upload_size() -> int:
+    return getattr(settings, 'RESUME_MAX_UPLOAD_SIZE', DEFAULT_MAX_UPLOAD_SIZE)
+
+
+def check_content_length(request):
+    """Reject an oversized upload from its Content-Length, before any of the body is parsed"""
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        content_length = 0
+    if content_length > max_upload_size() + MULTIPART_OVERHEAD:
+        raise UploadTooLarge(f'Upload is {content_length} bytes; the limit is {max_upload_size()}')
+
+
+class ResumeUploadHandler(FileUploadHandler):
+    """Hashes and size-checks uploaded files chunk by chunk, passing the data on to the next handler"""
+
+    def __init__(self, request=None, max_size: Optional[int] = None):
+        super().__init__(request)
+        self.max_size = max_size or max_upload_size()
+        self.hashes: Dict[str, str] = {}  # field name -> SHA-256 hex digest of each complete file
+        self.too_large = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self.too_large = True
+            # The rest of the body is drained, but no longer written anywhere
+            raise StopUpload(connection_reset=False)
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        self.hashes[self.field_name] = self.digest.hexdigest()
+        return None  # the temporary file handler builds the UploadedFile
+
+
+def receive_resume(request) -> Tuple[Optional[object], Optional[str]]:
+    """Parse the multipart body, streaming the resume to a temporary file.
+
+    Returns the uploaded file and its SHA-256, or (None, None) when no resume
+    was sent. Must run before anything else reads request.POST or FILES.
+    """
+    check_content_length(request)
+    handler = ResumeUploadHandler(request)
+    request.upload_handlers = [handler, TemporaryFileUploadHandler(request)]
+    uploaded_file = request.FILES.get(UPLOAD_FIELD)
+    if handler.too_large:
+        raise UploadTooLarge(f'Upload is over the {handler.max_size} byte limit')
+    if uploaded_file is None:
+        return None, None
+    return uploaded_file, handler.hashes[UPLOAD_FIELD]
+
+
+def store_resume(uploaded_file, content_hash: str) -> str:
+    """Save an upload under its content hash, unless an identical file is already stored"""
+    extension = re.sub(r'[^a-z0-9.]', '', os.path.splitext(uploaded_file.name)[1].lower())[:10]
+    path = f'resumes/{content_hash}{extension}'
+    if default_storage.exists(path):
+        return path
+    return default_storage.save(path, uploaded_file)
+
+
+def serialize_upload(upload) -> Dict:
+    """The job handle returned for a ResumeUpload"""
+    data = {
+        'upload_id': str(upload.id),
+        'status': upload.status,
+        'file_name': upload.file_name,
+        'size': upload.size,
+        'content_hash': upload.content_hash,
+        'uploaded_at': upload.created_at.isoformat(),
+    }
+    if upload.status == 'done':
+        data['result'] = upload.result
+    elif upload.status == 'failed':
+        data['error'] = upload.error
+    return data
+
+
+def parse_workers() -> int:
+    return getattr(settings, 'RESUME_PARSE_WORKERS', 0) or os.cpu_count() or 1
+
+
+def parse_timeout() -> float:
+    return getattr(settings, 'RESUME_PARSE_TIMEOUT', DEFAULT_PARSE_TIMEOUT)
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    """The parser processes, started on first use.
+
+    Spawned rather than forked: a fork of a process with threads and open
+    database connections is not safe, and api.resume_parser needs no Django.
+    """
+    global _processes
+    with _processes_lock:
+        if _processes is None:
+            _processes = ProcessPoolExecutor(
+                max_workers=parse_workers(), mp_context=multiprocessing.get_context('spawn')
+            )
+        return _processes
+
+
+def cached_result(content_hash: str) -> Optional[Dict]:
+    """The stored parse result for a file, if the current parser produced it"""
+    from api.models import ResumeAnalysis
+
+    return ResumeAnalysis.objects.filter(
+        content_hash=content_hash, parser_version=resume_parser.PARSER_VERSION
+    ).values_list('result', flat=True).first()
+
+
+def submit_parse(upload_id):
+    """Queue an upload for parsing; returns a Future without waiting for it"""
+    return _pool.submit(_parse, upload_id)
+
+
+def _parse(upload_id):
+    """Parse one upload and record the outcome on its row; runs on the coordinating thread pool"""
+    from api.models import ResumeUpload
+
+    uploads = ResumeUpload.objects.filter(pk=upload_id)
+    try:
+        uploads.update(status='processing', updated_at=timezone.now())
+        upload = uploads.get()
+        result, _ = get_flight('resume_parse').do(
+            upload.content_hash, lambda: parse_resume(upload.file_path, upload.content_hash)
+        )
+        _record_outcome(uploads, status='done', result=result)
+        _invalidate_recommendations(upload.firebase_uid)
+    except Exception as e:
+        logger.error(f"Error parsing resume upload {upload_id}: {e}")
+        _record_outcome(uploads, status='failed', error=str(e))
+    finally:
+        connection.close()
+
+
+def _record_outcome(uploads, **fields):
+    """Store a parse outcome, retrying writes that lost a lock race with another parse"""
+    for attempt in range(OUTCOME_WRITE_ATTEMPTS):
+        try:
+            return uploads.update(updated_at=timezone.now(), **fields)
+        except OperationalError as e:
+            if attempt == OUTCOME_WRITE_ATTEMPTS - 1:
+                raise
+            logger.warning(f"Retrying resume upload status write: {e}")
+            time.sleep(0.05 * 2 ** attempt)
+
+
+def parse_resume(file_path: str, content_hash: str) -> Dict:
+    """Extracted text, skills, experience, education and profile of a stored resume, cached by content"""
+    from api.job_index import job_index
+    from api.models import JobSkill, ResumeAnalysis
+
+    result = cached_result(content_hash)
+    if result is not None:
+        return result
+
+    with default_storage.open(file_path, 'rb') as stored:
+        data = stored.read()
+    skill_names = list(JobSkill.objects.values_list('name', flat=True))
+    extension = os.path.splitext(file_path)[1]
+    timeout = parse_timeout()
+    try:
+        result = _process_pool().submit(resume_parser.analyze, data, extension, skill_names).result(timeout)
+    except BrokenProcessPool:
+        _reset_process_pool()
+        raise
+    except TimeoutError:
+        # The worker may be stuck on this file for good: stop it rather than let it hold a core
+        _reset_process_pool(terminate=True)
+        raise ParseTimeout(f'Parsing took longer than {timeout:g} seconds') from None
+
+    text = result.pop('text')
+    result['extracted_text'] = text[:EXTRACTED_TEXT_LIMIT]
+    result['profile'] = job_index.profile_terms(text, limit=PROFILE_TERMS)
+    ResumeAnalysis.objects.update_or_create(
+        content_hash=content_hash,
+        defaults={'parser_version': resume_parser.PARSER_VERSION, 'result': result},
+    )
+    return result
+
+
+def _reset_process_pool(terminate: bool = False):
+    """Replace a pool whose worker died or hung, so later parses start new processes.
+
+    ``terminate`` stops the current workers too; parses still running on them fail.
+    """
+    global _processes
+    with _processes_lock:
+        if _processes is not None:
+            workers = list((_processes._processes or {}).values()) if terminate else []
+            _processes.shutdown(wait=False, cancel_futures=terminate)
+            for worker in workers:
+                worker.terminate()
+        _processes = None
+
+
+def _invalidate_recommendations(firebase_uid: str):
+    """Drop a user's stored recommendations so the next request ranks with the new resume"""
+    from api.models import JobRecommendation
+
+    JobRecommendation.objects.filter(user__uid=firebase_uid).delete()
+
+
+def profile_text(result: Optional[Dict]) -> str:
+    """A parse result as recommender input: its skills and profile terms"""
+    if not result:
+        return ''
+    return ' '.join([*result.get('skills', []), *result.get('profile', {})])
+
+
+def resume_insights(result: Dict) -> Dict:
+    """Score a parse result against the skills active jobs ask for"""
+    from api.models import JobSkillRequirement
+
+    demand: List[str] = list(
+        JobSkillRequirement.objects.filter(job__is_active=True)
+        .values('skill__name').annotate(jobs=Count('job', distinct=True))
+        .order_by('-jobs', 'skill__name').values_list('skill__name', flat=True)[:DEMAND_SKILLS]
+    )
+    skills = result.get('skills', [])
+    have = {skill.lower() for skill in skills}
+    matched = [skill for skill in demand if skill.lower() in have]
+    gaps = [skill for skill in demand if skill.lower() not in have][:5]
+    years = result.get('experience_years') or 0
+    education = result.get('education')
+    word_count = result.get('word_count', 0)
+
+    if demand:
+        skill_points = 50 * min(1.0, len(matched) / min(10, len(demand)))
+    else:
+        skill_points = 50 * min(1.0, len(skills) / 10)
+    overall_score = round(
+        skill_points
+        + 25 * min(1.0, years / 5)
+        + EDUCATION_POINTS.get(education, 0)
+        + 10 * min(1.0, word_count / 400)
+    )
+
+    strengths = []
+    if matched:
+        strengths.append(f"In-demand skills: {', '.join(matched[:5])}")
+    elif skills:
+        strengths.append(f"Skills: {', '.join(skills[:5])}")
+    if result.get('experience'):
+        strengths.append(f"{result['experience']} of experience")
+    if education in ('Doctorate', 'Master', 'Bachelor'):
+        strengths.append(f"{education} degree")
+
+    improvements = []
+    if len(skills) < 5:
+        improvements.append('List your technical skills in a dedicated section')
+    if not result.get('experience'):
+        improvements.append('Include start and end dates for each role')
+    if not education:
+        improvements.append('Add your education and qualifications')
+    if word_count < 200:
+        improvements.append('Describe your roles and achievements in more detail')
+
+    recommendations = [f"Consider learning {skill}, which many current jobs ask for" for skill in gaps[:3]]
+    if matched:
+        recommendations.append(f"Feature {' and '.join(matched[:2])} near the top of your resume")
+
+    return {
+        'overall_score': overall_score,
+        'strengths': strengths,
+        'improvements': improvements,
+        'skill_gaps': gaps,
+        'recommendations': recommendations,
+        'skills': skills,
+        'experience': result.get('experience'),
+        'education': education,
+    }
@@ -0,0 +1,243 @@
+"""
+Incrementally maintained analytics rollups
+
+job_trends and dashboard_analytics read small per-day rollup tables instead of
+aggregating Job, JobSkillRequirement and JobApplication on every request:
+
+- DailyJobRollup: active jobs by posting day, per skill, title and location,
+  with job counts and annualized salary sums/ranges
+- DailyApplicationRollup: applications per user and day
+
+refresh_rollups() (the refresh_rollups command, run by the AI job scheduler) only
+recomputes the day buckets touched by rows whose updated_at is past the
+rollup's RollupWatermark. Recomputing a bucket is idempotent, so the watermark is
+read with a small overlap to pick up rows from transactions that committed late.
+Changes that leave no updated_at behind (hard deletes, a posted_date moved to
+another day) are only picked up by a ``full`` rebuild.
+
+Readers report how old the rollups are, so staleness is bounded by the refresh
+interval and visible to clients.
+"""
+
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, Min, Q, Sum
+from django.db.models.functions import Coalesce, Lower, TruncDate
+from django.utils import timezone
+
+JOB_ROLLUP = 'jobs'
+APPLICATION_ROLLUP = 'applications'
+
+# Rows committed after a refresh may carry an updated_at slightly before its watermark
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+# Rollups older than this many seconds are reported as stale
+DEFAULT_MAX_STALENESS = 30 * 60
+
+DEFAULT_TREND_DAYS = 30
+DEFAULT_TREND_LIMIT = 10
+
+
+def refresh_rollups(full: bool = False) -> Dict[str, int]:
+    """Bring every rollup up to date; returns the number of day buckets recomputed per rollup"""
+    from api.http_cache import invalidate
+
+    refreshed = {
+        JOB_ROLLUP: _refresh_job_rollups(full),
+        APPLICATION_ROLLUP: _refresh_application_rollups(full),
+    }
+    invalidate('job_trends')
+    return refreshed
+
+
+def _changed_since(queryset, mark, full):
+    if full or mark.watermark is None:
+        return queryset
+    return queryset.filter(updated_at__gt=mark.watermark - WATERMARK_OVERLAP)
+
+
+def _refresh_job_rollups(full):
+    from api.models import DailyJobRollup, Job, JobSkillRequirement, RollupWatermark
+
+    now = timezone.now()
+    mark, _ = RollupWatermark.objects.get_or_create(name=JOB_ROLLUP)
+    changed = _changed_since(Job.objects.all(), mark, full)
+    latest = changed.aggregate(latest=Max('updated_at'))['latest']
+    if latest is None and not full:
+        RollupWatermark.objects.filter(pk=mark.pk).update(refreshed_at=now)
+        return 0
+
+    jobs = Job.objects.filter(is_active=True)
+    requirements = JobSkillRequirement.objects.filter(job__is_active=True)
+    days = None
+    if not full:
+        days = list(changed.dates('posted_date', 'day'))
+        jobs = jobs.filter(posted_date__date__in=days)
+        requirements = requirements.filter(job__posted_date__date__in=days)
+
+    rows = [
+        *_job_buckets(requirements, 'skill', F('skill__name'), 'job__'),
+        *_job_buckets(jobs, 'title', Lower('title')),
+        *_job_buckets(jobs, 'location', F('location')),
+    ]
+    with transaction.atomic():
+        stale = DailyJobRollup.objects.all() if full else DailyJobRollup.objects.filter(day__in=days)
+        stale.delete()
+        DailyJobRollup.objects.bulk_create(rows, batch_size=1000)
+        mark.watermark = latest or mark.watermark
+        mark.refreshed_at = now
+        mark.save()
+    return len({row.day for row in rows}) if full else len(days)
+
+
+def _job_buckets(queryset, dimension, key, prefix=''):
+    """One DailyJobRollup per (posting day, key) of a Job or JobSkillRequirement queryset"""
+    from api.models import DailyJobRollup
+
+    annual_min, annual_max = f'{prefix}salary_annual_min', f'{prefix}salary_annual_max'
+    salary = ExpressionWrapper(
+        (Coalesce(annual_min, annual_max) + Coalesce(annual_max, annual_min)) / 2,
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    groups = queryset.order_by().values(day=TruncDate(f'{prefix}posted_date'), key=key).annotate(
+        job_count=Count('id'),
+        salary_count=Count(salary),
+        salary_sum=Sum(salary),
+        salary_min=Min(Coalesce(annual_min, annual_max)),
+        salary_max=Max(Coalesce(annual_max, annual_min)),
+    )
+    return [
+        DailyJobRollup(
+            day=group['day'], dimension=dimension, key=group['key'][:255], job_count=group['job_count'],
+            salary_count=group['salary_count'], salary_sum=group['salary_sum'] or 0,
+            salary_min=group['salary_min'], salary_max=group['salary_max'],
+        )
+        for group in groups if group['key']
+    ]
+
+
+def _refresh_application_rollups(full):
+    from api.models import DailyApplicationRollup, JobApplication, RollupWatermark
+
+    now = timezone.now()
+    mark, _ = RollupWatermark.objects.get_or_create(name=APPLICATION_ROLLUP)
+    changed = _changed_since(JobApplication.objects.all(), mark, full)
+    latest = changed.aggregate(latest=Max('updated_at'))['latest']
+    if latest is None and not full:
+        RollupWatermark.objects.filter(pk=mark.pk).update(refreshed_at=now)
+        return 0
+
+    applications = JobApplication.objects.all()
+    if not full:
+        touched = set(changed.order_by().values_list('user_id', TruncDate('applied_date')).distinct())
+        users, days = {user_id for user_id, _ in touched}, {day for _, day in touched}
+        # Recompute the whole users x days block, so the delete below matches exactly
+        applications = applications.filter(user_id__in=users, applied_date__date__in=days)
+
+    groups = applications.order_by().values('user_id', day=TruncDate('applied_date')).annotate(
+        applications=Count('id')
+    )
+    with transaction.atomic():
+        if full:
+            DailyApplicationRollup.objects.all().delete()
+        else:
+            DailyApplicationRollup.objects.filter(user_id__in=users, day__in=days).delete()
+        DailyApplicationRollup.objects.bulk_create([
+            DailyApplicationRollup(user_id=group['user_id'], day=group['day'], applications=group['applications'])
+            for group in groups
+        ], batch_size=1000)
+        mark.watermark = latest or mark.watermark
+        mark.refreshed_at = now
+        mark.save()
+    return len(groups) if full else len(touched)
+
+
+def freshness(name: str) -> Dict:
+    """When a rollup was last refreshed and whether that is within the staleness bound"""
+    from api.models import RollupWatermark
+
+    refreshed_at = RollupWatermark.objects.filter(name=name).values_list('refreshed_at', flat=True).first()
+    if refreshed_at is None:
+        return {'as_of': None, 'age_seconds': None, 'stale': True}
+    max_staleness = getattr(settings, 'ROLLUP_MAX_STALENESS', DEFAULT_MAX_STALENESS)
+    age = (timezone.now() - refreshed_at).total_seconds()
+    return {'as_of': refreshed_at.isoformat(), 'age_seconds': int(age), 'stale': age > max_staleness}
+
+
+def job_trends(days: int = DEFAULT_TREND_DAYS, limit: int = DEFAULT_TREND_LIMIT) -> Dict:
+    """Popular skills (with growth over the previous window), salary ranges by title and jobs by location"""
+    from api.models import DailyJobRollup
+
+    start = timezone.localdate() - timedelta(days=days - 1)
+    previous_start = start - timedelta(days=days)
+    window = DailyJobRollup.objects.filter(day__gte=start)
+    total = window.filter(dimension='location').aggregate(total=Sum('job_count'))['total'] or 0
+
+    skills = DailyJobRollup.objects.filter(dimension='skill', day__gte=previous_start).values('key').annotate(
+        current=Coalesce(Sum('job_count', filter=Q(day__gte=start)), 0),
+        previous=Coalesce(Sum('job_count', filter=Q(day__lt=start)), 0),
+    ).filter(current__gt=0).order_by('-current', 'key')[:limit]
+
+    return {
+        'window_days': days,
+        'total_jobs': total,
+        'popular_skills': [
+            {
+                'skill': skill['key'],
+                'demand': round(skill['current'] * 100 / total) if total else 0,
+                'growth': round((skill['current'] - skill['previous']) * 100 / skill['previous'])
+                if skill['previous'] else None,
+            }
+            for skill in skills
+        ],
+        'salary_trends': {
+            band['key']: {'min': band['min'], 'max': band['max'], 'avg': band['avg']}
+            for band in _salary_bands(window.filter(dimension='title', salary_count__gt=0), limit)
+        },
+        'location_insights': [
+            {'location': band['key'], 'job_count': band['jobs'], 'avg_salary': band['avg']}
+            for band in _salary_bands(window.filter(dimension='location'), limit)
+        ],
+    }
+
+
+def _salary_bands(rollups, limit):
+    bands = rollups.values('key').annotate(
+        jobs=Sum('job_count'), salary_sum=Sum('salary_sum'), salary_count=Sum('salary_count'),
+        min=Min('salary_min'), max=Max('salary_max'),
+    ).order_by('-jobs', 'key')[:limit]
+    return [
+        dict(band, min=_number(band['min']), max=_number(band['max']),
+             avg=round(float(band['salary_sum']) / band['salary_count']) if band['salary_count'] else None)
+        for band in bands
+    ]
+
+
+def _number(value) -> Optional[int]:
+    return round(float(value)) if value is not None else None
+
+
+def applications_this_month(user) -> int:
+    """Applications since the first of the current (local) month"""
+    from api.models import DailyApplicationRollup
+
+    month_start = timezone.localdate().replace(day=1)
+    return DailyApplicationRollup.objects.filter(user=user, day__gte=month_start).aggregate(
+        total=Sum('applications')
+    )['total'] or 0
+
+
+def application_trend(user, days: int = DEFAULT_TREND_DAYS) -> List[Dict]:
+    """Applications per day over the last ``days`` days, including days without any"""
+    from api.models import DailyApplicationRollup
+
+    start = timezone.localdate() - timedelta(days=days - 1)
+    counts = dict(DailyApplicationRollup.objects.filter(user=user, day__gte=start).values_list('day', 'applications'))
+    return [
+        {'date': (start + timedelta(days=offset)).isoformat(),
+         'applications': counts.get(start + timedelta(days=offset), 0)}
+        for offset in range(days)
+    ]
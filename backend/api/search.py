@@ -0,0 +1,67 @@
+"""
+Relevance-ranked job search
+
+On PostgreSQL, jobs are matched against Job.search_vector, a weighted tsvector kept
+up to date by a trigger (migration 0008): title A, company B, requirements C,
+description D. Results are ranked with SearchRank. Titles and company names that
+are only close to the query (typos, short fragments) also match through pg_trgm
+word similarity, so one query serves both. Both paths are backed by GIN indexes.
+
+Other databases (the SQLite development setup) fall back to icontains matching
+with a fixed per-field relevance.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+
+SEARCH_CONFIG = 'english'
+
+# Fuzzy matches are scaled down so an exact full-text hit normally ranks above them
+TRIGRAM_WEIGHT = 0.5
+
+# Relevance of an icontains match in each field, used when full-text search is unavailable
+FALLBACK_FIELD_RELEVANCE = [
+    ('title', 0.9),
+    ('company__name', 0.8),
+    ('requirements', 0.6),
+    ('description', 0.5),
+]
+
+
+def search_jobs(jobs_query, query: str):
+    """Filter jobs to those matching ``query`` and annotate a 0-1 ``relevance`` score"""
+    query = (query or '').strip()
+    jobs_query = jobs_query.defer('search_vector')
+    if not query:
+        return jobs_query.annotate(relevance=Value(1.0, output_field=FloatField()))
+    if connection.vendor == 'postgresql':
+        return _postgres_search(jobs_query, query)
+    return _basic_search(jobs_query, query)
+
+
+def _postgres_search(jobs_query, query):
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    return jobs_query.filter(
+        Q(search_vector=search_query) |
+        Q(title__trigram_word_similar=query) |
+        Q(company__name__trigram_word_similar=query)
+    ).annotate(
+        # Normalization 32 maps rank to rank / (rank + 1), keeping it below 1
+        text_rank=SearchRank(F('search_vector'), search_query, normalization=32),
+        similarity=Greatest(TrigramWordSimilarity(query, 'title'), TrigramWordSimilarity(query, 'company__name')),
+    ).annotate(
+        relevance=Greatest(F('text_rank'), F('similarity') * TRIGRAM_WEIGHT, output_field=FloatField()),
+    )
+
+
+def _basic_search(jobs_query, query):
+    matches = Q()
+    for field, _ in FALLBACK_FIELD_RELEVANCE:
+        matches |= Q(**{f'{field}__icontains': query})
+    return jobs_query.filter(matches).annotate(relevance=Case(
+        *[When(**{f'{field}__icontains': query}, then=Value(score)) for field, score in FALLBACK_FIELD_RELEVANCE],
+        default=Value(0.0),
+        output_field=FloatField(),
+    ))
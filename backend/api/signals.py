@@ -0,0 +1,11 @@
+"""
+Signals for the job data pipeline
+"""
+
+from django.dispatch import Signal
+
+# Sent after scraped postings are committed, with the primary keys of the jobs that
+# were added, changed or deactivated. Bulk writes bypass post_save, so incremental
+# consumers (indexes, recommendation refreshes) listen for this instead.
+# Arguments: added_ids, changed_ids, deactivated_ids
+jobs_changed = Signal()
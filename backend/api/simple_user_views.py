@@ -2,19 +2,23 @@
 Simple User API Views - REST endpoints for user management
 """
 
+import inspect
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
+from pymongo import ReturnDocument
 import json
 
 # Import MongoDB connection
-from database.mongodb_connection import get_mongodb
+from database.mongodb_connection import get_async_mongodb, get_mongodb
 
 logger = logging.getLogger(__name__)
 
@@ -37,97 +41,101 @@ def _get_firebase_uid_from_request(request) -> Optional[str]:
         logger.error(f"Error extracting Firebase UID: {e}")
         return None
 
-@api_view(['GET'])
-def user_profile(request, user_id=None):
+async def _users_collection(request):
+    """The MongoDB users collection, or None if MongoDB is unreachable.
+
+    pymongo's async client is only used under ASGI (uvicorn), whose event loop
+    lives as long as the process. Under WSGI each request runs on a new loop, so
+    the shared sync client is used instead, on a worker thread (see _mongo).
+    """
+    if isinstance(request, ASGIRequest):
+        mongodb = get_async_mongodb()
+        connected = await mongodb.connect()
+    else:
+        mongodb = get_mongodb()
+        connected = await sync_to_async(mongodb.connect, thread_sensitive=False)()
+    return mongodb.get_collection('users') if connected is not False else None
+
+async def _mongo(method, *args, **kwargs):
+    """Call a method of the collection from _users_collection, whichever client it came from"""
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await sync_to_async(method, thread_sensitive=False)(*args, **kwargs)
+
+# user_profile and sync_user are native async views (plain Django views, since
+# DRF's api_view is sync-only). Each makes a single MongoDB round trip: an upsert
+# that returns the resulting document.
+@require_http_methods(['GET'])
+async def user_profile(request, user_id=None):
     """Get user profile"""
     try:
         # Get Firebase UID from request
         firebase_uid = _get_firebase_uid_from_request(request)
+        
+        # Connect to MongoDB
+        users_collection = await _users_collection(request)
+        if users_collection is None:
+            return JsonResponse({'error': 'Database connection failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
         if not firebase_uid:
-            # Create a test user and store in MongoDB
+            # Create the test user if it does not exist, otherwise update its last login
             firebase_uid = 'test_user_123'
-            
-            # Connect to MongoDB
-            mongodb = get_mongodb()
-            if mongodb.connect() is False:
-                return Response({'error': 'Database connection failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-            # Get users collection
-            users_collection = mongodb.get_collection('users')
-            
-            # Check if user exists, if not create one
-            existing_user = users_collection.find_one({'firebase_uid': firebase_uid})
-            if not existing_user:
-                # Create new user
-                user_data = {
-                    'firebase_uid': firebase_uid,
-                    'email': 'user@example.com',
-                    'display_name': 'Test User',
-                    'profile_complete': True,
-                    'created_at': datetime.now().isoformat(),
-                    'last_login': datetime.now().isoformat(),
-                    'preferences': {
-                        'job_categories': ['Software Engineering', 'Data Science'],
-                        'locations': ['San Francisco', 'Remote'],
-                        'salary_range': {'min': 80000, 'max': 150000},
-                        'work_type': ['Full-time', 'Contract']
+            user_data = await _mongo(
+                users_collection.find_one_and_update,
+                {'firebase_uid': firebase_uid},
+                {
+                    '$set': {'last_login': datetime.now().isoformat()},
+                    '$setOnInsert': {
+                        'email': 'user@example.com',
+                        'display_name': 'Test User',
+                        'profile_complete': True,
+                        'created_at': datetime.now().isoformat(),
+                        'preferences': {
+                            'job_categories': ['Software Engineering', 'Data Science'],
+                            'locations': ['San Francisco', 'Remote'],
+                            'salary_range': {'min': 80000, 'max': 150000},
+                            'work_type': ['Full-time', 'Contract']
+                        },
+                        'settings': {
+                            'profile_visibility': 'public',
+                            'email_notifications': True,
+                            'push_notifications': True,
+                            'job_alerts': True,
+                            'newsletter': False,
+                            'privacy_level': 'standard',
+                            'data_sharing': False
+                        }
                     },
-                    'settings': {
-                        'profile_visibility': 'public',
-                        'email_notifications': True,
-                        'push_notifications': True,
-                        'job_alerts': True,
-                        'newsletter': False,
-                        'privacy_level': 'standard',
-                        'data_sharing': False
-                    }
-                }
-                users_collection.insert_one(user_data)
-                logger.info(f"Created new user in MongoDB: {firebase_uid}")
-            else:
-                # Update last login
-                users_collection.update_one(
-                    {'firebase_uid': firebase_uid},
-                    {'$set': {'last_login': datetime.now().isoformat()}}
-                )
-                logger.info(f"Updated last login for user: {firebase_uid}")
-            
-            # Get user data
-            user_data = users_collection.find_one({'firebase_uid': firebase_uid})
-            if user_data:
-                # Remove MongoDB _id field
-                user_data.pop('_id', None)
-                return Response({
-                    'success': True,
-                    'user': user_data,
-                    'message': 'User data from MongoDB'
-                })
-            else:
-                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+                },
+                projection={'_id': False},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            logger.info(f"Updated last login for user: {firebase_uid}")
+            return JsonResponse({
+                'success': True,
+                'user': user_data,
+                'message': 'User data from MongoDB'
+            })
         
         # For authenticated users, get real user data from MongoDB
-        mongodb = get_mongodb()
-        if mongodb.connect() is False:
-            return Response({'error': 'Database connection failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
-        users_collection = mongodb.get_collection('users')
-        user_data = users_collection.find_one({'firebase_uid': firebase_uid})
+        user_data = await _mongo(users_collection.find_one, {'firebase_uid': firebase_uid}, {'_id': False})
         
         if user_data:
-            user_data.pop('_id', None)
-            return Response({
+            return JsonResponse({
                 'success': True,
                 'user': user_data
             })
         else:
-            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+            return JsonResponse({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
         
     except Exception as e:
         logger.error(f"Error getting user profile: {e}")
-        return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return JsonResponse({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@api_view(['POST'])
-def sync_user(request):
+@csrf_exempt
+@require_http_methods(['POST'])
+async def sync_user(request):
     """Sync user from Firebase"""
     try:
         # Get Firebase UID from request
@@ -136,16 +144,6 @@ def sync_user(request):
             # For testing, create a test user
             firebase_uid = 'test_user_sync_' + str(int(datetime.now().timestamp()))
         
-        # Connect to MongoDB
-        mongodb = get_mongodb()
-        if mongodb.connect() is False:
-            return Response({'error': 'Database connection failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
-        users_collection = mongodb.get_collection('users')
-        
-        # Check if user already exists
-        existing_user = users_collection.find_one({'firebase_uid': firebase_uid})
-        
         # Try to get custom user data from request body
         custom_user_data = None
         try:
@@ -153,68 +151,61 @@ def sync_user(request):
                 custom_user_data = json.loads(request.body)
         except json.JSONDecodeError:
             pass
+        if not isinstance(custom_user_data, dict):
+            custom_user_data = None
         
-        if existing_user:
-            # Update existing user
-            update_data = {
-                'last_sync': datetime.now().isoformat(),
-                'last_login': datetime.now().isoformat()
-            }
-            
-            # If custom data provided, merge it
-            if custom_user_data:
-                update_data.update(custom_user_data)
-            
-            users_collection.update_one(
-                {'firebase_uid': firebase_uid},
-                {'$set': update_data}
-            )
-            logger.info(f"Updated existing user in MongoDB: {firebase_uid}")
-            user_data = users_collection.find_one({'firebase_uid': firebase_uid})
-        else:
-            # Create new user
-            if custom_user_data:
-                # Use custom data if provided
-                user_data = custom_user_data
-                user_data['firebase_uid'] = firebase_uid
-                user_data['created_at'] = datetime.now().isoformat()
-                user_data['last_login'] = datetime.now().isoformat()
-                user_data['last_sync'] = datetime.now().isoformat()
-            else:
-                # Default user data
-                user_data = {
-                    'firebase_uid': firebase_uid,
-                    'email': f'user_{firebase_uid}@example.com',
-                    'display_name': f'User {firebase_uid}',
-                    'profile_complete': False,
-                    'created_at': datetime.now().isoformat(),
-                    'last_login': datetime.now().isoformat(),
-                    'last_sync': datetime.now().isoformat(),
-                    'preferences': {
-                        'job_categories': [],
-                        'locations': [],
-                        'salary_range': {'min': 0, 'max': 0},
-                        'work_type': []
-                    },
-                    'settings': {
-                        'profile_visibility': 'public',
-                        'email_notifications': True,
-                        'push_notifications': True,
-                        'job_alerts': True,
-                        'newsletter': False,
-                        'privacy_level': 'standard',
-                        'data_sharing': False
-                    }
+        # Connect to MongoDB
+        users_collection = await _users_collection(request)
+        if users_collection is None:
+            return JsonResponse({'error': 'Database connection failed'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        # Existing users get their sync time and any posted fields; new users are
+        # created from the posted fields, or from the defaults when none were sent
+        update_data = {
+            'last_sync': datetime.now().isoformat(),
+            'last_login': datetime.now().isoformat()
+        }
+        if custom_user_data:
+            update_data.update(custom_user_data)
+        update_data.pop('firebase_uid', None)
+        update_data.pop('_id', None)
+        
+        insert_data = {'created_at': datetime.now().isoformat()}
+        if not custom_user_data:
+            insert_data.update({
+                'email': f'user_{firebase_uid}@example.com',
+                'display_name': f'User {firebase_uid}',
+                'profile_complete': False,
+                'preferences': {
+                    'job_categories': [],
+                    'locations': [],
+                    'salary_range': {'min': 0, 'max': 0},
+                    'work_type': []
+                },
+                'settings': {
+                    'profile_visibility': 'public',
+                    'email_notifications': True,
+                    'push_notifications': True,
+                    'job_alerts': True,
+                    'newsletter': False,
+                    'privacy_level': 'standard',
+                    'data_sharing': False
                 }
-            
-            users_collection.insert_one(user_data)
-            logger.info(f"Created new user in MongoDB: {firebase_uid}")
+            })
+        # MongoDB rejects an update that names the same field in $set and $setOnInsert
+        insert_data = {key: value for key, value in insert_data.items() if key not in update_data}
         
-        # Remove MongoDB _id field
-        if user_data:
-            user_data.pop('_id', None)
+        user_data = await _mongo(
+            users_collection.find_one_and_update,
+            {'firebase_uid': firebase_uid},
+            {'$set': update_data, '$setOnInsert': insert_data},
+            projection={'_id': False},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        logger.info(f"Synced user in MongoDB: {firebase_uid}")
         
-        return Response({
+        return JsonResponse({
             'success': True,
             'message': 'User synced successfully with MongoDB',
             'user': user_data
@@ -222,7 +213,7 @@ def sync_user(request):
         
     except Exception as e:
         logger.error(f"Error syncing user: {e}")
-        return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return JsonResponse({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
 def user_activities(request):
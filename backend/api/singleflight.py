@@ -0,0 +1,200 @@
+"""
+Single-flight request coalescing
+
+Concurrent calls with the same key share one computation: the first caller (the
+leader) runs it and every caller that arrives while it is in flight waits for and
+receives the same result, or the same exception.
+
+Within a process this uses threads and events. Set SINGLEFLIGHT_CACHE_ALIAS to a
+Django cache shared by all workers (one whose add() is atomic, such as the
+'shared' database cache; run ``manage.py createcachetable`` first) and leaders
+also take a lock there. Followers in other workers then wait for the result the
+leader publishes instead of recomputing it.
+
+Async views use ado(), whose followers await the leader's result instead of
+blocking a thread. It takes the same cross-worker lock, through the cache's
+async API, and polls it with asyncio.sleep.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOCK_TIMEOUT = 60  # seconds a cross-worker leader may hold its lock
+DEFAULT_RESULT_TTL = 5  # seconds a published result stays readable for followers
+POLL_INTERVAL = 0.05
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key"""
+
+    def __init__(self, namespace: str, cache_alias: Optional[str] = None,
+                 lock_timeout: int = DEFAULT_LOCK_TIMEOUT, result_ttl: int = DEFAULT_RESULT_TTL):
+        self.namespace = namespace
+        self.cache_alias = cache_alias
+        self.lock_timeout = lock_timeout
+        self.result_ttl = result_ttl
+        self.calls: Dict[Hashable, _Call] = {}
+        self.async_calls: Dict[Hashable, Future] = {}
+        self.lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]):
+        """Return fn()'s result, sharing it with concurrent callers of the same key.
+
+        Returns (result, shared), where ``shared`` is True when this caller
+        received a result computed for another request.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result, shared = self._run_leader(key, fn)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                self.calls.pop(key, None)
+            call.done.set()
+        return call.result, shared
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]):
+        """Async do(): await fn()'s result, sharing it with concurrent callers of the same key"""
+        with self.lock:
+            call = self.async_calls.get(key)
+            leader = call is None
+            if leader:
+                # A concurrent.futures Future can be awaited from any event loop
+                call = self.async_calls[key] = Future()
+        if not leader:
+            return await asyncio.wrap_future(call), True
+
+        try:
+            result, shared = await self._arun_leader(key, fn)
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.async_calls.pop(key, None)
+        call.set_result(result)
+        return result, shared
+
+    def _run_leader(self, key, fn):
+        """Run fn for this process, coordinating with other workers when a shared cache is set"""
+        cache = self._shared_cache()
+        if cache is None:
+            return fn(), False
+
+        lock_key, result_key = self._cache_keys(key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_timeout
+        try:
+            while not cache.add(lock_key, token, self.lock_timeout):
+                # Another worker is computing this key; wait for its published result
+                published = cache.get(result_key)
+                if published is not None:
+                    return published['value'], True
+                if time.monotonic() >= deadline:
+                    return fn(), False
+                time.sleep(POLL_INTERVAL)
+        except Exception as e:
+            logger.warning(f"Single-flight cache {self.cache_alias} unavailable: {e}")
+            return fn(), False
+
+        try:
+            # The previous leader may have published and unlocked between our polls
+            published = cache.get(result_key)
+            if published is not None:
+                return published['value'], True
+            value = fn()
+            cache.set(result_key, {'value': value}, self.result_ttl)
+            return value, False
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    async def _arun_leader(self, key, fn):
+        """_run_leader for ado(): the same protocol over the cache's async API"""
+        cache = self._shared_cache()
+        if cache is None:
+            return await fn(), False
+
+        lock_key, result_key = self._cache_keys(key)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_timeout
+        try:
+            while not await cache.aadd(lock_key, token, self.lock_timeout):
+                published = await cache.aget(result_key)
+                if published is not None:
+                    return published['value'], True
+                if time.monotonic() >= deadline:
+                    return await fn(), False
+                await asyncio.sleep(POLL_INTERVAL)
+        except Exception as e:
+            logger.warning(f"Single-flight cache {self.cache_alias} unavailable: {e}")
+            return await fn(), False
+
+        try:
+            published = await cache.aget(result_key)
+            if published is not None:
+                return published['value'], True
+            value = await fn()
+            await cache.aset(result_key, {'value': value}, self.result_ttl)
+            return value, False
+        finally:
+            if await cache.aget(lock_key) == token:
+                await cache.adelete(lock_key)
+
+    def _cache_keys(self, key):
+        """The cross-worker lock and result keys for a call key"""
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return f'singleflight:{self.namespace}:lock:{digest}', f'singleflight:{self.namespace}:result:{digest}'
+
+    def _shared_cache(self):
+        if not self.cache_alias:
+            return None
+        try:
+            return caches[self.cache_alias]
+        except Exception as e:
+            logger.warning(f"Single-flight cache {self.cache_alias} is not configured: {e}")
+            return None
+
+
+def get_flight(namespace: str) -> SingleFlight:
+    """The process-wide SingleFlight for a namespace, configured from settings"""
+    with _flights_lock:
+        if namespace not in _flights:
+            _flights[namespace] = SingleFlight(
+                namespace, cache_alias=getattr(settings, 'SINGLEFLIGHT_CACHE_ALIAS', None)
+            )
+        return _flights[namespace]
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
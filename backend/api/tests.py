@@ -1,3 +1,1055 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from datetime import date, timedelta
+from unittest import mock
+from decimal import Decimal
 
-# Create your tests here.
+import pandas as pd
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, OperationalError, connection
+from django.db.models import F, QuerySet
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+AI_FOLDER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'AI')
+if AI_FOLDER_PATH not in sys.path:
+    sys.path.append(AI_FOLDER_PATH)
+
+from job_scraper import JobPosting
+from salary_normalizer import normalize_salary_frame
+
+from api import resumes
+from api.autocomplete import autocomplete
+from api.counters import BufferedCounter, flush_all, get_counter
+from api.crawl_planner import (
+    MAX_REFRESH_INTERVAL, MIN_REFRESH_INTERVAL, POPULARITY_HALF_LIFE, due_entries, record_search, refresh_interval,
+    refresh_plan,
+)
+from api.facets import refresh_facet_table
+from api.geocoding import GeoPoint, geocode, geocode_jobs, geocode_many, load_gazetteer, search_point
+from api.ingestion import deactivate_missing_jobs, ingest_postings, normalize_stored_salaries
+from api.job_index import JobIndex, job_index
+from api.management.commands.bench_resume_parsing import docx_bytes, pdf_bytes
+from api.models import (
+    Company, CrawlPlanEntry, DailyApplicationRollup, FirebaseUser, GeocodeCache, Job, JobApplication, JobCategory,
+    JobRecommendation, JobSkill, JobSkillRequirement, ResumeAnalysis, ResumeUpload, RollupWatermark, SavedJob,
+)
+from api.pagination import approximate_count
+from api.projections import JobProjection
+from api.resume_parser import UnsupportedFormat, analyze, extract_text
+from api.rollups import applications_this_month, refresh_rollups
+from api.signals import jobs_changed
+from api.singleflight import SingleFlight
+
+
+def make_posting(job_id, title='Python Developer', company='Tech Corp', **kwargs):
+    defaults = {
+        'location': 'Perth',
+        'description': f'{title} role',
+        'skills': 'IT Jobs',
+        'salary_min': 90000,
+        'salary_max': 110000,
+        'created': '2025-10-20T03:12:45Z',
+        'redirect_url': f'https://www.adzuna.com.au/details/{job_id}',
+    }
+    defaults.update(kwargs)
+    return JobPosting(job_id, title, company, **defaults)
+
+
+class IngestionTests(TestCase):
+    def test_upserts_by_external_id(self):
+        stats = ingest_postings([make_posting('1'), make_posting('2', company='Data Co')])
+        self.assertEqual(stats['created'], 2)
+        self.assertEqual(Company.objects.count(), 2)
+
+        stats = ingest_postings([make_posting('1', title='Senior Python Developer'), make_posting('3')])
+        self.assertEqual((stats['created'], stats['updated']), (1, 1))
+        self.assertEqual(Job.objects.count(), 3)
+        self.assertEqual(Company.objects.count(), 2)
+        self.assertEqual(Job.objects.get(external_id='1').title, 'Senior Python Developer')
+
+    def test_batch_query_count_does_not_grow_with_batch_size(self):
+        def count_queries(postings):
+            with CaptureQueriesContext(connection) as ctx:
+                ingest_postings(postings)
+            return len(ctx.captured_queries)
+
+        small = count_queries([make_posting(f'a{i}', company=f'A {i}') for i in range(3)])
+        # Kept under SQLite's 999 bound parameters, past which Django splits the INSERT
+        large = count_queries([make_posting(f'b{i}', company=f'B {i}') for i in range(20)])
+        self.assertEqual(small, large)
+
+    def test_unchanged_postings_are_only_marked_seen(self):
+        ingest_postings([make_posting('1'), make_posting('2')])
+        Job.objects.update(last_seen_at=timezone.now() - timedelta(days=1))
+        received = []
+        jobs_changed.connect(lambda sender, **kwargs: received.append(kwargs), weak=False, dispatch_uid='test')
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                stats = ingest_postings([make_posting('1'), make_posting('2', salary_max=120000), make_posting('3')])
+        finally:
+            jobs_changed.disconnect(dispatch_uid='test')
+
+        self.assertEqual((stats['created'], stats['updated'], stats['unchanged']), (1, 1, 1))
+        self.assertEqual(stats['delta'], {'added': ['3'], 'changed': ['2']})
+        self.assertEqual(received[0]['changed_ids'], [Job.objects.get(external_id='2').id])
+        self.assertGreater(Job.objects.get(external_id='1').last_seen_at, timezone.now() - timedelta(hours=1))
+
+    def test_deactivates_jobs_not_seen_recently(self):
+        ingest_postings([make_posting('1'), make_posting('2')])
+        Job.objects.filter(external_id='1').update(last_seen_at=timezone.now() - timedelta(days=3))
+
+        self.assertEqual(deactivate_missing_jobs(max_age=timedelta(hours=48)), 1)
+        self.assertFalse(Job.objects.get(external_id='1').is_active)
+        self.assertTrue(Job.objects.get(external_id='2').is_active)
+
+    def test_scraper_errors_raise_and_mock_postings_are_never_stored(self):
+        import job_scraper
+
+        with mock.patch('job_scraper._fetch_page', side_effect=ConnectionError('Adzuna is down')):
+            with self.assertRaises(ConnectionError):
+                list(job_scraper.iter_job_postings('python', 'Perth'))
+            demo = list(job_scraper.iter_job_postings('python', 'Perth', use_mock=True))
+
+        stats = ingest_postings([*demo, make_posting('1')])
+        self.assertEqual((stats['created'], stats['skipped']), (1, len(demo)))
+        self.assertEqual(list(Job.objects.values_list('external_id', flat=True)), ['1'])
+
+
+class SalaryNormalizationTests(TestCase):
+    def test_parses_strings_ranges_and_periods(self):
+        frame = normalize_salary_frame(pd.DataFrame({
+            'salary_min': ['$85000', '80k - 100k', '$45 per hour', 5000, 'Competitive'],
+            'salary_max': [None, None, None, None, None],
+        }, dtype='object'))
+        self.assertEqual(frame['salary_annual_min'].tolist()[:4], [85000, 80000, 45 * 38 * 52, 60000])
+        self.assertEqual(frame['salary_annual_max'].tolist()[:4], [85000, 100000, 45 * 38 * 52, 60000])
+        self.assertEqual(frame['salary_period'].tolist()[:4], ['yearly', 'yearly', 'hourly', 'monthly'])
+        self.assertTrue(pd.isna(frame['salary_annual_min'].iloc[4]))
+
+    def test_ingestion_and_backfill_store_annual_salaries(self):
+        ingest_postings([make_posting('1', salary_min='$40 per hour', salary_max=None)], currency='AUD')
+        self.assertEqual(Job.objects.get(external_id='1').salary_annual_min, Decimal('79040.00'))
+
+        job = Job.objects.create(title='Analyst', company=Company.objects.get(), description='', requirements='',
+                                 location='Perth', salary_min=Decimal('5000'), salary_max=Decimal('6000'),
+                                 salary_currency='USD', salary_period='monthly')
+        self.assertEqual(normalize_stored_salaries(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.salary_annual_min, job.salary_annual_max), (Decimal('90000.00'), Decimal('108000.00')))
+
+
+class CrawlPlannerTests(TestCase):
+    def test_record_search_normalizes_and_counts_hits(self):
+        record_search('Software  Engineer', 'Perth')
+        record_search('software engineer', ' perth ')
+        entry = CrawlPlanEntry.objects.get()
+        self.assertEqual((entry.query, entry.location, entry.country), ('software engineer', 'perth', 'au'))
+        self.assertEqual(entry.pending_hits, 2)
+
+        refresh_plan()
+        entry.refresh_from_db()
+        self.assertEqual(entry.pending_hits, 0)
+        self.assertAlmostEqual(entry.popularity, 2.0, places=3)
+
+    def test_entries_decay_from_their_own_last_refresh(self):
+        CrawlPlanEntry.objects.create(query='developer', location='perth', popularity=8,
+                                      decayed_at=timezone.now() - POPULARITY_HALF_LIFE)
+        record_search('nurse', 'perth')
+
+        refresh_plan()
+        popularity = dict(CrawlPlanEntry.objects.values_list('query', 'popularity'))
+        self.assertAlmostEqual(popularity['developer'], 4.0, places=3)
+        self.assertAlmostEqual(popularity['nurse'], 1.0, places=3)
+
+    def test_popular_changing_searches_refresh_sooner(self):
+        self.assertLess(refresh_interval(400, 0.9), refresh_interval(4, 0.9))
+        self.assertLess(refresh_interval(50, 0.9), refresh_interval(50, 0.1))
+        self.assertEqual(refresh_interval(0, 0.0), MAX_REFRESH_INTERVAL)
+        self.assertEqual(refresh_interval(10 ** 6, 1.0), MIN_REFRESH_INTERVAL)
+
+    def test_due_entries_orders_by_popularity(self):
+        later = timezone.now() + timedelta(hours=1)
+        CrawlPlanEntry.objects.create(query='nurse', location='perth', popularity=1)
+        CrawlPlanEntry.objects.create(query='developer', location='perth', popularity=9)
+        CrawlPlanEntry.objects.create(query='teacher', location='perth', popularity=50, next_crawl_at=later)
+        self.assertEqual([e.query for e in due_entries()], ['developer', 'nurse'])
+
+    def test_refresh_plan_deactivates_cold_searches_and_deletes_abandoned_ones(self):
+        now = timezone.now()
+        CrawlPlanEntry.objects.create(query='pyhton', location='perth', popularity=0.04,
+                                      last_requested_at=now - timedelta(days=20), decayed_at=now)
+        CrawlPlanEntry.objects.create(query='developer', location='perth', popularity=1,
+                                      last_requested_at=now - timedelta(days=1), decayed_at=now)
+        CrawlPlanEntry.objects.create(query='cobol', location='perth', is_active=False,
+                                      last_requested_at=now - timedelta(days=120), decayed_at=now)
+
+        refresh_plan()
+        self.assertEqual(dict(CrawlPlanEntry.objects.values_list('query', 'is_active')),
+                         {'pyhton': False, 'developer': True})
+        self.assertEqual([e.query for e in due_entries()], ['developer'])
+
+        record_search('pyhton', 'perth')
+        self.assertTrue(CrawlPlanEntry.objects.get(query='pyhton').is_active)
+
+
+class JobListQueryTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(name='Tech Corp')
+        skills = [JobSkill.objects.create(name=name) for name in ('Python', 'Django', 'SQL')]
+        self.user = FirebaseUser.objects.create_user('uid-1', 'user@example.com')
+        for i in range(25):
+            job = Job.objects.create(title=f'Developer {i}', company=company, description='', requirements='',
+                                     location='Perth')
+            for skill in skills:
+                JobSkillRequirement.objects.create(job=job, skill=skill, is_required=skill.name != 'SQL')
+            SavedJob.objects.create(job=job, user=self.user)
+
+    def count_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_job_list_query_count_does_not_grow_with_page_size(self):
+        small, response = self.count_queries('/api/jobs/', {'limit': 2})
+        large, _ = self.count_queries('/api/jobs/', {'limit': 20})
+        self.assertEqual(small, large)
+        self.assertEqual(sorted(response.data['jobs'][0]['requirements']), ['Django', 'Python'])
+
+    def test_cursor_pagination_walks_every_job_once(self):
+        # Ties on posted_date are broken by id
+        Job.objects.filter(id__lte=Job.objects.order_by('id')[10].id).update(posted_date=timezone.now())
+        seen, cursor, page_queries = [], '', []
+        while cursor is not None:
+            queries, response = self.count_queries('/api/jobs/', {'cursor': cursor, 'limit': 4})
+            page_queries.append(queries)
+            seen += [job['id'] for job in response.data['jobs']]
+            cursor = response.data['pagination']['next_cursor']
+        expected = list(Job.objects.order_by('-posted_date', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(set(page_queries)), 1)
+
+    def test_cursor_pagination_totals_are_optional_and_capped(self):
+        _, response = self.count_queries('/api/jobs/', {'cursor': ''})
+        self.assertNotIn('total', response.data['pagination'])
+        _, response = self.count_queries('/api/jobs/', {'cursor': '', 'location': 'perth', 'include_total': '1'})
+        self.assertEqual((response.data['pagination']['total'], response.data['pagination']['total_is_exact']),
+                         (25, True))
+        self.assertEqual(approximate_count(Job.objects.all(), cap=10), {'total': 10, 'exact': False})
+        self.assertEqual(self.client.get('/api/jobs/', {'cursor': 'not-a-cursor'}).status_code, 400)
+
+    def test_non_positive_limits_are_clamped_to_one(self):
+        for limit in ('0', '-5'):
+            for params in ({'cursor': ''}, {}):
+                response = self.client.get('/api/jobs/', dict(params, limit=limit))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['jobs']), 1)
+
+    def test_saved_jobs_query_count_is_constant(self):
+        with mock.patch('api.views._get_firebase_uid_from_request', return_value='uid-1'):
+            queries, response = self.count_queries('/api/user/saved-jobs/')
+        self.assertEqual(response.data['total_saved'], 25)
+        self.assertEqual(queries, 2)
+
+    def test_sparse_fieldsets_and_description_truncation(self):
+        Job.objects.update(description='x' * 500)
+        _, response = self.count_queries('/api/jobs/', {'fields': 'id,title,description', 'description_length': 10})
+        self.assertEqual(list(response.data['jobs'][0]), ['id', 'title', 'description'])
+        self.assertEqual(response.data['jobs'][0]['description'], 'x' * 10 + '…')
+        full = self.client.get('/api/jobs/', {'limit': 1}).data['jobs'][0]
+        self.assertEqual(full['requirements'], ['Python', 'Django'])
+        self.assertEqual(full['salary'], 'Salary not specified')
+        self.assertEqual(self.client.get('/api/jobs/', {'fields': 'id,secret'}).status_code, 400)
+
+    def test_fast_renderer_matches_json_renderer(self):
+        from rest_framework.renderers import JSONRenderer
+        from api.renderers import FastJSONRenderer
+
+        data = {'salary': Decimal('95000.50'), 'posted': timezone.now(), 'title': 'Développeur', 'ids': [1, None]}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+
+class JobSearchTests(TestCase):
+    def test_results_are_ordered_by_relevance(self):
+        company = Company.objects.create(name='Tech Corp')
+        for title, description in [('Nurse', 'Python scripting is a plus'), ('Python Developer', 'APIs'),
+                                   ('Chef', 'Cooking')]:
+            Job.objects.create(title=title, company=company, description=description, requirements='',
+                               location='Perth')
+
+        response = self.client.get('/api/jobs/search/', {'q': 'python'})
+        self.assertEqual([job['title'] for job in response.data['results']], ['Python Developer', 'Nurse'])
+        scores = [job['relevance'] for job in response.data['results']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+
+class GeocodingTests(TestCase):
+    def test_gazetteer_resolves_qualified_and_ambiguous_names(self):
+        gazetteer = load_gazetteer()
+        resolved = {text: getattr(gazetteer.lookup(text), 'id', None) for text in [
+            'Perth', 'Perth WA 6000', 'Perth Amboy, NJ', 'Perth, Scotland', 'Osborne Park, Perth Region', 'Remote',
+        ]}
+        self.assertEqual(resolved, {
+            'Perth': 'au-wa-perth', 'Perth WA 6000': 'au-wa-perth', 'Perth Amboy, NJ': 'us-nj-perth-amboy',
+            'Perth, Scotland': 'gb-sct-perth', 'Osborne Park, Perth Region': 'au-wa-osborne-park', 'Remote': None,
+        })
+
+        # Resolutions are cached, and an edited cache row wins over the gazetteer
+        geocode_many(['Perth', 'Remote'])
+        self.assertEqual(GeocodeCache.objects.count(), 2)
+        GeocodeCache.objects.filter(query='remote').update(place_id='remote-hq', latitude=1.0, longitude=2.0)
+        self.assertEqual(geocode('Remote'), GeoPoint('remote-hq', 1.0, 2.0))
+
+    def test_radius_search_ranks_by_distance(self):
+        company = Company.objects.create(name='Tech Corp')
+        for location in ['Mandurah, WA', 'Perth Amboy, NJ', 'Fremantle', 'Perth', 'Somewhere Perthshire']:
+            Job.objects.create(title=f'Job in {location}', company=company, description='', requirements='',
+                               location=location)
+        self.assertEqual(geocode_jobs(Job.objects.all()), 4)
+
+        def search(**params):
+            results = self.client.get('/api/jobs/search/', params).data['results']
+            return [(job['location'], job['distance_km'] and round(job['distance_km'])) for job in results]
+
+        # Not yet geocodable text still matches by substring
+        self.assertEqual(search(location='Perth'), [('Perth', 0), ('Fremantle', 16), ('Somewhere Perthshire', None)])
+        self.assertEqual(search(location='Perth', radius_km='100')[:3],
+                         [('Perth', 0), ('Fremantle', 16), ('Mandurah, WA', 65)])
+        self.assertEqual(search(lat='40.5', lon='-74.3', radius_km='10'), [('Perth Amboy, NJ', 3)])
+
+        # The job listing and the AI jobs index match the same places
+        jobs = self.client.get('/api/jobs/', {'location': 'Perth', 'limit': 10}).data['jobs']
+        self.assertEqual(sorted(job['location'] for job in jobs), ['Fremantle', 'Perth', 'Somewhere Perthshire'])
+        index = JobIndex()
+        index.rebuild()
+        matches = index.search(query='job', location='Perth', point=search_point('Perth'), limit=10)
+        self.assertEqual(sorted(Job.objects.get(id=job_id).location for job_id, _ in matches),
+                         ['Fremantle', 'Perth', 'Somewhere Perthshire'])
+
+        # Ingested jobs are geocoded once their batch commits
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_postings([make_posting('1', location='Joondalup, Western Australia')])
+        self.assertEqual(Job.objects.get(external_id='1').place_id, 'au-wa-joondalup')
+
+
+# Per-process response cache, so the query counts below are the view's own queries
+@override_settings(HTTP_CACHE_ALIAS='default')
+class JobFacetTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(name='Tech Corp')
+        engineering = JobCategory.objects.create(name='Engineering')
+        for title, location, job_type, category in [
+            ('Python Developer', 'Perth', 'full-time', engineering),
+            ('Data Engineer', 'Perth', 'contract', engineering),
+            ('Nurse', 'Sydney', 'full-time', None),
+        ]:
+            Job.objects.create(title=title, company=company, description='', requirements='', location=location,
+                               job_type=job_type, category=category)
+
+    def test_all_facets_are_counted_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/jobs/facets/')
+        self.assertEqual(len(ctx.captured_queries), 1)
+        facets = response.data['facets']
+        self.assertEqual(facets['location'], [{'value': 'Perth', 'count': 2}, {'value': 'Sydney', 'count': 1}])
+        self.assertEqual(facets['category'], [{'value': 'Engineering', 'count': 2}, {'value': None, 'count': 1}])
+        self.assertEqual(facets['work_location'], [{'value': 'on-site', 'count': 3}])
+
+        filtered = self.client.get('/api/jobs/facets/', {'job_type': 'full-time'}).data['facets']
+        self.assertEqual(filtered['location'], [{'value': 'Perth', 'count': 1}, {'value': 'Sydney', 'count': 1}])
+
+    def test_materialized_counts_serve_unfiltered_requests(self):
+        self.assertEqual(refresh_facet_table(), 7)
+        Job.objects.filter(location='Sydney').delete()
+        with self.settings(JOB_FACETS_MATERIALIZED=True):
+            response = self.client.get('/api/jobs/facets/')
+            self.assertTrue(response.data['materialized'])
+            self.assertEqual(response.data['facets']['location'][1], {'value': 'Sydney', 'count': 1})
+            self.assertFalse(self.client.get('/api/jobs/facets/', {'location': 'perth'}).data['materialized'])
+
+    def test_invalid_facet_limit_is_a_bad_request(self):
+        for facet_limit in ['abc', '0', '-3']:
+            self.assertEqual(self.client.get('/api/jobs/facets/', {'facet_limit': facet_limit}).status_code, 400)
+        self.assertEqual(len(self.client.get('/api/jobs/facets/', {'facet_limit': '1'}).data['facets']['location']), 1)
+
+
+class JobExportTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(name='Tech Corp')
+        python = JobSkill.objects.create(name='Python')
+        for i in range(7):
+            job = Job.objects.create(title=f'Developer {i}', company=company, description='', requirements='',
+                                     location='Perth' if i % 2 else 'Sydney')
+            JobSkillRequirement.objects.create(job=job, skill=python)
+
+    def stream(self, params):
+        response = self.client.get('/api/jobs/export/', params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_streams_filtered_jobs_in_chunks(self):
+        with mock.patch('api.export.DEFAULT_CHUNK_SIZE', 2), mock.patch('api.export.logger') as logger:
+            body = self.stream({'location': 'perth', 'fields': 'title,requirements'})
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['title'] for row in rows], ['Developer 5', 'Developer 3', 'Developer 1'])
+        self.assertEqual(rows[0], {'title': 'Developer 5', 'requirements': ['Python']})
+        logger.error.assert_not_called()
+
+    def test_csv_export(self):
+        lines = self.stream({'format': 'csv', 'fields': 'id,title,requirements'}).splitlines()
+        self.assertEqual(lines[0], 'id,title,requirements')
+        self.assertEqual(len(lines), 8)
+        self.assertTrue(lines[1].endswith(',Developer 6,Python'))
+        self.assertEqual(self.client.get('/api/jobs/export/', {'format': 'xml'}).status_code, 400)
+
+    async def test_asgi_export_sends_batches_as_they_are_read(self):
+        serialized = []
+        serialize = JobProjection.serialize
+
+        def tracking_serialize(projection, rows):
+            serialized.extend(rows)
+            return serialize(projection, rows)
+
+        with mock.patch('api.export.DEFAULT_CHUNK_SIZE', 2), \
+                mock.patch.object(JobProjection, 'serialize', tracking_serialize):
+            response = await self.async_client.get('/api/jobs/export/', {'fields': 'title'})
+            self.assertTrue(response.is_async)
+            chunks = response.streaming_content.__aiter__()
+            first = await chunks.__anext__()
+            # Only the first batch has been read when it goes out
+            self.assertLessEqual(len(serialized), 4)
+            body = first + b''.join([chunk async for chunk in chunks])
+        self.assertEqual([json.loads(line)['title'] for line in body.splitlines()],
+                         [f'Developer {i}' for i in range(6, -1, -1)])
+
+
+class JobActionsBatchTests(TestCase):
+    def setUp(self):
+        flush_all()  # drop increments earlier tests left for job ids that get reused
+        company = Company.objects.create(name='Tech Corp')
+        self.user = FirebaseUser.objects.create_user('uid-1', 'user@example.com')
+        self.jobs = [Job.objects.create(title=f'Job {i}', company=company, description='', requirements='',
+                                        location='Perth', external_id=f'adz-{i}') for i in range(200)]
+
+    def post(self, actions):
+        with mock.patch('api.views._get_firebase_uid_from_request', return_value='uid-1'), \
+                CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/jobs/actions/', {'actions': actions}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], len(ctx.captured_queries)
+
+    def test_syncing_saved_jobs_is_one_round_trip(self):
+        actions = [{'key': f'save-{job.id}', 'action': 'save', 'job_id': job.id} for job in self.jobs]
+        results, queries = self.post(actions)
+        self.assertEqual({result['status'] for result in results}, {'ok'})
+        self.assertEqual(SavedJob.objects.filter(user=self.user).count(), 200)
+        # User, receipt prune and lookup, jobs, saves, receipts (two INSERTs on SQLite), savepoint pair
+        self.assertLessEqual(queries, 9)
+
+        # A retried batch replays the stored results
+        results, _ = self.post(actions[:2] + [{'key': 'unsave-0', 'action': 'unsave', 'job_id': self.jobs[0].id}])
+        self.assertEqual([result.get('replayed', False) for result in results], [True, True, False])
+        self.assertEqual(SavedJob.objects.filter(user=self.user).count(), 199)
+
+    def test_apply_and_view_are_counted_once_per_key(self):
+        actions = [
+            {'key': 'a1', 'action': 'apply', 'external_id': 'adz-1'},
+            {'key': 'v1', 'action': 'view', 'job_id': self.jobs[1].id},
+            {'key': 'v1', 'action': 'view', 'job_id': self.jobs[1].id},
+            {'key': 'x1', 'action': 'share', 'job_id': self.jobs[1].id},
+            {'key': 'm1', 'action': 'save', 'job_id': 999999},
+        ]
+        results, _ = self.post(actions)
+        self.assertEqual([result['status'] for result in results], ['ok', 'ok', 'error', 'error', 'error'])
+        self.post(actions)
+        flush_all()
+        job = Job.objects.get(id=self.jobs[1].id)
+        self.assertEqual((job.applications_count, job.views_count), (1, 1))
+        self.assertEqual(JobApplication.objects.filter(user=self.user, job=job).count(), 1)
+
+    def test_malformed_job_references_fail_only_their_own_action(self):
+        actions = [
+            {'key': 'l1', 'action': 'save', 'job_id': [self.jobs[0].id]},
+            {'key': 'd1', 'action': 'save', 'external_id': {'id': 'adz-0'}},
+            {'key': 'b1', 'action': 'save', 'job_id': True},
+            {'key': 's1', 'action': 'save', 'job_id': self.jobs[3].id},
+        ]
+        results, _ = self.post(actions)
+        self.assertEqual([result['status'] for result in results], ['error', 'error', 'error', 'ok'])
+        self.assertEqual(results[0]['error'], 'job_id must be an integer')
+        self.assertEqual(results[1]['error'], 'external_id must be a string')
+        self.assertEqual(list(SavedJob.objects.filter(user=self.user).values_list('job_id', flat=True)),
+                         [self.jobs[3].id])
+
+    def test_apply_endpoint_creates_one_application_and_counts_it_once(self):
+        job = self.jobs[2]
+        with mock.patch('api.views._get_firebase_uid_from_request', return_value='uid-1'), \
+                self.captureOnCommitCallbacks(execute=True):
+            statuses = [self.client.post(f'/api/jobs/{job_id}/apply/').status_code
+                        for job_id in (job.id, job.id, 999999)]
+        self.assertEqual(statuses, [201, 200, 404])
+        flush_all()
+        job.refresh_from_db()
+        self.assertEqual(job.applications_count, 1)
+        self.assertEqual(JobApplication.objects.filter(user=self.user).count(), 1)
+
+
+class AnalyticsRollupTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Tech Corp')
+        self.python = JobSkill.objects.create(name='Python')
+        self.user = FirebaseUser.objects.create_user('uid-1', 'user@example.com')
+        now = timezone.now()
+        for title, location, salary, posted in [
+            ('Python Developer', 'Perth', 100000, now),
+            ('Python Developer', 'Sydney', 120000, now - timedelta(days=3)),
+            ('Nurse', 'Perth', None, now),
+            ('Python Developer', 'Perth', 90000, now - timedelta(days=40)),
+        ]:
+            self.add_job(title, location, salary, posted)
+        Job.objects.update(updated_at=F('posted_date'))
+        JobApplication.objects.create(user=self.user, job=Job.objects.first())
+
+    def add_job(self, title, location, salary, posted):
+        job = Job.objects.create(title=title, company=self.company, description='', requirements='', location=location,
+                                 salary_annual_min=salary, salary_annual_max=salary, posted_date=posted)
+        if title.startswith('Python'):
+            JobSkillRequirement.objects.create(job=job, skill=self.python)
+        return job
+
+    def test_trends_are_read_from_incrementally_refreshed_rollups(self):
+        refresh_rollups()
+        trends = self.client.get('/api/analytics/job-trends/').data['trends']
+        self.assertEqual(trends['total_jobs'], 3)
+        self.assertEqual(trends['popular_skills'], [{'skill': 'Python', 'demand': 67, 'growth': 100}])
+        self.assertEqual(trends['salary_trends'], {'python developer': {'min': 100000, 'max': 120000, 'avg': 110000}})
+        self.assertEqual(trends['location_insights'][0], {'location': 'Perth', 'job_count': 2, 'avg_salary': 100000})
+
+        # Only the day of the new job is recomputed; the deactivated job's day is picked up too
+        self.add_job('Python Developer', 'Perth', 110000, timezone.now())
+        Job.objects.filter(location='Sydney').update(is_active=False, updated_at=timezone.now())
+        self.assertEqual(refresh_rollups()['jobs'], 2)
+        trends = self.client.get('/api/analytics/job-trends/').data
+        self.assertEqual(trends['trends']['location_insights'],
+                         [{'location': 'Perth', 'job_count': 3, 'avg_salary': 105000}])
+        self.assertFalse(trends['freshness']['stale'])
+
+    def test_dashboard_reports_application_trend_and_staleness(self):
+        refresh_rollups()
+        RollupWatermark.objects.update(refreshed_at=timezone.now() - timedelta(hours=2))
+        with mock.patch('api.views._get_firebase_uid_from_request', return_value='uid-1'):
+            data = self.client.get('/api/analytics/dashboard/').data
+        self.assertEqual(data['analytics']['activity_trend'][-1]['applications'], 1)
+        self.assertEqual(data['analytics']['applications_this_month'], 1)
+        self.assertTrue(data['freshness']['stale'])
+
+    def test_applications_this_month_includes_days_beyond_the_trend_window(self):
+        DailyApplicationRollup.objects.bulk_create([
+            DailyApplicationRollup(user=self.user, day=date(2025, 9, 30), applications=5),
+            DailyApplicationRollup(user=self.user, day=date(2025, 10, 1), applications=2),
+            DailyApplicationRollup(user=self.user, day=date(2025, 10, 31), applications=1),
+        ])
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2025, 10, 31)):
+            self.assertEqual(applications_this_month(self.user), 3)
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        company = Company.objects.create(name='Tech Corp')
+        skills = {name: JobSkill.objects.create(name=name) for name in ('Python', 'PyTorch', 'Postgres')}
+        for title, location, skill in [
+            ('Senior Python Developer', 'Perth, WA', 'Python'),
+            ('Python Developer', 'Perth, WA', 'Python'),
+            ('python developer', 'Sydney', 'Python'),
+            ('ML Engineer', 'Perth, WA', 'PyTorch'),
+        ]:
+            job = Job.objects.create(title=title, company=company, description='', requirements='', location=location)
+            JobSkillRequirement.objects.create(job=job, skill=skills[skill])
+        autocomplete.rebuild()
+
+    def test_completions_are_ranked_by_popularity_without_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/jobs/autocomplete/', {'q': 'py'})
+        self.assertEqual(len(ctx.captured_queries), 0)
+        suggestions = [(s['type'], s['text'], s['weight']) for s in response.data['suggestions']]
+        self.assertEqual(suggestions, [
+            ('skill', 'Python', 3), ('skill', 'PyTorch', 1),
+            ('title', 'Python Developer', 2), ('title', 'Senior Python Developer', 1),
+        ])
+
+        # Later words match too, and longer prefixes use the bisect path
+        response = self.client.get('/api/jobs/autocomplete/', {'q': 'python dev', 'type': 'title'})
+        self.assertEqual([s['text'] for s in response.data['suggestions']],
+                         ['Python Developer', 'Senior Python Developer'])
+        response = self.client.get('/api/jobs/autocomplete/', {'q': 'wa', 'type': 'location,skill'})
+        self.assertEqual(response.data['suggestions'], [{'text': 'Perth, WA', 'weight': 3, 'type': 'location'}])
+        self.assertEqual(self.client.get('/api/jobs/autocomplete/', {'q': 'p', 'type': 'company'}).status_code, 400)
+
+
+# Per-process response cache, so the query counts below are the view's own queries
+@override_settings(HTTP_CACHE_ALIAS='default')
+class BufferedCounterTests(TestCase):
+    def setUp(self):
+        flush_all()  # drop increments earlier tests left for job ids that get reused
+        company = Company.objects.create(name='Tech Corp')
+        self.jobs = [Job.objects.create(title=f'Job {i}', company=company, description='', requirements='',
+                                        location='Perth') for i in range(3)]
+
+    def test_concurrent_increments_are_flushed_in_batches(self):
+        counter = BufferedCounter(Job, 'views_count', flush_interval=3600)
+        counter.incr(self.jobs[2].id, 5)
+
+        def hit():
+            for _ in range(50):
+                counter.incr(self.jobs[0].id)
+                counter.incr(self.jobs[1].id)
+
+        threads = [threading.Thread(target=hit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.pending(self.jobs[0].id), 200)
+
+        # One UPDATE per distinct delta: jobs 0 and 1 share +200, job 2 gets +5
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(counter.flush(), 3)
+        updates = [query for query in ctx.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual([job.views_count for job in Job.objects.order_by('id')], [200, 200, 5])
+        self.assertEqual(counter.pending(self.jobs[0].id), 0)
+
+    def test_failed_flush_writes_nothing_and_retries_every_increment(self):
+        counter = BufferedCounter(Job, 'views_count', flush_interval=3600)
+        counter.incr(self.jobs[0].id, 2)
+        counter.incr(self.jobs[1].id, 7)
+        update = QuerySet.update
+        calls = []
+
+        def fail_second_update(queryset, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise DatabaseError('connection lost')
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', fail_second_update):
+            self.assertEqual(counter.flush(), 0)
+        self.assertEqual([job.views_count for job in Job.objects.order_by('id')], [0, 0, 0])
+        self.assertEqual(counter.flush(), 2)
+        self.assertEqual([job.views_count for job in Job.objects.order_by('id')], [2, 7, 0])
+
+    def test_job_detail_views_are_counted(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(f'/api/jobs/{self.jobs[0].id}/').status_code, 200)
+        self.assertEqual(Job.objects.get(id=self.jobs[0].id).views_count, 0)
+        flush_all()
+        self.assertEqual(Job.objects.get(id=self.jobs[0].id).views_count, 3)
+
+
+# Per-process response cache, so the query counts below are the view's own queries
+@override_settings(HTTP_CACHE_ALIAS='default')
+class HTTPCacheTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(name='Tech Corp')
+        self.job = Job.objects.create(title='Python Developer', company=self.company, description='',
+                                      requirements='', location='Perth')
+
+    def get(self, url, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **headers)
+        return response, len(ctx.captured_queries)
+
+    def test_repeat_requests_are_served_from_cache_with_etag(self):
+        first, first_queries = self.get('/api/jobs/?limit=5')
+        second, second_queries = self.get('/api/jobs/?limit=5')
+        self.assertGreater(first_queries, 0)
+        self.assertEqual(second_queries, 0)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(first.data, second.data)
+
+        not_modified, _ = self.get('/api/jobs/?limit=5', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+    def test_model_changes_invalidate_dependent_responses(self):
+        detail_url = f'/api/jobs/{self.job.id}/'
+        etag = self.get(detail_url)[0]['ETag']
+        other = Job.objects.create(title='Other', company=self.company, description='', requirements='',
+                                   location='Perth')
+        # Another job changing leaves this job's detail cached; only its live counters are read
+        self.assertEqual(self.get(detail_url)[1], 1)
+        self.assertEqual(self.get(f'/api/jobs/{other.id}/')[0].data['job']['title'], 'Other')
+
+        self.company.name = 'Renamed Corp'
+        self.company.save()
+        response, queries = self.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(queries, 0)
+        self.assertEqual(response.data['job']['company'], 'Renamed Corp')
+
+    def test_job_detail_counters_are_live_while_the_body_stays_cached(self):
+        detail_url = f'/api/jobs/{self.job.id}/'
+        first = self.get(detail_url)[0]
+        self.assertEqual(first.data['job']['applications_count'], 0)
+        self.assertEqual(self.get(detail_url, HTTP_IF_NONE_MATCH=first['ETag'])[0].status_code, 304)
+
+        get_counter(Job, 'applications_count').incr(self.job.id, 3)
+        flush_all()
+        response, queries = self.get(detail_url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 1)
+        self.assertEqual(response.data['job']['applications_count'], 3)
+
+
+class AIJobsReadPathTests(TestCase):
+    def setUp(self):
+        ingest_postings([
+            make_posting('1', title='Python Developer', description='Django and Python APIs'),
+            make_posting('2', title='Registered Nurse', description='Hospital ward nursing', skills='Healthcare'),
+            make_posting('3', title='Python Data Engineer', location='Sydney', description='Python pipelines'),
+        ])
+        # on_commit receivers do not run inside TestCase, so rebuild the shared index directly
+        job_index.rebuild()
+
+    def test_index_ranks_matching_jobs_in_location(self):
+        matches = JobIndex().search(query='python developer', location='perth', limit=5)
+        self.assertEqual([Job.objects.get(id=job_id).external_id for job_id, _ in matches], ['1'])
+
+    def test_get_ai_jobs_serves_fresh_search_without_scraping(self):
+        now = timezone.now()
+        CrawlPlanEntry.objects.create(query='python developer', location='perth', decayed_at=now,
+                                      last_crawled_at=now, next_crawl_at=now + timedelta(hours=1))
+
+        response = self.client.get('/api/jobs/ai/', {'query': 'Python Developer', 'location': 'Perth'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([job['id'] for job in data['jobs']], ['1'])
+        self.assertFalse(data['freshness']['stale'])
+        self.assertFalse(data['freshness']['refreshing'])
+
+    def test_unsupported_country_is_rejected_before_any_crawl(self):
+        for country in ['../..', 'gb/x?', 'zz']:
+            response = self.client.get('/api/jobs/ai/', {'query': 'python', 'country': country})
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(CrawlPlanEntry.objects.exists())
+
+
+class AIJobsColdSearchTests(TransactionTestCase):
+    # Ranking runs on a worker thread with its own connection, which only sees committed rows
+    def setUp(self):
+        ingest_postings([make_posting('1', title='Python Developer', description='Django and Python APIs')])
+        job_index.rebuild()
+
+    def test_cold_search_is_crawled_over_async_http_before_answering(self):
+        postings = [make_posting('4', title='Python Developer', location='Perth')]
+        with mock.patch('job_scraper.fetch_job_postings', new=mock.AsyncMock(return_value=postings)) as fetch:
+            response = self.client.get('/api/jobs/ai/', {'query': 'Python Developer', 'location': 'Perth'})
+        self.assertEqual(response.status_code, 200)
+        fetch.assert_awaited_once()
+        self.assertIn('4', [job['id'] for job in response.json()['jobs']])
+        self.assertIsNotNone(CrawlPlanEntry.objects.get(query='python developer').last_crawled_at)
+
+    def test_failed_crawl_serves_ingested_jobs_without_mock_postings(self):
+        with mock.patch('job_scraper._fetch_page_async', side_effect=ConnectionError('Adzuna is down')):
+            response = self.client.get('/api/jobs/ai/', {'query': 'Python Developer', 'location': 'Perth'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['id'] for job in response.json()['jobs']], ['1'])
+        self.assertEqual(list(Job.objects.values_list('external_id', flat=True)), ['1'])
+        # The failed crawl is retried on the next search, not recorded as an empty one
+        self.assertIsNone(CrawlPlanEntry.objects.get(query='python developer').last_crawled_at)
+
+
+class UserProfileMongoTests(SimpleTestCase):
+    def users_collection(self, client_method):
+        collection = mock.MagicMock()
+        collection.find_one_and_update = client_method(return_value={'firebase_uid': 'test_user_123'})
+        mongodb = mock.MagicMock(get_collection=mock.MagicMock(return_value=collection))
+        mongodb.connect = client_method(return_value=True)
+        return mongodb, collection
+
+    def test_wsgi_requests_use_the_sync_client_on_a_worker_thread(self):
+        mongodb, collection = self.users_collection(mock.MagicMock)
+        with mock.patch('api.simple_user_views.get_mongodb', return_value=mongodb), \
+                mock.patch('api.simple_user_views.get_async_mongodb') as get_async_mongodb:
+            response = self.client.get('/api/users/profile/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user'], {'firebase_uid': 'test_user_123'})
+        collection.find_one_and_update.assert_called_once()
+        get_async_mongodb.assert_not_called()
+
+    async def test_asgi_requests_use_the_event_loops_async_client(self):
+        mongodb, collection = self.users_collection(mock.AsyncMock)
+        with mock.patch('api.simple_user_views.get_async_mongodb', return_value=mongodb), \
+                mock.patch('api.simple_user_views.get_mongodb') as get_mongodb:
+            response = await self.async_client.get('/api/users/profile/')
+        self.assertEqual(response.status_code, 200)
+        collection.find_one_and_update.assert_awaited_once()
+        get_mongodb.assert_not_called()
+
+
+class SingleFlightTests(SimpleTestCase):
+    def run_concurrently(self, flights, fn, callers=8):
+        results = []
+        barrier = threading.Barrier(callers)
+
+        def call(flight):
+            barrier.wait()
+            results.append(flight.do(('software engineer', 'perth', 20), fn))
+
+        threads = [threading.Thread(target=call, args=(flights[i % len(flights)],)) for i in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def slow_counter(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'jobs': len(calls)}
+        return calls, compute
+
+    def test_concurrent_identical_calls_share_one_computation(self):
+        calls, compute = self.slow_counter()
+        results = self.run_concurrently([SingleFlight('test')], compute)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({result['jobs'] for result, _ in results}, {1})
+        self.assertEqual(sum(not shared for _, shared in results), 1)
+
+    async def test_concurrent_async_calls_share_one_computation(self):
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return {'jobs': len(calls)}
+
+        flight = SingleFlight('test-async')
+        results = await asyncio.gather(*(flight.ado(('software engineer', 'perth', 20), compute) for _ in range(8)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({result['jobs'] for result, _ in results}, {1})
+        self.assertEqual(sum(not shared for _, shared in results), 1)
+
+    def test_workers_coalesce_through_shared_cache(self):
+        calls, compute = self.slow_counter()
+        # Two SingleFlight instances stand in for two worker processes sharing a cache
+        workers = [SingleFlight('test-shared', cache_alias='default') for _ in range(2)]
+        results = self.run_concurrently(workers, compute)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({result['jobs'] for result, _ in results}, {1})
+
+    async def test_async_workers_coalesce_through_shared_cache(self):
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.2)
+            return {'jobs': len(calls)}
+
+        workers = [SingleFlight('test-shared-async', cache_alias='default') for _ in range(2)]
+        results = await asyncio.gather(*(workers[i % 2].ado(('nurse', 'perth', 20), compute) for i in range(4)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({result['jobs'] for result, _ in results}, {1})
+        self.assertEqual(sum(not shared for _, shared in results), 1)
+
+
+class RecommendationTests(TransactionTestCase):
+    def setUp(self):
+        ingest_postings([
+            make_posting('1', title='Python Developer', description='Django and Python APIs'),
+            make_posting('2', title='Registered Nurse', description='Hospital ward nursing', skills='Healthcare'),
+            make_posting('3', title='Senior Python Engineer', description='Python services'),
+        ])
+        job_index.rebuild()
+        self.user = FirebaseUser.objects.create_user('uid-1', 'user@example.com')
+        SavedJob.objects.create(user=self.user, job=Job.objects.get(external_id='1'))
+
+    def get(self, params=None):
+        with mock.patch('api.views._get_firebase_uid_from_request', return_value='uid-1'):
+            response = self.client.get('/api/jobs/recommendations/', params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_computed_on_first_request_then_paged_from_stored_rows(self):
+        with self.settings(RECOMMENDATION_LATENCY_BUDGET=10):
+            data = self.get()
+        self.assertEqual(data['source'], 'computed')
+        self.assertEqual([job['title'] for job in data['recommendations']],
+                         ['Python Developer', 'Senior Python Engineer'])
+        self.assertEqual(JobRecommendation.objects.filter(user=self.user).count(), 2)
+
+        titles, cursor = [], ''
+        while cursor is not None:
+            with CaptureQueriesContext(connection) as ctx:
+                data = self.get({'limit': 1, 'cursor': cursor})
+            self.assertEqual(data['source'], 'stored')
+            self.assertEqual(len(ctx.captured_queries), 2)  # user, recommendations page
+            titles += [job['title'] for job in data['recommendations']]
+            cursor = data['pagination']['next_cursor']
+        self.assertEqual(titles, ['Python Developer', 'Senior Python Engineer'])
+
+    def test_anonymous_results_page_to_the_end(self):
+        titles, cursor, pages = [], '', 0
+        with self.settings(RECOMMENDATION_LATENCY_BUDGET=10):
+            while cursor is not None and pages < 5:
+                response = self.client.get('/api/jobs/recommendations/',
+                                           {'skills': 'python', 'limit': 1, 'cursor': cursor})
+                data = response.data
+                self.assertEqual(data['source'], 'computed')
+                titles += [job['title'] for job in data['recommendations']]
+                cursor, pages = data['pagination']['next_cursor'], pages + 1
+        self.assertIsNone(cursor)
+        self.assertEqual(sorted(titles), ['Python Developer', 'Senior Python Engineer'])
+
+    def test_slow_computation_falls_back_within_budget(self):
+        def slow_compute(*args):
+            time.sleep(0.5)
+            return []
+
+        with mock.patch('api.recommendations._compute', side_effect=slow_compute), \
+                self.settings(RECOMMENDATION_LATENCY_BUDGET=0.05):
+            self.assertEqual(self.get()['source'], 'pending')
+            JobRecommendation.objects.create(user=self.user, job=Job.objects.get(external_id='3'), match_score=40)
+            JobRecommendation.objects.filter(user=self.user).update(created_at=timezone.now() - timedelta(days=2))
+            started = time.monotonic()
+            data = self.get()
+            self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual((data['source'], data['recommendations'][0]['title']), ('stale', 'Senior Python Engineer'))
+
+
+RESUME_TEXT = """Jane Citizen
+Data Analyst with 6+ years of experience in SQL and Python.
+Harbour Bank  Mar 2021 - Present
+Pilbara Mining  Jan 2017 - Jun 2021
+Bachelor of Science, University of Perth 2012 - 2015
+Skills: Power BI, C++, Node.js, SQL
+"""
+
+
+class ResumeParserTests(SimpleTestCase):
+    def test_formats_yield_the_same_skills_experience_and_education(self):
+        names = ['Python', 'SQL', 'Power BI', 'C++', 'Node.js', 'R', 'Java']
+        for extension, data in [('.txt', RESUME_TEXT.encode()), ('.docx', docx_bytes(RESUME_TEXT)),
+                                ('.pdf', pdf_bytes(RESUME_TEXT))]:
+            with self.subTest(extension):
+                result = analyze(data, extension, names, today=date(2025, 3, 15))
+                self.assertEqual(result['skills'], ['SQL', 'Python', 'Power BI', 'C++', 'Node.js'])
+                # Overlapping roles count once and the degree's dates are not experience
+                self.assertEqual(result['experience_years'], 8.2)
+                self.assertEqual(result['education'], 'Bachelor')
+
+    def test_unsupported_binary_files_are_rejected(self):
+        with self.assertRaises(UnsupportedFormat):
+            analyze(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1\x00\xff', '.doc', [])
+
+    def test_basic_pdf_reader_inflates_content_streams_within_a_bound(self):
+        bomb = b'%PDF-1.4\nstream\n' + zlib.compress(b' ' * 10 ** 7) + b'\nendstream\n'
+        with mock.patch('api.resume_parser.PdfReader', None):
+            self.assertIn('Power BI', extract_text(pdf_bytes(RESUME_TEXT), '.pdf'))
+            with mock.patch('api.resume_parser.MAX_PDF_STREAM_SIZE', 4096):
+                # The budget is spent on the first stream, so the resume's text is never inflated
+                self.assertEqual(extract_text(bomb + pdf_bytes(RESUME_TEXT)[9:], '.pdf'), '')
+
+
+class ResumeUploadTests(TransactionTestCase):
+    # Parsing runs on a worker pool with its own connection, which only sees committed rows
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        storage_settings = self.settings(MEDIA_ROOT=self.media_root.name)
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+
+    def upload(self, content, uid='uid-1', name='resume.txt'):
+        with mock.patch('api.views._get_firebase_uid_from_request', return_value=uid):
+            return self.client.post('/api/resume/upload/', {'resume': SimpleUploadedFile(name, content)})
+
+    def wait_until_parsed(self, upload_id, uid='uid-1'):
+        # The first parse also starts the parser process pool, which takes seconds on a busy machine
+        for _ in range(400):
+            with mock.patch('api.views._get_firebase_uid_from_request', return_value=uid):
+                upload = self.client.get(f'/api/resume/uploads/{upload_id}/').data['upload']
+            if upload['status'] in ('done', 'failed'):
+                return upload
+            time.sleep(0.05)
+        self.fail(f'Upload {upload_id} was not parsed')
+
+    def test_upload_is_stored_once_by_content_hash_and_parsed_in_background(self):
+        content = b'Python developer with Django experience\n' * 1000
+        first, second = self.upload(content), self.upload(content, uid='uid-2', name='copy.txt')
+        self.assertEqual((first.status_code, second.status_code), (202, 202))
+        first, second = first.json()['upload'], second.json()['upload']
+        self.assertEqual(first['content_hash'], hashlib.sha256(content).hexdigest())
+        self.assertEqual(first['content_hash'], second['content_hash'])
+        self.assertEqual(os.listdir(os.path.join(self.media_root.name, 'resumes')),
+                         [f"{first['content_hash']}.txt"])
+
+        upload = self.wait_until_parsed(first['upload_id'])
+        self.assertEqual(upload['status'], 'done')
+        self.assertIn('skills', upload['result'])
+        with mock.patch('api.views._get_firebase_uid_from_request', return_value='uid-2'):
+            self.assertEqual(self.client.get(f"/api/resume/uploads/{first['upload_id']}/").status_code, 404)
+
+    def test_status_write_that_loses_a_lock_race_is_retried(self):
+        update = QuerySet.update
+        done_writes = []
+
+        def lock_first_done_write(queryset, **kwargs):
+            if kwargs.get('status') == 'done':
+                done_writes.append(1)
+                if len(done_writes) == 1:
+                    raise OperationalError('database table is locked')
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', lock_first_done_write):
+            upload = self.upload(b'Python developer').json()['upload']
+            parsed = self.wait_until_parsed(upload['upload_id'])
+        self.assertEqual(parsed['status'], 'done')
+        self.assertEqual(len(done_writes), 2)
+
+    def test_oversized_upload_is_rejected_without_storing_it(self):
+        with self.settings(RESUME_MAX_UPLOAD_SIZE=1024):
+            response = self.upload(b'x' * 4096)
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(ResumeUpload.objects.exists())
+        self.assertFalse(os.path.exists(os.path.join(self.media_root.name, 'resumes')))
+
+    def test_parse_that_runs_past_the_timeout_fails_and_replaces_the_workers(self):
+        with self.settings(RESUME_PARSE_TIMEOUT=0.001):
+            upload = self.upload(b'Python developer').json()['upload']
+            parsed = self.wait_until_parsed(upload['upload_id'])
+        self.assertEqual(parsed['status'], 'failed')
+        self.assertIn('took longer than', parsed['error'])
+        self.assertIsNone(resumes._processes)
+        self.assertFalse(ResumeAnalysis.objects.exists())
+
+    def test_reupload_from_another_account_is_answered_from_the_cache(self):
+        JobSkill.objects.bulk_create([JobSkill(name=name) for name in ['Python', 'SQL', 'Power BI']])
+        first = self.upload(docx_bytes(RESUME_TEXT), name='resume.docx').json()['upload']
+        parsed = self.wait_until_parsed(first['upload_id'])
+        self.assertEqual(parsed['result']['skills'], ['SQL', 'Python', 'Power BI'])
+        self.assertEqual(ResumeAnalysis.objects.get().content_hash, first['content_hash'])
+
+        with mock.patch('api.resumes.submit_parse') as submit_parse:
+            second = self.upload(docx_bytes(RESUME_TEXT), uid='uid-2', name='cv.docx').json()['upload']
+        submit_parse.assert_not_called()
+        self.assertEqual(second['status'], 'done')
+        self.assertEqual(second['result'], parsed['result'])
+
+        with mock.patch('api.views._get_firebase_uid_from_request', return_value='uid-2'):
+            analysis = self.client.post('/api/resume/analyze/').data['analysis']
+        self.assertEqual(analysis['upload_id'], second['upload_id'])
+        self.assertEqual(analysis['skills'], ['SQL', 'Python', 'Power BI'])
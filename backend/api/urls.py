@@ -14,12 +14,16 @@ urlpatterns = [
     path('jobs/', views.job_list, name='job_list'),
     path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
     path('jobs/search/', views.job_search, name='job_search'),
+    path('jobs/facets/', views.job_facets, name='job_facets'),
+    path('jobs/export/', views.job_export, name='job_export'),
     path('jobs/recommendations/', views.job_recommendations, name='job_recommendations'),
     path('jobs/<int:job_id>/apply/', views.apply_job, name='apply_job'),
     path('jobs/<int:job_id>/save/', views.save_job, name='save_job'),
     path('jobs/<int:job_id>/unsave/', views.unsave_job, name='unsave_job'),
+    path('jobs/actions/', views.job_actions, name='job_actions'),
     path('jobs/skills/', views.get_skills, name='get_skills'),
     path('jobs/categories/', views.get_categories, name='get_categories'),
+    path('jobs/autocomplete/', views.autocomplete, name='autocomplete'),
     
     # AI Job endpoints
     path('jobs/ai/', views.get_ai_jobs, name='get_ai_jobs'),
@@ -28,6 +32,7 @@ urlpatterns = [
     
     # Resume endpoints
     path('resume/upload/', views.resume_upload, name='resume_upload'),
+    path('resume/uploads/<uuid:upload_id>/', views.resume_upload_status, name='resume_upload_status'),
     path('resume/analyze/', views.resume_analysis, name='resume_analysis'),
     path('resume/update/', views.resume_update, name='resume_update'),
     
@@ -2,11 +2,12 @@
 Comprehensive REST API Views for Job Recommender System
 """
 
+import hashlib
 import json
 import logging
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
@@ -14,9 +15,13 @@ from django.views import View
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from rest_framework.response import Response
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework import status
 
+from api.http_cache import cache_response
+from api.renderers import FastJSONRenderer
+
 from firebase_admin import auth as firebase_auth
 from firebase_admin.exceptions import FirebaseError
 
@@ -25,6 +30,13 @@ from firebase_admin.exceptions import FirebaseError
 
 logger = logging.getLogger(__name__)
 
+# List endpoints return large payloads; render them with orjson (see api.renderers)
+LIST_RENDERERS = [FastJSONRenderer, BrowsableAPIRenderer]
+
+def _fast_json_response(payload):
+    """orjson-rendered response for async views, which cannot use DRF's Response"""
+    return HttpResponse(FastJSONRenderer().render(payload), content_type='application/json')
+
 # Health and Status Endpoints
 @api_view(['GET'])
 def health_check(request):
@@ -51,69 +63,77 @@ def api_status(request):
 
 # Job-related Endpoints
 @api_view(['GET'])
+@renderer_classes(LIST_RENDERERS)
+@cache_response('job_list', ttl=60)
 def job_list(request):
-    """Get list of available jobs"""
+    """Get list of available jobs (pass ?cursor= for keyset pagination, ?fields= for a sparse fieldset)"""
     try:
         from api.models import Job, Company, JobCategory
+        from api.projections import JOB_LIST_FIELDS, InvalidFields, JobProjection
         
         # Get query parameters
         page = int(request.GET.get('page', 1))
-        limit = int(request.GET.get('limit', 20))
+        limit = max(int(request.GET.get('limit', 20)), 1)
         category = request.GET.get('category', '')
         location = request.GET.get('location', '')
         job_type = request.GET.get('job_type', '')
         work_location = request.GET.get('work_location', '')
         
+        # Only the columns behind the requested fields are selected (see api.projections)
+        try:
+            projection = JobProjection.from_request(request, JOB_LIST_FIELDS)
+        except InvalidFields as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Build query
-        jobs_query = Job.objects.filter(is_active=True).select_related('company', 'category')
+        jobs_query = Job.objects.filter(is_active=True)
         
         # Apply filters
         if category:
             jobs_query = jobs_query.filter(category__name__icontains=category)
         if location:
-            jobs_query = jobs_query.filter(location__icontains=location)
+            # Same place matching as job_search (see api.geocoding)
+            from api.geocoding import filter_by_location, search_point
+            
+            jobs_query = filter_by_location(jobs_query, location, search_point(location),
+                                            request.GET.get('radius_km', ''))
         if job_type:
             jobs_query = jobs_query.filter(job_type=job_type)
         if work_location:
             jobs_query = jobs_query.filter(work_location=work_location)
         
+        # Cursor mode: keyset seek on (posted_date, id) with an optional approximate total
+        if 'cursor' in request.GET:
+            from api.pagination import InvalidCursor, approximate_count, keyset_page
+            
+            try:
+                rows, next_cursor = keyset_page(projection.apply(jobs_query), request.GET.get('cursor'), limit)
+            except InvalidCursor as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            pagination = {'limit': limit, 'next_cursor': next_cursor, 'has_more': next_cursor is not None}
+            if request.GET.get('include_total') in ('1', 'true'):
+                unfiltered = not (category or location or job_type or work_location)
+                count = approximate_count(jobs_query, use_estimate=unfiltered)
+                pagination.update(total=count['total'], total_is_exact=count['exact'])
+            
+            return Response({
+                'success': True,
+                'jobs': projection.serialize(rows),
+                'pagination': pagination
+            })
+        
         # Get total count
         total_jobs = jobs_query.count()
         
         # Apply pagination
         start = (page - 1) * limit
         end = start + limit
-        jobs = jobs_query[start:end]
-        
-        # Serialize jobs
-        jobs_data = []
-        for job in jobs:
-            # Get required skills
-            required_skills = list(job.skill_requirements.filter(is_required=True).values_list('skill__name', flat=True))
-            
-            job_data = {
-                'id': job.id,
-                'title': job.title,
-                'company': job.company.name,
-                'company_id': job.company.id,
-                'location': job.location,
-                'salary': f"${job.salary_min:,.0f} - ${job.salary_max:,.0f}" if job.salary_min and job.salary_max else "Salary not specified",
-                'description': job.description,
-                'requirements': required_skills,
-                'job_type': job.job_type,
-                'work_location': job.work_location,
-                'category': job.category.name if job.category else None,
-                'posted_date': job.posted_date.isoformat(),
-                'application_deadline': job.application_deadline.isoformat() if job.application_deadline else None,
-                'is_featured': job.is_featured,
-                'views_count': job.views_count,
-                'applications_count': job.applications_count
-            }
-            jobs_data.append(job_data)
+        rows = list(projection.apply(jobs_query)[start:end])
         
         return Response({
             'success': True,
-            'jobs': jobs_data,
+            'jobs': projection.serialize(rows),
             'pagination': {
                 'page': page,
                 'limit': limit,
@@ -126,25 +146,54 @@ def job_list(request):
         logger.error(f"Error getting job list: {e}")
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _with_required_skills(jobs_query):
+    """Prefetch each job's required skills (with their names) in a single extra query"""
+    from django.db.models import Prefetch
+    from api.models import JobSkillRequirement
+    
+    return jobs_query.prefetch_related(Prefetch(
+        'skill_requirements',
+        queryset=JobSkillRequirement.objects.filter(is_required=True).select_related('skill').order_by('id'),
+        to_attr='required_skill_requirements'
+    ))
+
+def _required_skill_names(job):
+    """Names of the required skills prefetched by _with_required_skills"""
+    return [requirement.skill.name for requirement in job.required_skill_requirements]
+
 @api_view(['GET'])
 def job_detail(request, job_id):
     """Get detailed information about a specific job"""
+    from api.counters import get_counter
+    from api.models import Job
+    
+    response = _cached_job_detail(request, job_id=job_id)
+    
+    # Count the view, including cache hits; buffered and written in batches (see api.counters)
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        get_counter(Job, 'views_count').incr(job_id)
+    return response
+
+def _live_job_counters(data, job_id):
+    """Merge the job's current view and application counts into a cached detail payload"""
+    from api.models import Job
+    
+    # Counter flushes change these every few seconds; caching them would mean invalidating the hottest details
+    counts = Job.objects.filter(id=job_id).values('views_count', 'applications_count').first()
+    return dict(data, job=dict(data['job'], **(counts or {'views_count': 0, 'applications_count': 0})))
+
+@cache_response('job_detail', ttl=300, object_kwarg='job_id', live=_live_job_counters)
+def _cached_job_detail(request, job_id):
+    """Build the job detail payload; cached until the job or its company, category or skills change"""
     try:
         from api.models import Job
         
         # Get job from database
         try:
-            job = Job.objects.select_related('company', 'category').get(id=job_id, is_active=True)
+            job = _with_required_skills(Job.objects.select_related('company', 'category')).get(id=job_id, is_active=True)
         except Job.DoesNotExist:
             return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
         
-        # Increment view count
-        job.views_count += 1
-        job.save(update_fields=['views_count'])
-        
-        # Get required skills
-        required_skills = list(job.skill_requirements.filter(is_required=True).values_list('skill__name', flat=True))
-        
         # Serialize job detail
         job_detail = {
             'id': job.id,
@@ -157,7 +206,7 @@ def job_detail(request, job_id):
             'requirements': job.requirements,
             'responsibilities': job.responsibilities,
             'benefits': job.benefits,
-            'required_skills': required_skills,
+            'required_skills': _required_skill_names(job),
             'job_type': job.job_type,
             'work_location': job.work_location,
             'category': job.category.name if job.category else None,
@@ -166,8 +215,6 @@ def job_detail(request, job_id):
             'application_url': job.application_url,
             'application_email': job.application_email,
             'is_featured': job.is_featured,
-            'views_count': job.views_count,
-            'applications_count': job.applications_count,
             'company_info': {
                 'name': job.company.name,
                 'description': job.company.description,
@@ -188,12 +235,75 @@ def job_detail(request, job_id):
         logger.error(f"Error getting job detail: {e}")
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _apply_job_filters(jobs_query, request):
+    """Apply the job_search filters (location, category, job type, work location, salary) from the query string"""
+    from django.db.models import Q
+    from api.geocoding import filter_by_location, search_point
+    
+    location = request.GET.get('location', '')
+    category = request.GET.get('category', '')
+    salary_min = request.GET.get('salary_min', '')
+    salary_max = request.GET.get('salary_max', '')
+    job_type = request.GET.get('job_type', '')
+    work_location = request.GET.get('work_location', '')
+    
+    # Location filter: a place from the gazetteer (or ?lat=&lon=) matches jobs within
+    # ?radius_km= of it and annotates distance_km; other text is a substring match
+    point = search_point(location, request.GET.get('lat', ''), request.GET.get('lon', ''))
+    if location or point:
+        jobs_query = filter_by_location(jobs_query, location, point, request.GET.get('radius_km', ''))
+    
+    # Category filter
+    if category:
+        jobs_query = jobs_query.filter(category__name__icontains=category)
+    
+    # Job type filter
+    if job_type:
+        jobs_query = jobs_query.filter(job_type=job_type)
+    
+    # Work location filter
+    if work_location:
+        jobs_query = jobs_query.filter(work_location=work_location)
+    
+    # Salary filters compare annualized AUD amounts (see salary_normalizer);
+    # jobs not yet normalized fall back to their raw salary
+    if salary_min:
+        try:
+            salary_min_val = float(salary_min)
+            jobs_query = jobs_query.filter(
+                Q(salary_annual_max__gte=salary_min_val) |
+                Q(salary_annual_max__isnull=True, salary_max__gte=salary_min_val)
+            )
+        except ValueError:
+            pass
+    
+    if salary_max:
+        try:
+            salary_max_val = float(salary_max)
+            jobs_query = jobs_query.filter(
+                Q(salary_annual_min__lte=salary_max_val) |
+                Q(salary_annual_min__isnull=True, salary_min__lte=salary_max_val)
+            )
+        except ValueError:
+            pass
+    
+    return jobs_query
+
 @api_view(['GET'])
+@renderer_classes(LIST_RENDERERS)
 def job_search(request):
     """Search jobs with filters"""
     try:
+        from django.db.models import F
+        from api.geocoding import with_distance
         from api.models import Job
-        from django.db.models import Q
+        from api.projections import JOB_SEARCH_FIELDS, InvalidFields, JobProjection
+        from api.search import search_jobs
+        
+        try:
+            projection = JobProjection.from_request(request, JOB_SEARCH_FIELDS)
+        except InvalidFields as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         query = request.GET.get('q', '')
         location = request.GET.get('location', '')
@@ -204,80 +314,20 @@ def job_search(request):
         work_location = request.GET.get('work_location', '')
         
         # Build search query
-        jobs_query = Job.objects.filter(is_active=True).select_related('company', 'category')
+        jobs_query = _apply_job_filters(Job.objects.filter(is_active=True), request)
         
-        # Text search
+        # Text search, ranked by relevance (full-text and trigram on PostgreSQL, see api.search)
+        jobs_query = search_jobs(jobs_query, query)
+        # Nearer jobs rank first when the search has a location point (see api.geocoding)
+        jobs_query = with_distance(jobs_query)
+        nearest = F('distance_km').asc(nulls_last=True)
         if query:
-            jobs_query = jobs_query.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(requirements__icontains=query) |
-                Q(company__name__icontains=query)
-            )
-        
-        # Location filter
-        if location:
-            jobs_query = jobs_query.filter(location__icontains=location)
-        
-        # Category filter
-        if category:
-            jobs_query = jobs_query.filter(category__name__icontains=category)
-        
-        # Job type filter
-        if job_type:
-            jobs_query = jobs_query.filter(job_type=job_type)
-        
-        # Work location filter
-        if work_location:
-            jobs_query = jobs_query.filter(work_location=work_location)
-        
-        # Salary filters
-        if salary_min:
-            try:
-                salary_min_val = float(salary_min)
-                jobs_query = jobs_query.filter(salary_max__gte=salary_min_val)
-            except ValueError:
-                pass
+            jobs_query = jobs_query.order_by('-relevance', nearest, '-is_featured', '-posted_date')
+        else:
+            jobs_query = jobs_query.order_by(nearest, '-is_featured', '-posted_date')
         
-        if salary_max:
-            try:
-                salary_max_val = float(salary_max)
-                jobs_query = jobs_query.filter(salary_min__lte=salary_max_val)
-            except ValueError:
-                pass
-        
-        # Get results
-        jobs = jobs_query.order_by('-is_featured', '-posted_date')[:50]  # Limit to 50 results
-        
-        # Serialize results
-        search_results = []
-        for job in jobs:
-            # Calculate match score based on query relevance
-            match_score = 100
-            if query:
-                if query.lower() in job.title.lower():
-                    match_score = 95
-                elif query.lower() in job.description.lower():
-                    match_score = 85
-                elif query.lower() in job.company.name.lower():
-                    match_score = 80
-                else:
-                    match_score = 70
-            
-            job_data = {
-                'id': job.id,
-                'title': job.title,
-                'company': job.company.name,
-                'location': job.location,
-                'salary': f"${job.salary_min:,.0f} - ${job.salary_max:,.0f}" if job.salary_min and job.salary_max else "Salary not specified",
-                'job_type': job.job_type,
-                'work_location': job.work_location,
-                'category': job.category.name if job.category else None,
-                'posted_date': job.posted_date.isoformat(),
-                'is_featured': job.is_featured,
-                'match_score': match_score
-            }
-            search_results.append(job_data)
+        # Get results, selecting only the projected columns
+        search_results = projection.serialize(list(projection.apply(jobs_query)[:50]))  # Limit to 50 results
         
         return Response({
             'success': True,
@@ -286,6 +336,7 @@ def job_search(request):
             'filters_applied': {
                 'query': query,
                 'location': location,
+                'radius_km': request.GET.get('radius_km', ''),
                 'category': category,
                 'salary_range': f"{salary_min}-{salary_max}",
                 'job_type': job_type,
@@ -297,62 +348,126 @@ def job_search(request):
         logger.error(f"Error searching jobs: {e}")
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+# A plain Django view: DRF would treat ?format= as a renderer override and buffer the response
+@require_http_methods(['GET'])
+def job_export(request):
+    """Stream every job matching the job_search filters as NDJSON (default) or CSV (?format=csv)"""
+    try:
+        from django.core.handlers.asgi import ASGIRequest
+        from django.http import StreamingHttpResponse
+        from api.export import (
+            CONTENT_TYPES, DEFAULT_CHUNK_SIZE, aguard_stream, csv_lines, export_jobs, guard_stream, ndjson_lines,
+        )
+        from api.models import Job
+        from api.projections import JOB_LIST_FIELDS, InvalidFields, JobProjection
+        from api.search import search_jobs
+        
+        export_format = request.GET.get('format', 'ndjson')
+        if export_format not in CONTENT_TYPES:
+            return JsonResponse({'error': f"Unsupported format: {export_format}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            projection = JobProjection.from_request(request, JOB_LIST_FIELDS)
+        except InvalidFields as e:
+            return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        query = request.GET.get('q', '')
+        jobs_query = search_jobs(_apply_job_filters(Job.objects.filter(is_active=True), request), query)
+        if query:
+            jobs_query = jobs_query.order_by('-relevance', '-posted_date', '-id')
+        else:
+            jobs_query = jobs_query.order_by('-posted_date', '-id')
+        
+        # Rows are read, serialized and sent chunk by chunk (see api.export)
+        items = export_jobs(jobs_query, projection, DEFAULT_CHUNK_SIZE)
+        if export_format == 'csv':
+            lines = csv_lines(items, projection.fields)
+        else:
+            lines = ndjson_lines(items)
+        
+        # Under ASGI a sync iterator would be read to the end before the first byte is sent
+        if isinstance(request, ASGIRequest):
+            stream = aguard_stream(lines, 'job export', DEFAULT_CHUNK_SIZE)
+        else:
+            stream = guard_stream(lines, 'job export')
+        response = StreamingHttpResponse(stream, content_type=CONTENT_TYPES[export_format])
+        response['Content-Disposition'] = f'attachment; filename="jobs.{export_format}"'
+        return response
+        
+    except Exception as e:
+        logger.error(f"Error exporting jobs: {e}")
+        return JsonResponse({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@cache_response('job_facets', ttl=60)
+def job_facets(request):
+    """Counts per category, location, job type and work location for the job_search filters"""
+    try:
+        from django.conf import settings
+        from api.facets import DEFAULT_FACET_LIMIT, facet_counts, materialized_facet_counts
+        from api.models import Job
+        from api.search import search_jobs
+        
+        query = request.GET.get('q', '')
+        try:
+            limit = int(request.GET.get('facet_limit', DEFAULT_FACET_LIMIT))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return Response({'error': 'facet_limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+        filtered = query or any(request.GET.get(name) for name in (
+            'location', 'category', 'salary_min', 'salary_max', 'job_type', 'work_location'
+        ))
+        
+        # Unfiltered counts can come from the periodically refreshed JobFacetCount table
+        facets = None
+        if not filtered and getattr(settings, 'JOB_FACETS_MATERIALIZED', False):
+            facets = materialized_facet_counts(limit)
+        materialized = facets is not None
+        if facets is None:
+            jobs_query = _apply_job_filters(Job.objects.filter(is_active=True), request)
+            facets = facet_counts(search_jobs(jobs_query, query), limit)
+        
+        return Response({
+            'success': True,
+            'facets': facets,
+            'materialized': materialized
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting job facets: {e}")
+        return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 @api_view(['GET'])
 def job_recommendations(request):
-    """Get personalized job recommendations for user"""
+    """Get personalized job recommendations for user (stored rows, computed on demand when missing or stale)"""
     try:
-        # Get Firebase UID from request (optional for now)
+        from api.models import FirebaseUser
+        from api.pagination import InvalidCursor
+        from api.recommendations import recommend
+        
+        # Get Firebase UID from request (optional: anonymous requests are ranked by ?skills= only)
         firebase_uid = _get_firebase_uid_from_request(request)
-        # For now, we'll allow access without authentication for testing
-        # In a production environment, you'd want to require authentication
+        user = FirebaseUser.objects.filter(uid=firebase_uid).first() if firebase_uid else None
         
-        # Mock job recommendations for testing
-        recommendations = [
-            {
-                'id': 1,
-                'title': 'Senior Software Engineer',
-                'company': 'Tech Corp',
-                'location': 'San Francisco, CA',
-                'salary': '$120,000 - $150,000',
-                'description': 'We are looking for a senior software engineer to join our team...',
-                'match_score': 95,
-                'reason': 'Excellent match based on your Python and React skills',
-                'posted_date': '2024-01-15T10:00:00Z',
-                'job_type': 'Full-time',
-                'work_location': 'Hybrid'
-            },
-            {
-                'id': 2,
-                'title': 'Full Stack Developer',
-                'company': 'Innovation Labs',
-                'location': 'Remote',
-                'salary': '$100,000 - $130,000',
-                'description': 'Join our dynamic team as a full stack developer...',
-                'match_score': 88,
-                'reason': 'Strong match for your JavaScript and Django experience',
-                'posted_date': '2024-01-14T14:30:00Z',
-                'job_type': 'Full-time',
-                'work_location': 'Remote'
-            },
-            {
-                'id': 3,
-                'title': 'Python Developer',
-                'company': 'Data Solutions Inc',
-                'location': 'Austin, TX',
-                'salary': '$90,000 - $120,000',
-                'description': 'We need a skilled Python developer for our data team...',
-                'match_score': 82,
-                'reason': 'Good match based on your Python and data science background',
-                'posted_date': '2024-01-13T09:15:00Z',
-                'job_type': 'Full-time',
-                'work_location': 'On-site'
-            }
-        ]
+        limit = int(request.GET.get('limit', 20))
+        skills = request.GET.get('skills', '').replace(',', ' ').split()
+        location = request.GET.get('location', '')
+        
+        try:
+            result = recommend(user, request.GET.get('cursor') or None, limit, skills, location)
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({
             'success': True,
-            'recommendations': recommendations,
-            'total_recommendations': len(recommendations)
+            'recommendations': result['recommendations'],
+            'total_recommendations': len(result['recommendations']),
+            'pagination': {
+                'limit': limit,
+                'next_cursor': result['next_cursor'],
+                'has_more': result['next_cursor'] is not None
+            },
+            'source': result['source']
         })
         
     except Exception as e:
@@ -360,76 +475,104 @@ def job_recommendations(request):
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 # Resume and Profile Endpoints
-@api_view(['POST'])
-def resume_upload(request):
-    """Upload and process user resume"""
+@csrf_exempt
+@require_http_methods(['POST'])
+async def resume_upload(request):
+    """Upload a resume and queue it for processing; returns a handle to poll for the result"""
     try:
-        # Get Firebase UID from request
-        firebase_uid = _get_firebase_uid_from_request(request)
+        import asyncio
+        from asgiref.sync import sync_to_async
+        from django.urls import reverse
+        from api.models import ResumeUpload
+        from api.resume_parser import SUPPORTED_EXTENSIONS
+        from api.resumes import (
+            UploadTooLarge, cached_result, receive_resume, serialize_upload, store_resume, submit_parse
+        )
+        
+        # The file streams to disk, hashed on the way, while the token is verified
+        try:
+            firebase_uid, (resume_file, content_hash) = await asyncio.gather(
+                _aget_firebase_uid_from_request(request),
+                sync_to_async(receive_resume, thread_sensitive=False)(request),
+            )
+        except UploadTooLarge as e:
+            return JsonResponse({'error': str(e)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
         if not firebase_uid:
-            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
-        
-        if 'resume' not in request.FILES:
-            return Response({'error': 'No resume file provided'}, status=status.HTTP_400_BAD_REQUEST)
+            return JsonResponse({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        if resume_file is None:
+            return JsonResponse({'error': 'No resume file provided'}, status=status.HTTP_400_BAD_REQUEST)
+        if not resume_file.name.lower().endswith(SUPPORTED_EXTENSIONS):
+            return JsonResponse({'error': 'Upload a PDF, DOCX or TXT resume'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        file_path = await sync_to_async(store_resume, thread_sensitive=False)(resume_file, content_hash)
+        # A file parsed before, for any account, is answered from the cache
+        result = await sync_to_async(cached_result, thread_sensitive=False)(content_hash)
+        upload = await ResumeUpload.objects.acreate(
+            firebase_uid=firebase_uid,
+            file_name=resume_file.name[:255],
+            file_path=file_path,
+            content_hash=content_hash,
+            size=resume_file.size,
+            status='pending' if result is None else 'done',
+            result=result
+        )
+        if result is None:
+            submit_parse(upload.id)
+        
+        return JsonResponse({
+            'success': True,
+            'message': 'Resume uploaded; processing has started' if result is None else 'Resume processed',
+            'upload': serialize_upload(upload),
+            'status_url': reverse('resume_upload_status', args=[upload.id])
+        }, status=status.HTTP_202_ACCEPTED)
         
-        resume_file = request.FILES['resume']
+    except Exception as e:
+        logger.error(f"Error uploading resume: {e}")
+        return JsonResponse({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+def resume_upload_status(request, upload_id):
+    """Status of a resume upload, with the processing result once it is done"""
+    try:
+        from api.models import ResumeUpload
+        from api.resumes import serialize_upload
         
-        # Save file and process
-        file_path = default_storage.save(f'resumes/{firebase_uid}_{resume_file.name}', ContentFile(resume_file.read()))
+        firebase_uid = _get_firebase_uid_from_request(request)
+        if not firebase_uid:
+            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Mock processing result
-        processing_result = {
-            'file_path': file_path,
-            'status': 'processed',
-            'extracted_text': 'Sample extracted text from resume...',
-            'skills': ['Python', 'Django', 'React', 'JavaScript', 'PostgreSQL'],
-            'experience': '5+ years',
-            'education': 'Bachelor of Computer Science'
-        }
+        upload = ResumeUpload.objects.filter(pk=upload_id, firebase_uid=firebase_uid).first()
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
         
         return Response({
             'success': True,
-            'message': 'Resume uploaded and processed successfully',
-            'result': processing_result
+            'upload': serialize_upload(upload)
         })
         
     except Exception as e:
-        logger.error(f"Error uploading resume: {e}")
+        logger.error(f"Error getting resume upload status: {e}")
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['POST'])
 def resume_analysis(request):
-    """Analyze user resume and provide insights"""
+    """Analyze the user's latest processed resume against the skills current jobs ask for"""
     try:
+        from api.models import ResumeUpload
+        from api.resumes import resume_insights
+        
         # Get Firebase UID from request
         firebase_uid = _get_firebase_uid_from_request(request)
         if not firebase_uid:
             return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Mock analysis result
-        analysis_result = {
-            'overall_score': 85,
-            'strengths': [
-                'Strong technical skills in Python and Django',
-                'Good experience with React and JavaScript',
-                'Database knowledge with PostgreSQL'
-            ],
-            'improvements': [
-                'Consider adding cloud technologies (AWS, Azure)',
-                'Include more project management experience',
-                'Add certifications in relevant technologies'
-            ],
-            'skill_gaps': [
-                'Machine Learning',
-                'DevOps',
-                'Microservices Architecture'
-            ],
-            'recommendations': [
-                'Focus on cloud certifications',
-                'Learn containerization with Docker',
-                'Practice system design concepts'
-            ]
-        }
+        upload = ResumeUpload.objects.filter(firebase_uid=firebase_uid, status='done').first()
+        if upload is None:
+            return Response({'error': 'Upload a resume to analyze first'}, status=status.HTTP_404_NOT_FOUND)
+        
+        analysis_result = resume_insights(upload.result)
+        analysis_result['upload_id'] = str(upload.id)
         
         return Response({
             'success': True,
@@ -476,14 +619,30 @@ def apply_job(request, job_id):
         if not firebase_uid:
             return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Mock application result
+        from django.db import transaction
+        from api.counters import get_counter
+        from api.models import FirebaseUser, Job, JobApplication
+        
+        if not Job.objects.filter(pk=job_id).exists():
+            return Response({'error': 'Job not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            user = FirebaseUser.objects.get(uid=firebase_uid)
+        except FirebaseUser.DoesNotExist:
+            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        # One application per user and job; repeated clicks are not counted again
+        with transaction.atomic():
+            application, created = JobApplication.objects.get_or_create(user=user, job_id=job_id)
+            if created:
+                transaction.on_commit(lambda: get_counter(Job, 'applications_count').incr(job_id))
+        
         return Response({
             'success': True,
-            'message': 'Application submitted successfully',
-            'application_id': f'APP_{job_id}_{firebase_uid}',
-            'status': 'submitted',
-            'applied_date': datetime.now().isoformat()
-        })
+            'message': 'Application submitted successfully' if created else 'Already applied for this job',
+            'application_id': application.id,
+            'status': application.status,
+            'applied_date': application.applied_date.isoformat()
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
         
     except Exception as e:
         logger.error(f"Error applying for job: {e}")
@@ -507,119 +666,195 @@ def save_job(request, job_id):
         logger.error(f"Error saving job: {e}")
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@api_view(['GET'])
-def get_ai_jobs(request):
-    """Get AI-scraped jobs with recommendations"""
+@api_view(['POST'])
+def job_actions(request):
+    """Apply a batch of save/unsave/apply/view actions in one request (idempotent per action key)"""
     try:
+        firebase_uid = _get_firebase_uid_from_request(request)
+        if not firebase_uid:
+            return Response({'error': 'Authentication required'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        from api.job_actions import InvalidBatch, apply_job_actions
+        from api.models import FirebaseUser
+        
+        try:
+            user = FirebaseUser.objects.get(uid=firebase_uid)
+        except FirebaseUser.DoesNotExist:
+            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            actions = request.data.get('actions') if hasattr(request.data, 'get') else None
+            results = apply_job_actions(user, actions)
+        except InvalidBatch as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': all(result['status'] == 'ok' for result in results),
+            'results': results
+        })
+        
+    except Exception as e:
+        logger.error(f"Error applying job actions: {e}")
+        return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+# The I/O-bound endpoints below are native async views. DRF's api_view is sync-only,
+# so they are plain Django views. Under ASGI, a request waiting on Adzuna, token
+# verification or storage then holds no worker thread. That needs an ASGI server:
+# serve backend.asgi with uvicorn (see backend/asgi.py and the api.W001 check).
+# Under WSGI they still work, each request on an event loop of its own, so nothing
+# bound to a loop may outlive the request.
+@require_http_methods(['GET'])
+async def get_ai_jobs(request):
+    """Get AI-scraped jobs with recommendations, answered from the ingested job index"""
+    return await _ai_jobs_response(request)
+
+@csrf_exempt
+@require_http_methods(['POST'])
+async def refresh_ai_jobs(request):
+    """Same as get_ai_jobs, but always schedules a background re-crawl of the search"""
+    return await _ai_jobs_response(request, force_refresh=True)
+
+async def _ai_jobs_response(request, force_refresh=False):
+    """Serve AI jobs from the local job store, re-crawling stale searches in the background"""
+    try:
+        import asyncio
+        from api.crawl_planner import UnsupportedCountry, normalize_search, search_freshness, validate_country
+        from api.singleflight import get_flight
+        
         # Get parameters from request
         query = request.GET.get('query', 'software engineer')
         location = request.GET.get('location', 'Perth')
         limit = int(request.GET.get('limit', 20))
-        skills = request.GET.get('skills', '')
-        experience = request.GET.get('experience', '')
+        skills = request.GET.get('skills', '').replace(',', ' ').split()
         resume_text = request.GET.get('resume_text', '')
-        
-        # Import AI modules
-        import sys
-        import os
-        ai_folder_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'AI')
-        if ai_folder_path not in sys.path:
-            sys.path.append(ai_folder_path)
-        
         try:
-            from job_scraper import load_job_data
-            from recommender.job_recommender import JobRecommender
-            import pandas as pd
-            
-            # Fetch job data from AI scraper
-            job_df = load_job_data(query, location, results_per_page=limit)
-            
-            if job_df.empty:
-                return Response({
-                    'success': True,
-                    'jobs': [],
-                    'message': 'No jobs found for the given criteria'
-                })
-            
-            # Prepare data for recommender - map the correct column names from job scraper
-            df = pd.DataFrame({
-                'title': job_df['Job Title'],
-                'description': job_df['Description'],
-                'skills': job_df.get('Skills', ''),
-                'location': job_df['Location'],
-                'salary': job_df.get('Salary', ''),
-                'company': job_df['Company']
-            })
-            
-            # Initialize and fit recommender
-            rec = JobRecommender().fit(df)
-            
-            # Build user profile
-            user_vec = rec.build_user_profile(
-                target_title=query,
-                skills=skills,
-                resume_text=resume_text
+            country = validate_country(request.GET.get('country'))
+        except UnsupportedCountry as e:
+            return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Identical concurrent searches share one crawl/ranking pass, across workers when
+        # SINGLEFLIGHT_CACHE_ALIAS is set
+        flight = get_flight('ai_jobs')
+        flight_key = normalize_search(query, location, country) + (
+            limit,
+            tuple(sorted(skill.lower() for skill in skills)),
+            hashlib.sha1(resume_text.encode()).hexdigest(),
+        )
+        # Recording the search and ranking are independent, so they run concurrently
+        entry, (payload, _) = await asyncio.gather(
+            _record_ai_search(query, location, country, force_refresh),
+            flight.ado(flight_key, lambda: _ai_jobs_payload(query, location, limit, skills, resume_text)),
+        )
+        
+        # Nothing has been ingested for a new search yet, so crawl it once while the
+        # user waits; otherwise serve what we have and re-crawl stale results later
+        if entry is not None and entry.last_crawled_at is None:
+            payload, _ = await flight.ado(
+                flight_key + ('crawl',),
+                lambda: _crawl_and_rank_ai_jobs(entry, query, location, limit, skills, resume_text)
             )
-            
-            # Get recommendations
-            recommendations = rec.recommend(
-                user_vector=user_vec,
-                k=len(df),
-                user_location=location
-            )
-            
-            # Convert to API format
-            jobs = []
-            for _, job in recommendations.iterrows():
-                jobs.append({
-                    'id': str(job.get('id', '')),
-                    'title': job.get('title', 'Unknown'),
-                    'company': job.get('company', 'Unknown'),
-                    'location': job.get('location', 'Unknown'),
-                    'salary': job.get('salary', 'Not specified'),
-                    'description': job.get('description', 'No description available'),
-                    'skills': job.get('skills', 'Unknown'),
-                    'source': 'AI_SCRAPER',
-                    'match_score': round(job.get('score', 0) * 100, 1),
-                    'posted_date': job.get('created', datetime.now().isoformat()),
-                    'url': job.get('redirect_url', '#')
-                })
-            
-        except Exception as e:
-            logger.error(f"AI recommendation error: {e}")
-            # Fallback to basic job data without recommendations
-            jobs = []
-            for _, job in job_df.iterrows():
-                jobs.append({
-                    'id': f"mock_{len(jobs)}",
-                    'title': job.get('Job Title', 'Unknown'),
-                    'company': job.get('Company', 'Unknown'),
-                    'location': job.get('Location', 'Unknown'),
-                    'salary': job.get('Salary', 'Not specified'),
-                    'description': job.get('Description', 'No description available'),
-                    'skills': job.get('Skills', 'Unknown'),
-                    'source': 'AI_SCRAPER',
-                    'match_score': 75.0,  # Fallback score
-                    'posted_date': datetime.now().isoformat(),
-                    'url': '#'
-                })
-        
-        return Response({
-            'success': True,
-            'jobs': jobs,
-            'total': len(jobs),
-            'query': query,
-            'location': location
-        })
+        if 'freshness' not in payload:
+            payload = dict(payload, freshness=search_freshness(entry))
+        return _fast_json_response(payload)
         
     except Exception as e:
         logger.error(f"Error fetching AI jobs: {e}")
-        return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return JsonResponse({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@api_view(['POST'])
-def refresh_ai_jobs(request):
-    """Refresh AI jobs (same as get_ai_jobs but POST method)"""
-    return get_ai_jobs(request)
+async def _record_ai_search(query, location, country, force_refresh):
+    """Feed the scheduler's crawl plan with what users actually search for, refreshing stale results"""
+    from asgiref.sync import sync_to_async
+    from api.crawl_planner import record_search, refresh_in_background, search_freshness
+    
+    try:
+        entry = await sync_to_async(record_search)(query, location, country)
+    except Exception as e:
+        logger.warning(f"Could not record AI job search: {e}")
+        return None
+    if entry is not None and entry.last_crawled_at is not None and (force_refresh or search_freshness(entry)['stale']):
+        refresh_in_background(entry)
+    return entry
+
+async def _crawl_and_rank_ai_jobs(entry, query, location, limit, skills, resume_text):
+    """Crawl a never-crawled search over async HTTP, then rank its freshly ingested jobs"""
+    from api.crawl_planner import acrawl_entry, search_freshness
+    
+    try:
+        await acrawl_entry(entry)
+    except Exception as e:
+        logger.error(f"AI scraper error: {e}")
+    payload = await _ai_jobs_payload(query, location, limit, skills, resume_text, wait_for_rebuild=True)
+    return dict(payload, freshness=search_freshness(entry))
+
+async def _ai_jobs_payload(query, location, limit, skills, resume_text, wait_for_rebuild=False):
+    """Rank ingested jobs for one search"""
+    from asgiref.sync import sync_to_async
+    from api.geocoding import search_point
+    from api.models import Job
+    
+    point = await sync_to_async(search_point)(location)
+    # Ranking is CPU work on the shared index, so it runs on a worker thread
+    matches = await sync_to_async(_rank_ai_jobs, thread_sensitive=False)(
+        query, location, point, limit, skills, resume_text, wait_for_rebuild
+    )
+    jobs_by_id = await Job.objects.select_related('company', 'category').ain_bulk(
+        [job_id for job_id, _ in matches]
+    )
+    jobs = [
+        _serialize_ai_job(jobs_by_id[job_id], match_score=round(score * 100, 1))
+        for job_id, score in matches
+        if job_id in jobs_by_id
+    ]
+    
+    payload = {
+        'success': True,
+        'jobs': jobs,
+        'total': len(jobs),
+        'query': query,
+        'location': location
+    }
+    if not jobs:
+        payload['message'] = 'No jobs found for the given criteria'
+    return payload
+
+def _rank_ai_jobs(query, location, point, limit, skills, resume_text, wait_for_rebuild):
+    """Search the shared job index from a worker thread"""
+    from django.db import connection
+    from api.job_index import job_index
+    
+    try:
+        return job_index.search(
+            query=query,
+            skills=skills,
+            resume_text=resume_text,
+            location=location,
+            point=point,
+            limit=limit,
+            wait_for_rebuild=wait_for_rebuild
+        )
+    finally:
+        # Building the index reads the database on this thread's own connection
+        connection.close()
+
+def _serialize_ai_job(job, match_score):
+    """Convert an ingested Job to the AI jobs API format"""
+    return {
+        'id': job.external_id or str(job.id),
+        'title': job.title,
+        'company': job.company.name,
+        'location': job.location,
+        'salary': float(job.salary_min) if job.salary_min is not None else 'Not specified',
+        'salary_min': float(job.salary_min) if job.salary_min is not None else None,
+        'salary_max': float(job.salary_max) if job.salary_max is not None else None,
+        'salary_annual_min': float(job.salary_annual_min) if job.salary_annual_min is not None else None,
+        'salary_annual_max': float(job.salary_annual_max) if job.salary_annual_max is not None else None,
+        'description': job.description,
+        'skills': job.category.name if job.category else '',
+        'source': 'AI_SCRAPER',
+        'match_score': match_score,
+        'posted_date': job.posted_date.isoformat(),
+        'url': job.application_url or '#'
+    }
 
 @api_view(['POST'])
 def save_ai_job(request):
@@ -774,7 +1009,10 @@ def saved_jobs(request):
             return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
         
         # Get saved jobs from database
-        saved_jobs_query = SavedJob.objects.filter(user=user).select_related('job', 'job__company')
+        saved_jobs_query = SavedJob.objects.filter(user=user).select_related('job', 'job__company').only(
+            'saved_date', 'notes', 'job', 'job__company', 'job__title', 'job__location', 'job__salary_min', 'job__salary_max',
+            'job__job_type', 'job__work_location', 'job__company__name'
+        )
         
         # Serialize saved jobs
         saved_jobs = []
@@ -899,31 +1137,46 @@ def user_settings(request):
 # Analytics and Insights
 @api_view(['GET'])
 def dashboard_analytics(request):
-    """Get dashboard analytics for user"""
+    """Get dashboard analytics for user, read from the daily rollups"""
     try:
+        from django.db.models import Count, Max, Q
+        from api.models import FirebaseUser, JobApplication, JobRecommendation, JobSkillRequirement
+        from api.rollups import APPLICATION_ROLLUP, application_trend, applications_this_month, freshness, job_trends
+        
         # Get Firebase UID from request (optional for now)
         firebase_uid = _get_firebase_uid_from_request(request)
+        user = FirebaseUser.objects.filter(uid=firebase_uid).first() if firebase_uid else None
         # For now, we'll allow access without authentication for testing
         # In a production environment, you'd want to require authentication
         
-        # Mock analytics data
+        activity_trend = application_trend(user) if user else []
+        applications = JobApplication.objects.filter(user=user).aggregate(
+            interviews=Count('id', filter=Q(status='interview_scheduled'))
+        ) if user else {'interviews': 0}
+        recommendations = JobRecommendation.objects.filter(user=user, job__is_active=True).aggregate(
+            matches=Count('id', filter=Q(match_score__gte=70)), best=Max('match_score')
+        ) if user else {'matches': 0, 'best': None}
+        
+        # Skill gaps: skills in demand that none of the user's saved or applied jobs asked for
+        user_skills = set(JobSkillRequirement.objects.filter(
+            Q(job__saved_by__user=user) | Q(job__applications__user=user)
+        ).values_list('skill__name', flat=True)) if user else set()
+        popular = [skill['skill'] for skill in job_trends()['popular_skills']]
+        
         analytics = {
-            'profile_completion': 85,
-            'applications_this_month': 12,
-            'interviews_scheduled': 3,
-            'job_matches': 8,
-            'skill_gaps': ['AWS', 'Docker', 'Kubernetes'],
-            'recommendation_score': 92,
-            'activity_trend': [
-                {'date': '2024-01-01', 'applications': 2},
-                {'date': '2024-01-02', 'applications': 1},
-                {'date': '2024-01-03', 'applications': 3}
-            ]
+            'profile_completion': 85,  # profiles live in MongoDB and are not rolled up yet
+            'applications_this_month': applications_this_month(user) if user else 0,
+            'interviews_scheduled': applications['interviews'],
+            'job_matches': recommendations['matches'],
+            'skill_gaps': [skill for skill in popular if skill not in user_skills][:3],
+            'recommendation_score': round(recommendations['best']) if recommendations['best'] is not None else None,
+            'activity_trend': activity_trend
         }
         
         return Response({
             'success': True,
-            'analytics': analytics
+            'analytics': analytics,
+            'freshness': freshness(APPLICATION_ROLLUP)
         })
         
     except Exception as e:
@@ -931,36 +1184,48 @@ def dashboard_analytics(request):
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@cache_response('job_trends', ttl=300)
 def job_trends(request):
-    """Get job market trends and insights"""
+    """Get job market trends and insights, read from the daily rollups"""
     try:
-        # Mock job trends data
-        trends = {
-            'popular_skills': [
-                {'skill': 'Python', 'demand': 95, 'growth': 15},
-                {'skill': 'React', 'demand': 88, 'growth': 12},
-                {'skill': 'AWS', 'demand': 82, 'growth': 20}
-            ],
-            'salary_trends': {
-                'software_engineer': {'min': 80000, 'max': 150000, 'avg': 115000},
-                'data_scientist': {'min': 90000, 'max': 160000, 'avg': 125000}
-            },
-            'location_insights': [
-                {'location': 'San Francisco', 'job_count': 1250, 'avg_salary': 140000},
-                {'location': 'New York', 'job_count': 980, 'avg_salary': 135000},
-                {'location': 'Remote', 'job_count': 2100, 'avg_salary': 120000}
-            ]
-        }
+        from api.rollups import DEFAULT_TREND_DAYS, JOB_ROLLUP, freshness, job_trends as rolled_up_trends
+        
+        days = min(max(int(request.GET.get('days', DEFAULT_TREND_DAYS)), 1), 365)
         
         return Response({
             'success': True,
-            'trends': trends
+            'trends': rolled_up_trends(days),
+            'freshness': freshness(JOB_ROLLUP)
         })
         
     except Exception as e:
         logger.error(f"Error getting job trends: {e}")
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@api_view(['GET'])
+def autocomplete(request):
+    """Type-ahead completions for skills, job titles and locations, served from memory"""
+    try:
+        from api.autocomplete import SUGGESTION_TYPES, autocomplete as completions
+        
+        query = request.GET.get('q', '')
+        limit = int(request.GET.get('limit', 10))
+        types = [name for name in request.GET.get('type', '').split(',') if name] or list(SUGGESTION_TYPES)
+        unknown = [name for name in types if name not in SUGGESTION_TYPES]
+        if unknown:
+            return Response({'error': f"Unknown suggestion type: {', '.join(unknown)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            'query': query,
+            'suggestions': completions.complete(query, types, limit)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting autocomplete suggestions: {e}")
+        return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
 # Helper function for Firebase authentication
 def _get_firebase_uid_from_request(request) -> Optional[str]:
     """Extract Firebase UID from request headers or token"""
@@ -984,7 +1249,14 @@ def _get_firebase_uid_from_request(request) -> Optional[str]:
         logger.error(f"Error extracting Firebase UID: {e}")
         return None
 
+async def _aget_firebase_uid_from_request(request) -> Optional[str]:
+    """_get_firebase_uid_from_request for async views; verification may fetch Google's signing keys"""
+    from asgiref.sync import sync_to_async
+    
+    return await sync_to_async(_get_firebase_uid_from_request, thread_sensitive=False)(request)
+
 @api_view(['GET'])
+@cache_response('skills', ttl=3600)
 def get_skills(request):
     """Get all available skills"""
     try:
@@ -1002,6 +1274,7 @@ def get_skills(request):
         return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@cache_response('categories', ttl=3600)
 def get_categories(request):
     """Get all available job categories"""
     try:
@@ -2,6 +2,15 @@
 ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server so the async API views (AI jobs, resume upload,
+user profile/sync) wait on Adzuna, MongoDB and storage without holding a thread:
+
+    uvicorn backend.asgi:application --workers 4
+
+uvicorn (requirements.txt) is required for that: under a WSGI server those
+views still work, but each request then runs on an event loop of its own and
+holds its thread throughout. ``manage.py check --deploy`` warns when uvicorn is
+not installed.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
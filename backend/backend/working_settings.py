@@ -71,6 +71,55 @@ DATABASES = {
     }
 }
 
+# Caches; 'shared' is visible to every worker process. Production sets REDIS_URL; without
+# it 'shared' falls back to the database cache (run manage.py createcachetable), which
+# only suits locks and coordination, not response caching
+REDIS_URL = os.getenv('REDIS_URL')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'api_shared_cache',
+    },
+}
+
+# Cache used to coalesce identical AI job searches across workers (see api.singleflight);
+# leave unset to coalesce within each worker only
+SINGLEFLIGHT_CACHE_ALIAS = os.getenv('SINGLEFLIGHT_CACHE_ALIAS') or None
+
+# Cache holding API responses and their invalidation generations (see api.http_cache).
+# With Redis it is 'shared', so the scheduler's writes invalidate every worker; 'default'
+# (per process) only suits one process that both serves the API and writes the data
+HTTP_CACHE_ALIAS = os.getenv('HTTP_CACHE_ALIAS', 'shared' if REDIS_URL else 'default')
+
+# Serve unfiltered facet counts from the JobFacetCount table refreshed by the
+# refresh_job_facets command instead of counting live (see api.facets)
+JOB_FACETS_MATERIALIZED = os.getenv('JOB_FACETS_MATERIALIZED', 'False').lower() == 'true'
+
+# Seconds a recommendations request waits for an on-demand computation before
+# answering from stale rows (see api.recommendations)
+RECOMMENDATION_LATENCY_BUDGET = float(os.getenv('RECOMMENDATION_LATENCY_BUDGET', '0.8'))
+
+# Seconds after which analytics rollups are reported as stale (see api.rollups)
+ROLLUP_MAX_STALENESS = int(os.getenv('ROLLUP_MAX_STALENESS', '1800'))
+
+# Kilometres around a searched location that count as that location, without ?radius_km= (see api.geocoding)
+LOCATION_SEARCH_RADIUS_KM = float(os.getenv('LOCATION_SEARCH_RADIUS_KM', '25'))
+
+# Largest resume upload accepted, in bytes (see api.resumes)
+RESUME_MAX_UPLOAD_SIZE = int(os.getenv('RESUME_MAX_UPLOAD_SIZE', str(10 * 1024 * 1024)))
+
+# Processes that parse resumes; 0 starts one per CPU core (see api.resumes)
+RESUME_PARSE_WORKERS = int(os.getenv('RESUME_PARSE_WORKERS', '0'))
+
+# Seconds a resume may take on the parser processes before its upload is marked failed
+RESUME_PARSE_TIMEOUT = float(os.getenv('RESUME_PARSE_TIMEOUT', '60'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -1,5 +1,7 @@
+import asyncio
 import os
-from pymongo import MongoClient
+import weakref
+from pymongo import AsyncMongoClient, MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import logging
 
@@ -75,6 +77,55 @@ class MongoDBConnection:
             logger.error(f"MongoDB health check failed: {e}")
             return False
 
+class AsyncMongoDBConnection:
+    """MongoDB access for async views, through pymongo's native asyncio client"""
+
+    def __init__(self):
+        self.client = None
+        self.db = None
+        self.connected = False
+
+    async def connect(self):
+        """Establish connection to MongoDB"""
+        if self.connected:
+            return True
+
+        try:
+            mongodb_url = os.getenv('MONGODB_URL', 'mongodb://localhost:27018/job_recommender')
+            database_name = os.getenv('MONGODB_DATABASE', 'job_recommender')
+
+            self.client = AsyncMongoClient(
+                mongodb_url,
+                serverSelectionTimeoutMS=10000,  # 10 second timeout
+                connectTimeoutMS=10000,
+                socketTimeoutMS=10000,
+                retryWrites=True
+            )
+            await self.client.admin.command('ping')
+
+            self.db = self.client[database_name]
+            self.connected = True
+
+            logger.info(f"Successfully connected to MongoDB database (async): {database_name}")
+            return True
+
+        except Exception as e:
+            logger.warning(f"MongoDB connection failed: {e}")
+            self.connected = False
+            return False
+
+    def get_collection(self, collection_name):
+        """Get a specific collection from the database; call connect() first"""
+        if self.db is None:
+            raise Exception("Database connection not established")
+        return self.db[collection_name]
+
+    async def close_connection(self):
+        """Close the MongoDB connection"""
+        if self.client:
+            await self.client.close()
+            logger.info("MongoDB connection closed")
+
 # Global MongoDB connection instance
 mongodb_connection = MongoDBConnection()
 
@@ -85,3 +136,17 @@ def get_mongodb():
 def get_mongodb_collection(collection_name):
     """Get a specific MongoDB collection"""
     return mongodb_connection.get_collection(collection_name)
+
+# An AsyncMongoClient is bound to the event loop it was created on, so async
+# connections are kept per loop. Only use them under an ASGI server (uvicorn),
+# which runs one loop per process: under WSGI every request gets a new loop, and
+# so would open (and never close) a new client.
+_async_connections = weakref.WeakKeyDictionary()
+
+def get_async_mongodb():
+    """Get the async MongoDB connection for the running event loop"""
+    loop = asyncio.get_running_loop()
+    connection = _async_connections.get(loop)
+    if connection is None:
+        connection = _async_connections[loop] = AsyncMongoDBConnection()
+    return connection
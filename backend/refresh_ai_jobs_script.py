@@ -18,7 +18,7 @@ django.setup()
 from django.core.management import execute_from_command_line
 
 def refresh_ai_jobs():
-    """Refresh AI jobs using Django management command"""
+    """Refresh AI jobs for every due crawl plan entry using Django management command"""
     try:
         print(f"[{datetime.now()}] Starting AI job refresh...")
         
@@ -26,10 +26,8 @@ def refresh_ai_jobs():
         execute_from_command_line([
             'manage.py', 
             'refresh_ai_jobs',
-            '--query=software engineer',
-            '--location=Perth',
-            '--limit=50',
-            '--save-to-csv'
+            '--plan',
+            '--limit=50'
         ])
         
         print(f"[{datetime.now()}] AI job refresh completed successfully!")
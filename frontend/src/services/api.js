@@ -117,6 +117,11 @@ class ApiService {
     return await response.json();
   }
 
+  // uploadResume returns a handle; poll this until upload.status is 'done' or 'failed'
+  async getResumeUpload(uploadId) {
+    return this.request(`/resume/uploads/${uploadId}/`);
+  }
+
   async analyzeResume() {
     return this.request('/resume/analyze/', { method: 'POST' });
   }